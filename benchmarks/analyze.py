@@ -0,0 +1,115 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+"""Performance of reading the results of benchmark campaigns."""
+
+import os
+
+import datreant as dtr
+
+from mdbenchmark.cli.analyze import do_analyze
+from mdbenchmark.mdengines import gromacs
+from mdbenchmark.mdengines.utils import analyze_benchmark, collect_details
+from mdbenchmark.utils import parse_bundle
+from mdbenchmark.versions import Version3Categories
+
+from .campaigns import write_campaign
+
+CAMPAIGN_SIZES = [10, 100, 1000, 10000]
+LOG_SIZES_MB = [1, 4, 16]
+
+
+class ParseBundle:
+    """Parse campaigns with many benchmarks with short log files."""
+
+    params = CAMPAIGN_SIZES
+    param_names = ["benchmarks"]
+    timeout = 600
+
+    def setup_cache(self):
+        for size in CAMPAIGN_SIZES:
+            write_campaign("campaign{}".format(size), size)
+        return os.getcwd()
+
+    def setup(self, directory, size):
+        self.bundle = dtr.discover(os.path.join(directory, "campaign{}".format(size)))
+        self.version = Version3Categories()
+
+    def time_parse_bundle(self, directory, size):
+        parse_bundle(
+            self.bundle,
+            columns=self.version.analyze_categories,
+            sort_values_by=self.version.analyze_sort,
+        )
+
+    def time_parse_bundle_with_details(self, directory, size):
+        parse_bundle(
+            self.bundle,
+            columns=self.version.analyze_categories,
+            sort_values_by=self.version.analyze_sort,
+            with_details=True,
+        )
+
+    def time_discover(self, directory, size):
+        dtr.discover(os.path.join(directory, "campaign{}".format(size)))
+
+
+class AnalyzeLargeLogs:
+    """Analyze benchmarks whose log files are several megabytes large."""
+
+    params = LOG_SIZES_MB
+    param_names = ["log_size_mb"]
+    timeout = 300
+
+    def setup_cache(self):
+        for size in LOG_SIZES_MB:
+            write_campaign("logs{}".format(size), 8, log_size=size * 1024**2)
+        return os.getcwd()
+
+    def setup(self, directory, size):
+        self.bundle = dtr.discover(os.path.join(directory, "logs{}".format(size)))
+
+    def time_analyze_benchmark(self, directory, size):
+        for treant in self.bundle:
+            analyze_benchmark(engine=gromacs, benchmark=treant)
+
+    def peakmem_analyze_benchmark(self, directory, size):
+        for treant in self.bundle:
+            analyze_benchmark(engine=gromacs, benchmark=treant)
+
+    def time_collect_details(self, directory, size):
+        for treant in self.bundle:
+            collect_details(gromacs, treant)
+
+
+class Analyze:
+    """Run `mdbenchmark analyze` on a whole campaign."""
+
+    timeout = 300
+
+    def setup_cache(self):
+        write_campaign("campaign", 1000)
+        return os.getcwd()
+
+    def time_analyze(self, directory):
+        do_analyze(
+            directory=os.path.join(directory, "campaign"),
+            save_csv=None,
+            output_format="csv",
+        )
@@ -0,0 +1,230 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+"""Synthetic benchmark campaigns for the performance tests of MDBenchmark."""
+
+import os
+
+import datreant as dtr
+import numpy as np
+import pandas as pd
+
+MODULES = ["gromacs/2016.3", "gromacs/2018.3", "gromacs/2020.1", "gromacs/2021.4"]
+
+LOG_HEADER = """Log file opened on Mon Dec 11 09:14:55 2017
+Host: dra{node:04d}  pid: 7666  rank ID: 0  number of ranks:  {cores}
+                      :-) GROMACS - gmx mdrun, {version} (-:
+
+GROMACS:      gmx mdrun, version {version}
+Executable:   /mpcdf/soft/SLES122/HSW/gromacs/{version}/impi-2017.3/bin/gmx_mpi
+Working dir:  /draco/u/user/benchmarks/draco_gromacs/{version}/{node}
+Command line:
+  gmx_mpi mdrun -v -maxh 0.25 -resethway -deffnm bench -noconfout -nb cpu
+
+GROMACS version:    {version}
+Precision:          single
+Memory model:       64 bit
+MPI library:        MPI
+OpenMP support:     enabled (GMX_OPENMP_MAX_THREADS = 32)
+SIMD instructions:  AVX2_256
+
+Running on {nodes} nodes with total {cores} cores, {threads} logical cores
+  Cores per node:           32
+  Logical cores per node:   64
+Hardware detected on host dra{node:04d} (the node of MPI rank 0):
+  CPU info:
+    Vendor: Intel
+    Brand:  Intel(R) Xeon(R) CPU E5-2698 v3 @ 2.30GHz
+
+Changing nstlist from 10 to 40, rlist from 1 to 1.099
+
+"""
+
+LOG_STEP = """           Step           Time
+    {step:11d}    {time:11.5f}
+
+   Energies (kJ/mol)
+          Angle    Proper Dih.  Ryckaert-Bell.          LJ-14     Coulomb-14
+    9.74139e+03    4.34956e+03    2.41966e+03    5.70453e+03    4.43932e+04
+        LJ (SR)  Disper. corr.   Coulomb (SR)   Coul. recip.      Potential
+    1.10283e+05   -6.69011e+03   -1.51127e+06    7.12745e+03   -1.33404e+06
+    Kinetic En.   Total Energy  Conserved En.    Temperature Pressure (bar)
+    2.44939e+05   -1.08910e+06   -1.08907e+06    3.00353e+02    2.63716e+01
+
+"""
+
+LOG_FOOTER = """ Average load imbalance: 4.2 %
+ Part of the total run time spent waiting due to load imbalance: 1.6 %
+
+     R E A L   C Y C L E   A N D   T I M E   A C C O U N T I N G
+
+On {cores} MPI ranks
+
+ Computing:          Num   Num      Call    Wall time         Giga-Cycles
+                     Ranks Threads  Count      (s)         total sum    %
+-----------------------------------------------------------------------------
+ Domain decomp.        {cores}    1        250      10.481       2411.064   3.3
+ Neighbor search       {cores}    1        251      11.204       2577.390   3.5
+ Comm. coord.          {cores}    1      49750      24.903       5728.626   7.8
+ Force                 {cores}    1      50001     196.710      45250.787  61.6
+ PME mesh              {cores}    1      50001      56.001      12882.193  17.5
+ Rest                                               20.002       4601.298   6.3
+-----------------------------------------------------------------------------
+ Total                                             319.301      73451.358 100.0
+-----------------------------------------------------------------------------
+
+               Core t (s)   Wall t (s)        (%)
+       Time:   171094.114      891.115    19200.0
+                 (ns/day)    (hour/ns)
+Performance:    {performance:9.3f}        0.106
+Finished mdrun on rank 0 Mon Dec 11 09:29:47 2017
+"""
+
+
+def gromacs_log(nodes, performance, version="2018.3", size=8 * 1024):
+    """Return a finished GROMACS log file of roughly `size` bytes.
+
+    The size is reached by repeating the energy output of the steps, as in
+    real log files of long benchmarks.
+    """
+    cores = 32 * nodes
+    header = LOG_HEADER.format(
+        node=nodes, nodes=nodes, cores=cores, threads=2 * cores, version=version
+    )
+    footer = LOG_FOOTER.format(cores=cores, performance=performance)
+
+    step_size = len(LOG_STEP.format(step=0, time=0))
+    steps = max(1, (size - len(header) - len(footer)) // step_size)
+    body = "".join(
+        LOG_STEP.format(step=step * 1000, time=step * 2.0) for step in range(steps)
+    )
+    return header + body + footer
+
+
+def performance(nodes, serial_fraction=0.05, reference=50.0):
+    """Return the performance of Amdahl's law for `nodes`."""
+    return reference / (serial_fraction + (1 - serial_fraction) / nodes)
+
+
+def write_campaign(directory, number_of_benchmarks, log_size=8 * 1024, seed=0):
+    """Write a finished campaign of GROMACS benchmarks below `directory`.
+
+    The benchmarks are spread over the modules in `MODULES` and CPU and GPU
+    runs on up to 64 nodes. Their categories are the ones written by
+    `mdbenchmark generate`.
+
+    Returns
+    -------
+    datreant.Bundle
+        All benchmarks of the campaign.
+    """
+    rng = np.random.default_rng(seed)
+    treants = []
+    for i in range(number_of_benchmarks):
+        module = MODULES[i % len(MODULES)]
+        gpu = bool(i // len(MODULES) % 2)
+        nodes = i // (2 * len(MODULES)) % 64 + 1
+        repeat = i // (2 * len(MODULES) * 64)
+        path = os.path.join(
+            directory,
+            "draco_{}{}".format(module, "_gpu" if gpu else ""),
+            "n{:03d}_r32_t01_woht_nsim1_rep{:02d}".format(nodes, repeat),
+        )
+        treant = dtr.Treant(path)
+        treant.categories = {
+            "module": module,
+            "gpu": gpu,
+            "nodes": nodes,
+            "host": "draco",
+            "time": 15,
+            "name": "bench",
+            "started": True,
+            "ranks": 32,
+            "threads": 1,
+            "hyperthreading": False,
+            "version": 3,
+            "multidir": 1,
+            "temprange": "300,500",
+            "repeat": repeat,
+            "pme_ranks": -1,
+            "mdrun_nb": "auto",
+            "mdrun_pme": "auto",
+            "mdrun_bonded": "auto",
+            "mdrun_update": "auto",
+            "mdrun_dlb": "auto",
+        }
+        value = performance(nodes) * (1 + 0.05 * rng.standard_normal())
+        with open(treant["bench.log"].abspath, "w") as fh:
+            fh.write(
+                gromacs_log(nodes, value, version=module.split("/")[1], size=log_size)
+            )
+        treants.append(treant)
+
+    return dtr.Bundle(treants)
+
+
+def write_modulepath(directory, number_of_directories, versions=20):
+    """Write a synthetic `MODULEPATH` with many unrelated module directories.
+
+    Every tenth directory contains GROMACS modules, all others hold modules
+    of other software, as on large HPC systems.
+
+    Returns
+    -------
+    str
+        Value for the `MODULEPATH` environment variable.
+    """
+    roots = []
+    for i in range(number_of_directories):
+        software = "gromacs" if not i % 10 else "software{:04d}".format(i)
+        root = os.path.join(directory, "modules{:02d}".format(i % 8))
+        path = os.path.join(root, "applications", software)
+        os.makedirs(path, exist_ok=True)
+        for version in range(versions):
+            open(os.path.join(path, "{}.{}".format(2016 + i % 6, version)), "w").close()
+        if root not in roots:
+            roots.append(root)
+
+    return ":".join(roots)
+
+
+def benchmark_results(number_of_groups, max_nodes=16):
+    """Return results of `number_of_groups` benchmark groups as a DataFrame.
+
+    The columns are the ones written by ``mdbenchmark analyze --save-csv``.
+    """
+    nodes = np.tile(np.arange(1, max_nodes + 1), number_of_groups)
+    group = np.repeat(np.arange(number_of_groups), max_nodes)
+    return pd.DataFrame(
+        {
+            "module": ["gromacs/{}".format(g // 2) for g in group],
+            "nodes": nodes,
+            "performance": performance(nodes, serial_fraction=0.01 * (group % 10)),
+            "time": 15,
+            "use_gpu": group % 2 == 1,
+            "host": "draco",
+            "ncores": 32 * nodes,
+            "number_of_ranks": 32,
+            "number_of_threads": 1,
+            "hyperthreading": False,
+            "multidir": 1,
+            "repeat": 0,
+            "pme_ranks": -1,
+        }
+    )
@@ -0,0 +1,41 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+"""Start-up time of the command line interface.
+
+Each benchmark runs in a new interpreter, so that the imports are measured.
+"""
+
+
+def timeraw_import_cli():
+    return "from mdbenchmark import cli"
+
+
+def timeraw_help():
+    return """
+from mdbenchmark import cli
+cli.main(["--help"], standalone_mode=False)
+"""
+
+
+def timeraw_analyze_help():
+    return """
+from mdbenchmark import cli
+cli.main(["analyze", "--help"], standalone_mode=False)
+"""
@@ -0,0 +1,69 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+"""Performance of generating large sweeps of benchmarks."""
+
+import os
+import shutil
+import tempfile
+
+from mdbenchmark.cli.generate import do_generate
+
+
+class Generate:
+    """Generate sweeps over modules, nodes and numbers of ranks."""
+
+    params = ([1, 4], [8, 64], [1, 4])
+    param_names = ["modules", "max_nodes", "ranks"]
+    # Every benchmark is written to a new directory
+    number = 1
+    repeat = 5
+    timeout = 300
+
+    def setup(self, modules, max_nodes, ranks):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        open("protein.tpr", "w").close()
+
+    def teardown(self, modules, max_nodes, ranks):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def time_generate(self, modules, max_nodes, ranks):
+        do_generate(
+            name="protein",
+            cpu=True,
+            gpu=True,
+            module=["gromacs/20{}.1".format(16 + i) for i in range(modules)],
+            host="draco",
+            min_nodes=1,
+            max_nodes=max_nodes,
+            nodes=None,
+            time=15,
+            skip_validation=True,
+            job_name=None,
+            yes=True,
+            physical_cores=32,
+            logical_cores=64,
+            number_of_ranks=[32 // 2**i for i in range(ranks)],
+            enable_hyperthreading=False,
+            multidir=(1,),
+            temprange="300,500",
+        )
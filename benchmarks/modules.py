@@ -0,0 +1,78 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+"""Performance of finding the available modules on large HPC systems."""
+
+import os
+import shutil
+import tempfile
+
+from mdbenchmark import mdengines
+
+from .campaigns import write_modulepath
+
+
+class ModulePath:
+    """Synthetic `MODULEPATH` and an empty module cache for every run."""
+
+    params = [100, 1000, 5000]
+    param_names = ["directories"]
+    number = 1
+    repeat = 10
+    timeout = 300
+
+    def setup_cache(self):
+        return {
+            size: write_modulepath("modulepath{}".format(size), size)
+            for size in self.params
+        }
+
+    def setup(self, module_paths, size):
+        self.modulepath = os.environ.get("MODULEPATH")
+        self.module_cache = mdengines.MODULE_CACHE
+        self.directory = tempfile.mkdtemp()
+        os.environ["MODULEPATH"] = module_paths[size]
+        os.environ.pop("MDBENCHMARK_MODULE_AVAIL", None)
+        mdengines.MODULE_CACHE = os.path.join(self.directory, "modules.json")
+
+    def teardown(self, module_paths, size):
+        if self.modulepath is None:
+            os.environ.pop("MODULEPATH", None)
+        else:
+            os.environ["MODULEPATH"] = self.modulepath
+        mdengines.MODULE_CACHE = self.module_cache
+        shutil.rmtree(self.directory)
+
+
+class GetAvailableModules(ModulePath):
+    """Walk all directories of the `MODULEPATH`."""
+
+    def time_get_available_modules(self, module_paths, size):
+        mdengines.get_available_modules()
+
+
+class GetCachedModules(ModulePath):
+    """Read the modules from the cache, after checking all directories."""
+
+    def setup(self, module_paths, size):
+        super().setup(module_paths, size)
+        mdengines.get_available_modules()
+
+    def time_get_available_modules(self, module_paths, size):
+        mdengines.get_available_modules()
@@ -0,0 +1,83 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+"""Performance of plotting many benchmark groups."""
+
+import os
+import shutil
+import tempfile
+
+from mdbenchmark.cli.plot import do_plot
+
+from .campaigns import benchmark_results
+
+
+class Plot:
+    """Plot the results of many benchmark groups into one figure."""
+
+    params = [2, 50, 500]
+    param_names = ["groups"]
+    number = 1
+    repeat = 5
+    timeout = 300
+
+    def setup(self, groups):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        benchmark_results(groups).to_csv("results.csv", index=False)
+
+    def teardown(self, groups):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def time_plot(self, groups):
+        do_plot(
+            csv=("results.csv",),
+            output_name="plot",
+            output_format=("png",),
+            template=(),
+            module=(),
+            gpu=True,
+            cpu=True,
+            plot_cores=False,
+            fit=True,
+            font_size=12,
+            dpi=100,
+            xtick_step=None,
+            watermark=False,
+        )
+
+    def time_plot_facets(self, groups):
+        do_plot(
+            csv=("results.csv",),
+            output_name="plot",
+            output_format=("png", "pdf"),
+            template=(),
+            module=(),
+            gpu=True,
+            cpu=True,
+            plot_cores=False,
+            fit=True,
+            font_size=12,
+            dpi=100,
+            xtick_step=None,
+            watermark=False,
+            facet="gpu",
+        )
@@ -0,0 +1,98 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+"""Performance of the helpers that format benchmark tables."""
+
+import numpy as np
+import pandas as pd
+
+from mdbenchmark.utils import consolidate_dataframe, format_interval_groups, select_rows
+from mdbenchmark.versions import Version3Categories
+
+
+def generate_preview(number_of_groups, nodes_per_group):
+    """Return the DataFrame of a `mdbenchmark generate` preview."""
+    group = np.repeat(np.arange(number_of_groups), nodes_per_group)
+    return pd.DataFrame(
+        {
+            "name": "protein",
+            "job_name": "protein",
+            "module": ["gromacs/{}".format(g % 50) for g in group],
+            "nodes": np.tile(np.arange(1, nodes_per_group + 1), number_of_groups),
+            "time": 15,
+            "use_gpu": group % 2 == 1,
+            "host": "draco",
+            "number_of_ranks": 2 ** (group // 100 % 6),
+            "number_of_threads": 1,
+            "hyperthreading": False,
+            "multidir": 1,
+            "pme_ranks": -1,
+            "mdrun_nb": "auto",
+            "mdrun_pme": "auto",
+            "mdrun_bonded": "auto",
+            "mdrun_update": "auto",
+            "mdrun_dlb": "auto",
+        }
+    )
+
+
+class ConsolidateDataFrame:
+    """Compress the nodes of the preview of large sweeps."""
+
+    params = ([10, 1000, 10000], [8, 64])
+    param_names = ["groups", "nodes"]
+
+    def setup(self, groups, nodes):
+        self.df = generate_preview(groups, nodes)
+        self.columns = Version3Categories().consolidate_categories
+
+    def time_consolidate_dataframe(self, groups, nodes):
+        consolidate_dataframe(self.df, columns=self.columns)
+
+
+class FormatIntervalGroups:
+    """Compress a single list of nodes."""
+
+    params = [10, 1000, 100000]
+    param_names = ["nodes"]
+
+    def setup(self, nodes):
+        self.nodes = np.random.default_rng(0).permutation(nodes) + 1
+
+    def time_format_interval_groups(self, nodes):
+        format_interval_groups(self.nodes)
+
+
+class SelectRows:
+    """Select the printed rows of large results."""
+
+    params = [1000, 100000]
+    param_names = ["rows"]
+
+    def setup(self, rows):
+        self.df = generate_preview(rows // 10, 10)
+
+    def time_select_rows(self, rows):
+        select_rows(
+            self.df,
+            columns=["module", "nodes", "number_of_ranks"],
+            sort=["nodes", "module"],
+            descending=True,
+            limit=20,
+        )
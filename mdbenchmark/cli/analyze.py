@@ -17,57 +17,319 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import sys
+
 import click
 import datreant as dtr
 import numpy as np
 
 from mdbenchmark import console
-from mdbenchmark.utils import map_columns, parse_bundle, print_dataframe
-from mdbenchmark.versions import VersionFactory
+from mdbenchmark.costs import COST_COLUMNS, node_power, time_to_solution
+from mdbenchmark.fitting import fit_dataframe
+from mdbenchmark.outliers import flag_outliers, node_slowness
+from mdbenchmark.stats import (
+    aggregate_repeats,
+    replicas_long_format,
+    summarize_replicas,
+)
+from mdbenchmark.telemetry import TELEMETRY_COLUMNS
+from mdbenchmark.utils import (
+    hide_default_columns,
+    map_columns,
+    parse_bundle,
+    print_dataframe,
+    retrieve_host_metadata,
+    select_rows,
+    swept_parameters,
+)
+from mdbenchmark.versions import DETAILS_MAPPING, VersionFactory
+
+
+def print_scaling_fit(df, version, fit_model, predict_nodes):
+    """Fit a scaling model to each benchmark group and print the results."""
+    performance_column = "performance" if "performance" in df.columns else "ns/day"
+    columns = [c for c in version.consolidate_categories if c in df.columns]
+    fits = fit_dataframe(
+        df,
+        columns=columns,
+        model=fit_model,
+        performance_column=performance_column,
+        predict_nodes=predict_nodes,
+    )
+
+    if fits.empty:
+        console.warn(
+            "Not enough data points to fit the {} model to any benchmark group.",
+            fit_model,
+        )
+        return
+
+    mapping = dict(version.category_mapping)
+    mapping.update(
+        {
+            "model": "Model",
+            "reference_performance": "Fitted 1-node (ns/day)",
+            "serial_fraction": "Serial fraction",
+            "overhead": "Overhead",
+        }
+    )
+    mapping.update(
+        {"predicted_{}".format(n): "{} nodes (ns/day)".format(n) for n in predict_nodes}
+    )
+    print_dataframe(fits, columns=map_columns(mapping, fits.columns))
+
+
+def print_outliers(df, version, performance_column):
+    """Print flagged benchmarks and the slowness score of all nodes."""
+    outliers = df[df["outlier"]]
+    if outliers.empty:
+        console.info("No outliers were detected.")
+    else:
+        console.warn(
+            "Found {} outliers performing far below the median of their configuration.",
+            outliers.shape[0],
+        )
+        columns = ["module", "nodes", performance_column, "deviation", "hostnames"]
+        columns = [c for c in columns if c in outliers.columns]
+        table = outliers[columns].copy()
+        table["hostnames"] = table["hostnames"].apply(", ".join)
+        mapping = dict(version.category_mapping)
+        mapping.update({"deviation": "Deviation", "hostnames": "Hostnames"})
+        print_dataframe(table, columns=map_columns(mapping, columns))
+
+    slowness = node_slowness(df)
+    if slowness.empty:
+        console.warn("Could not determine the hostnames of any benchmark.")
+        return
+
+    print_dataframe(
+        slowness, columns=["Hostname", "# benchmarks", "# outliers", "Slowness"]
+    )
+
+
+def print_replicas(df, version, columns):
+    """Print the performance of each replica and warn about failed replicas."""
+    table = replicas_long_format(df, columns=columns)
+    failed = table["replica_performance"].isnull().sum()
+    if failed:
+        console.warn(
+            "{} replicas did not finish. The performance of their benchmarks "
+            "is reported as missing.",
+            failed,
+        )
+
+    printing = list(table.columns)
+    mapping = dict(version.category_mapping)
+    mapping.update(DETAILS_MAPPING)
+    print_dataframe(
+        table.replace(np.nan, "?"), columns=map_columns(mapping, printing),
+    )
 
+    return table
+
+
+def do_analyze(
+    directory,
+    save_csv,
+    fit_model=None,
+    predict_nodes=None,
+    confidence=0.95,
+    detect_outliers=False,
+    outlier_threshold=0.2,
+    log_details=False,
+    replicas=False,
+    telemetry=False,
+    target_ns=None,
+    power_per_node=None,
+    output_format="table",
+    limit=None,
+    sort=(),
+    descending=False,
+    columns=None,
+):
+    """Analyze benchmarks.
+
+    `output_format`, `limit`, `sort`, `descending` and `columns` only change
+    the printed results, not the saved CSV file.
+    """
+    if predict_nodes is None:
+        predict_nodes = []
+    else:
+        try:
+            predict_nodes = [int(n) for n in predict_nodes.split(",")]
+        except ValueError:
+            console.error(
+                "The value for {} must be a comma-separated list of integers.",
+                "--predict-nodes",
+            )
 
-def do_analyze(directory, save_csv):
-    """Analyze benchmarks."""
     bundle = dtr.discover(directory)
     version = VersionFactory(categories=bundle.categories).version_class
 
     df = parse_bundle(
-        bundle, columns=version.analyze_categories, sort_values_by=version.analyze_sort,
+        bundle,
+        columns=version.analyze_categories,
+        sort_values_by=version.analyze_sort,
+        with_hostnames=detect_outliers,
+        with_details=log_details,
+        with_replicas=replicas,
+        with_telemetry=telemetry,
     )
 
     # Remove the versions column from the DataFrame
     columns_to_drop = ["version", "temprange"]
-    df = df.drop(columns=columns_to_drop)
+    df = df.drop(columns=columns_to_drop, errors="ignore")
+    # Parameters of a generic sweep are printed after the known categories
+    sweep_columns = swept_parameters(bundle)
+    printing = version.analyze_printing + sweep_columns
+    mapping = dict(version.category_mapping)
+
+    # Values measured for each benchmark are averaged over repeats
+    measured_columns = []
+    if log_details:
+        # Append all parsed details to the printed columns
+        detail_columns = [
+            c
+            for c in df.columns
+            if c not in printing and c not in ["hostnames", "replicas"]
+        ]
+        printing = printing + detail_columns
+        measured_columns += detail_columns
+        for column in detail_columns:
+            mapping[column] = DETAILS_MAPPING.get(column, column)
+
+    # Benchmarks sharing all other categories are runs of the same configuration
+    performance_column = "performance" if "performance" in df.columns else "ns/day"
+    group_columns = [
+        c
+        for c in version.analyze_printing + sweep_columns
+        if c not in [performance_column, "ncores", "repeat"]
+    ]
+
+    replica_table = None
+    if replicas:
+        replica_columns = [c for c in ["module", "nodes", "repeat"] if c in df.columns]
+        replica_table = print_replicas(df, version=version, columns=replica_columns)
+        df = summarize_replicas(df)
+        summary_columns = [
+            "replicas",
+            "replicas_failed",
+            "replica_min",
+            "replica_max",
+            "replica_imbalance",
+        ]
+        printing = printing + summary_columns
+        measured_columns += summary_columns
+        for column in summary_columns:
+            mapping[column] = DETAILS_MAPPING[column]
+
+    if telemetry:
+        if df[TELEMETRY_COLUMNS].isnull().all().all():
+            console.warn(
+                "No telemetry was found. Generate benchmarks with {} to record it.",
+                "--telemetry",
+            )
+        printing = printing + TELEMETRY_COLUMNS
+        measured_columns += TELEMETRY_COLUMNS
+        for column in TELEMETRY_COLUMNS:
+            mapping[column] = DETAILS_MAPPING[column]
+
+    if detect_outliers:
+        df = flag_outliers(
+            df,
+            columns=group_columns,
+            performance_column=performance_column,
+            threshold=outlier_threshold,
+        )
+        print_outliers(df, version=version, performance_column=performance_column)
+        df = df.drop(columns=["hostnames", "deviation", "outlier"])
+
+    # Aggregate repeated benchmarks of the same configuration
+    if "repeat" in df.columns and (df["repeat"] > 0).any():
+        df = aggregate_repeats(
+            df.drop(columns="repeat"),
+            columns=group_columns,
+            performance_column=performance_column,
+            confidence=confidence,
+            measured_columns=measured_columns,
+        )
+        printing = list(df.columns)
+
+    if target_ns is not None:
+        metadata = {host: retrieve_host_metadata(host) for host in df["host"].unique()}
+        power = node_power(
+            df,
+            metadata,
+            gpu_column="use_gpu" if "use_gpu" in df.columns else "gpu",
+            power_per_node=power_per_node,
+        )
+        if power.isnull().any():
+            console.warn(
+                "The power draw per node is unknown for some hosts. Add "
+                "'power_per_node' to the host template metadata or use {} to "
+                "estimate the energy.",
+                "--power-per-node",
+            )
+        df = time_to_solution(
+            df, target_ns, performance_column=performance_column, power=power
+        )
+        printing = printing + COST_COLUMNS
+        for column in COST_COLUMNS:
+            mapping[column] = DETAILS_MAPPING[column]
 
     if save_csv is not None:
         if not save_csv.endswith(".csv"):
             save_csv = "{}.csv".format(save_csv)
         df.to_csv(save_csv, index=False)
+        if replica_table is not None:
+            replica_table.to_csv(
+                "{}_replicas.csv".format(save_csv[: -len(".csv")]), index=False
+            )
 
         console.success("Successfully benchmark data to {}.", save_csv)
 
-    # Reformat NaN values nicely into question marks.
-    # move this to the bundle function!
-    df = df.replace(np.nan, "?")
-    if df.isnull().values.any():
-        console.warn(
-            "We were not able to gather informations for all systems. "
-            "Systems marked with question marks have either crashed or "
-            "were not started yet."
+    # Select the printed rows and columns
+    if columns is not None:
+        columns = [c.strip() for c in columns.split(",") if c.strip()]
+    try:
+        table = select_rows(
+            df, columns=columns, sort=sort, descending=descending, limit=limit
         )
+    except ValueError as e:
+        console.error("{}", e)
+    printing = columns if columns else hide_default_columns(table, printing)
 
-    # Warn user that we are going to print more than 50 benchmark results to the console
-    if df.shape[0] > 50:
-        if click.confirm(
-            "We are about to print the results of {} benchmarks to the console. Continue?".format(
-                click.style(str(df.shape[0]), bold=True)
+    if output_format != "table":
+        print_dataframe(table[printing], columns=printing, output_format=output_format)
+    else:
+        # Reformat NaN values nicely into question marks.
+        # move this to the bundle function!
+        table = table.replace(np.nan, "?")
+        if table.isnull().values.any():
+            console.warn(
+                "We were not able to gather informations for all systems. "
+                "Systems marked with question marks have either crashed or "
+                "were not started yet."
             )
-        ):
-            pass
-        else:
-            console.error("Exiting.")
 
-    # Print the data to the console
-    print_dataframe(
-        df, columns=map_columns(version.category_mapping, version.analyze_printing),
-    )
+        # Warn user that we are going to print more than 50 benchmark results
+        # to the console. Non-interactive sessions never get asked.
+        if table.shape[0] > 50 and limit is None and sys.stdin.isatty():
+            if not click.confirm(
+                "We are about to print the results of {} benchmarks to the "
+                "console. Continue?".format(click.style(str(table.shape[0]), bold=True))
+            ):
+                console.error("Exiting.")
+
+        # Print the data to the console
+        print_dataframe(
+            table[printing], columns=map_columns(mapping, printing),
+        )
+
+    if fit_model is not None:
+        print_scaling_fit(
+            df,
+            version=version,
+            fit_model=fit_model,
+            predict_nodes=predict_nodes,
+        )
@@ -17,8 +17,11 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import sys
+
 import click
 
+from mdbenchmark import console
 from mdbenchmark.__version__ import VERSION
 from mdbenchmark.cli.options import AliasedGroup
 from mdbenchmark.cli.validators import (
@@ -50,7 +53,114 @@ def cli():
     default=None,
     help="Filename for the CSV file containing benchmark results.",
 )
-def analyze(directory, save_csv):
+@click.option(
+    "--fit-model",
+    help="Fit a scaling model to all data points of each benchmark group.",
+    type=click.Choice(["amdahl", "gustafson", "overhead"]),
+    default=None,
+)
+@click.option(
+    "--predict-nodes",
+    help="Comma-separated list of node counts to predict the performance for.",
+    default=None,
+    type=str,
+)
+@click.option(
+    "--confidence",
+    help="Confidence level of the bootstrap interval for repeated benchmarks.",
+    default=0.95,
+    show_default=True,
+    type=click.FloatRange(0, 1, min_open=True, max_open=True),
+)
+@click.option(
+    "--detect-outliers",
+    help="Flag benchmarks that perform far below their configuration median.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--outlier-threshold",
+    help="Relative deviation below the median at which benchmarks are flagged.",
+    default=0.2,
+    show_default=True,
+    type=click.FloatRange(0, 1),
+)
+@click.option(
+    "--log-details",
+    help="Add load balancing and timing details parsed from the log files.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--replicas",
+    help="Report the performance of each replica of multidir benchmarks.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--telemetry",
+    help="Summarize the telemetry sampled during the benchmarks.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--target-ns",
+    help="Estimate the resources needed to simulate this many nanoseconds.",
+    type=click.FloatRange(0, None, min_open=True),
+    default=None,
+)
+@click.option(
+    "--power-per-node",
+    help="Power draw per node in watts. Overrides the host template metadata.",
+    type=click.FloatRange(0, None),
+    default=None,
+)
+@click.option(
+    "--format",
+    "output_format",
+    help="Format of the printed results. csv and json skip all formatting.",
+    type=click.Choice(["table", "csv", "json"]),
+    default="table",
+    show_default=True,
+)
+@click.option(
+    "--limit",
+    help="Only print the first results.",
+    type=click.IntRange(1, None),
+    default=None,
+)
+@click.option(
+    "--sort",
+    help="Sort the printed results by this column. Can be given multiple times.",
+    multiple=True,
+)
+@click.option(
+    "--descending", help="Sort the printed results in descending order.", is_flag=True
+)
+@click.option(
+    "--columns",
+    help="Comma-separated list of the printed columns, e.g., module,nodes,performance.",
+    default=None,
+)
+def analyze(
+    directory,
+    save_csv,
+    fit_model,
+    predict_nodes,
+    confidence,
+    detect_outliers,
+    outlier_threshold,
+    log_details,
+    replicas,
+    telemetry,
+    target_ns,
+    power_per_node,
+    output_format,
+    limit,
+    sort,
+    descending,
+    columns,
+):
     """Analyze benchmarks and print the performance results.
 
     Benchmarks are searched recursively starting from the directory specified
@@ -63,10 +173,208 @@ def analyze(directory, save_csv):
     The benchmark performance results can be saved in a CSV file with the
     ``--save-csv`` option and a custom filename. To plot the results use
     ``mdbenchmark plot``.
+
+    Repeated benchmarks of the same configuration are aggregated into their
+    mean performance, standard deviation, minimum, maximum and a bootstrap
+    confidence interval, whose level can be set with ``--confidence``.
+
+    With ``--detect-outliers``, benchmarks that perform far below the median
+    of their configuration are flagged and a slowness score is computed for
+    every node, using the hostnames found in the log files and the nodelist
+    written by the job template.
+
+    Use ``--log-details`` to add further columns parsed from the log files,
+    e.g., the share of time spent in PME and waiting for communication, the
+    load imbalance and the GPU offload settings (GROMACS only).
+
+    With ``--replicas``, the performance of every replica of a multidir
+    benchmark is printed and the slowest and fastest replica as well as their
+    imbalance are added to the results. Together with ``--save-csv``, the
+    per-replica results are saved to a second CSV file ending in
+    ``_replicas.csv``.
+
+    Benchmarks generated with ``--telemetry`` record their progress while
+    running. With ``--telemetry``, the warm-up time, the mean performance and
+    its variation after the warm-up and the mean CPU, memory and GPU
+    utilization of the node are reported.
+
+    With ``--target-ns``, the wall-clock time, node hours, core hours and
+    energy needed to simulate the given number of nanoseconds are estimated
+    for every benchmark. The energy uses the ``power_per_node`` value from the
+    host template metadata or the value given with ``--power-per-node``.
+
+    Use ``--fit-model`` to fit a scaling model to all data points of each
+    benchmark group and report the serial fraction. Node counts that were not
+    benchmarked can be extrapolated with ``--predict-nodes``.
+
+    Large result tables can be narrowed down with ``--sort``, ``--limit`` and
+    ``--columns``, which use the column names of the CSV file. With ``--format
+    csv`` or ``--format json``, the results are printed without any
+    formatting and all other messages go to stderr, so that the output can be
+    piped into other programs.
     """
     from mdbenchmark.cli.analyze import do_analyze
 
-    do_analyze(directory=directory, save_csv=save_csv)
+    stream = None if output_format == "table" else sys.stderr
+    with console.redirect_messages(stream):
+        do_analyze(
+            directory=directory,
+            save_csv=save_csv,
+            fit_model=fit_model,
+            predict_nodes=predict_nodes,
+            confidence=confidence,
+            detect_outliers=detect_outliers,
+            outlier_threshold=outlier_threshold,
+            log_details=log_details,
+            replicas=replicas,
+            telemetry=telemetry,
+            target_ns=target_ns,
+            power_per_node=power_per_node,
+            output_format=output_format,
+            limit=limit,
+            sort=sort,
+            descending=descending,
+            columns=columns,
+        )
+
+
+@cli.command()
+@click.option(
+    "-d",
+    "--directory",
+    help="Path in which to look for benchmarks.",
+    default=".",
+    show_default=True,
+)
+@click.option(
+    "-b",
+    "--baseline",
+    help="Module to compare all other modules to.",
+    required=True,
+)
+@click.option(
+    "-m",
+    "--module",
+    help="Module to compare to the baseline. Defaults to all other modules.",
+    multiple=True,
+)
+@click.option(
+    "--threshold",
+    help="Relative performance loss in percent that is flagged as regression.",
+    default=5.0,
+    show_default=True,
+    type=click.FloatRange(0, None),
+)
+@click.option(
+    "--confidence",
+    help="Confidence level of the bootstrap interval for repeated benchmarks.",
+    default=0.95,
+    show_default=True,
+    type=click.FloatRange(0, 1, min_open=True, max_open=True),
+)
+@click.option(
+    "-s",
+    "--save-csv",
+    default=None,
+    help="Filename for the CSV file containing the comparison.",
+)
+@click.option(
+    "--save-json",
+    default=None,
+    help="Filename for the JSON file containing the comparison.",
+)
+@click.option(
+    "--fail-on-regression",
+    help="Exit with an error if any regression was found.",
+    is_flag=True,
+)
+def compare(
+    directory,
+    baseline,
+    module,
+    threshold,
+    confidence,
+    save_csv,
+    save_json,
+    fail_on_regression,
+):
+    """Compare the performance of different modules.
+
+    Benchmarks of every module are lined up with the benchmarks of the
+    ``--baseline`` module that used the same host, number of nodes and layout.
+    The relative change of the performance is reported for each of them.
+
+    If benchmarks were repeated with ``--repeats``, a bootstrap confidence
+    interval of the change is computed and only significant changes are
+    flagged. Changes larger than ``--threshold`` are reported as regression or
+    improvement.
+
+    The comparison can be saved with ``--save-csv`` and ``--save-json``. With
+    ``--fail-on-regression`` the command exits with an error if any regression
+    was found, e.g., to check new modules before rolling them out.
+    """
+    from mdbenchmark.cli.compare import do_compare
+
+    do_compare(
+        directory=directory,
+        baseline=baseline,
+        module=module,
+        threshold=threshold,
+        confidence=confidence,
+        save_csv=save_csv,
+        save_json=save_json,
+        fail_on_regression=fail_on_regression,
+    )
+
+
+@cli.command()
+@click.option(
+    "-d",
+    "--directory",
+    help="Path in which to look for benchmarks.",
+    default=".",
+    show_default=True,
+)
+@click.option(
+    "-o",
+    "--output",
+    help="Filename of the HTML report.",
+    default="report.html",
+    show_default=True,
+)
+@click.option(
+    "--title",
+    help="Title of the report.",
+    default="MDBenchmark report",
+    show_default=True,
+)
+@click.option(
+    "--min-efficiency",
+    help="Minimal parallel efficiency in percent of recommended benchmarks.",
+    default=70.0,
+    show_default=True,
+    type=click.FloatRange(0, 100),
+)
+def report(directory, output, title, min_efficiency):
+    """Write a self-contained HTML report of the benchmark results.
+
+    The report shows the scaling of every benchmark group, the parallel
+    efficiency relative to the smallest number of nodes, all results and the
+    performance of every replica of multidir benchmarks. For every host, the
+    fastest benchmark with a parallel efficiency of at least
+    ``--min-efficiency`` is recommended.
+
+    The results are embedded into the HTML file and rendered by the browser,
+    so the report can be shared as a single file.
+    """
+    from mdbenchmark.cli.report import do_report
+
+    do_report(
+        directory=directory,
+        output=output,
+        title=title,
+        min_efficiency=min_efficiency,
+    )
 
 
 @cli.command()
@@ -127,6 +435,22 @@ def analyze(directory, save_csv):
     default=None,
     type=str,
 )
+@click.option(
+    "--node-sequence",
+    "sequence",
+    help="Sequence of the number of nodes between --min-nodes and --max-nodes.",
+    type=click.Choice(["range", "powers-of-two", "geometric", "divisors"]),
+    default="range",
+    show_default=True,
+)
+@click.option(
+    "--node-ratio",
+    "ratio",
+    help="Ratio between the number of nodes of a geometric sequence.",
+    type=click.FloatRange(1, None, min_open=True),
+    default=2,
+    show_default=True,
+)
 @click.option(
     "--time",
     help="Run time for benchmark in minutes.",
@@ -157,16 +481,16 @@ def analyze(directory, save_csv):
 @click.option(
     "--physical-cores",
     "physical_cores",
-    help="Number of physical cores on each node.",
+    help="Number of physical cores on each node. Defaults to the hardware profile of the host.",
     type=int,
-    default=40,
+    default=None,
 )
 @click.option(
     "--logical-cores",
     "logical_cores",
-    help="Number of logical cores on each node.",
+    help="Number of logical cores on each node. Defaults to the hardware profile of the host.",
     type=int,
-    default=40,
+    default=None,
 )
 @click.option(
     "--ranks",
@@ -197,6 +521,85 @@ def analyze(directory, save_csv):
     type=str,
     help="Comma-separated string giving the minimum and maximum temperature used for a REST2 simulation.",
 )
+@click.option(
+    "--repeats",
+    "repeats",
+    help="Number of repeated benchmarks to generate for each configuration.",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1, None),
+)
+@click.option(
+    "--auto-layouts",
+    "auto_layouts",
+    help="Generate all rank, thread and PME rank layouts that fit the NUMA domains and GPUs of a node.",
+    default=False,
+    is_flag=True,
+)
+@click.option(
+    "--pme-ranks",
+    "pme_ranks",
+    help="Number of separate PME ranks per node (GROMACS only).",
+    multiple=True,
+    type=click.IntRange(0, None),
+)
+@click.option(
+    "--nb",
+    help="Where to compute the non-bonded interactions (GROMACS only).",
+    multiple=True,
+    type=click.Choice(["auto", "cpu", "gpu"]),
+)
+@click.option(
+    "--pme",
+    help="Where to compute PME (GROMACS only).",
+    multiple=True,
+    type=click.Choice(["auto", "cpu", "gpu"]),
+)
+@click.option(
+    "--bonded",
+    help="Where to compute the bonded interactions (GROMACS only).",
+    multiple=True,
+    type=click.Choice(["auto", "cpu", "gpu"]),
+)
+@click.option(
+    "--update",
+    help="Where to compute the update and constraints (GROMACS only).",
+    multiple=True,
+    type=click.Choice(["auto", "cpu", "gpu"]),
+)
+@click.option(
+    "--dlb",
+    help="Whether to use dynamic load balancing (GROMACS only).",
+    multiple=True,
+    type=click.Choice(["auto", "no", "yes"]),
+)
+@click.option(
+    "--adaptive",
+    help="Stop GROMACS benchmarks once their performance is stable.",
+    is_flag=True,
+)
+@click.option(
+    "--tolerance",
+    help="Relative tolerance of the performance for --adaptive.",
+    default=0.02,
+    show_default=True,
+    type=click.FloatRange(0, 1, min_open=True),
+)
+@click.option(
+    "--telemetry",
+    help="Sample the progress and node utilization while benchmarks run.",
+    is_flag=True,
+)
+@click.option(
+    "--sweep",
+    help="Sweep a parameter over comma-separated values, e.g., nodes=1,2,4.",
+    multiple=True,
+)
+@click.option(
+    "--sweep-file",
+    help="YAML or JSON file describing the parameter sweep.",
+    type=click.Path(exists=True, dir_okay=False),
+)
 def generate(
     name,
     cpu,
@@ -206,6 +609,8 @@ def generate(
     min_nodes,
     max_nodes,
     nodes,
+    sequence,
+    ratio,
     time,
     skip_validation,
     job_name,
@@ -216,6 +621,19 @@ def generate(
     enable_hyperthreading,
     multidir,
     temprange,
+    repeats,
+    auto_layouts,
+    pme_ranks,
+    nb,
+    pme,
+    bonded,
+    update,
+    dlb,
+    adaptive,
+    tolerance,
+    telemetry,
+    sweep,
+    sweep_file,
 ):
     """Generate benchmarks for molecular dynamics simulations.
 
@@ -236,6 +654,43 @@ def generate(
     for the MPCDF clusters ``cobra``, ``draco`` and ``hydra`` are provided with the
     package. All available templates can be listed with the ``--list-hosts``
     option.
+
+    The number of cores per node is read from the hardware profile in the
+    host template, which can be created with ``mdbenchmark profile``. Use
+    ``--physical-cores`` and ``--logical-cores`` to override it.
+
+    Instead of picking the number of ranks with ``--ranks``, all sensible
+    layouts of ranks, threads and separate PME ranks can be generated with
+    ``--auto-layouts``. Layouts whose ranks straddle NUMA domains or that do
+    not distribute evenly over the GPUs of a node are skipped.
+
+    The GROMACS options ``-nb``, ``-pme``, ``-bonded``, ``-update`` and
+    ``-dlb`` can be swept by passing the respective option multiple times,
+    e.g., ``--pme cpu --pme gpu``. The number of separate PME ranks per node is
+    swept with ``--pme-ranks``. Offloading to GPUs is only used for GPU
+    benchmarks.
+
+    To get statistically sound results on noisy machines, every configuration
+    can be benchmarked multiple times with the ``--repeats`` option.
+
+    Benchmarks often run longer than needed to get a stable performance. With
+    ``--adaptive``, a short calibration run determines the number of steps of
+    each GROMACS benchmark, which is then stopped as soon as the rolling
+    performance estimate is stable within ``--tolerance``. The run time given
+    with ``--time`` becomes the upper limit.
+
+    With ``--telemetry``, the job scripts record the progress of the benchmark
+    and the CPU, memory and GPU utilization of the node every few seconds.
+    Use ``mdbenchmark analyze --telemetry`` to summarize the recordings.
+
+    Any parameter can be swept with ``--sweep key=v1,v2`` or a sweep file
+    passed with ``--sweep-file``. Parameters that are unknown to MDBenchmark
+    are stored with the benchmarks and passed to the job template.
+
+    Instead of every number of nodes between ``--min-nodes`` and
+    ``--max-nodes``, ``--node-sequence`` selects only powers of two, a
+    geometric sequence with the ratio ``--node-ratio`` or the divisors of
+    ``--max-nodes``.
     """
     from mdbenchmark.cli.generate import do_generate
 
@@ -248,6 +703,8 @@ def generate(
         min_nodes=min_nodes,
         max_nodes=max_nodes,
         nodes=nodes,
+        sequence=sequence,
+        ratio=ratio,
         time=time,
         skip_validation=skip_validation,
         job_name=job_name,
@@ -258,6 +715,24 @@ def generate(
         enable_hyperthreading=enable_hyperthreading,
         multidir=multidir,
         temprange=temprange,
+        repeats=repeats,
+        auto_layouts=auto_layouts,
+        pme_ranks=pme_ranks,
+        mdrun_options={
+            category: values
+            for category, values in [
+                ("mdrun_nb", nb),
+                ("mdrun_pme", pme),
+                ("mdrun_bonded", bonded),
+                ("mdrun_update", update),
+                ("mdrun_dlb", dlb),
+            ]
+            if values
+        },
+        adaptive_tolerance=tolerance if adaptive else None,
+        telemetry=telemetry,
+        sweep=sweep,
+        sweep_file=sweep_file,
     )
 
 
@@ -267,10 +742,11 @@ def generate(
 @click.option(
     "-f",
     "--output-format",
-    help="File format for the generated plot.",
+    help="File format for the generated plot. Can be given multiple times.",
     type=click.Choice(["png", "pdf", "svg", "ps"]),
+    multiple=True,
     show_default=True,
-    default="png",
+    default=["png"],
 )
 @click.option(
     "-m",
@@ -313,6 +789,13 @@ def generate(
     show_default=True,
     default=True,
 )
+@click.option(
+    "--fit-model",
+    help="Model used for the fit. The linear fit only uses the first two data points.",
+    type=click.Choice(["linear", "amdahl", "gustafson", "overhead"]),
+    show_default=True,
+    default="linear",
+)
 @click.option(
     "--font-size", help="Font size for generated plot.", default=16, show_default=True
 )
@@ -332,6 +815,23 @@ def generate(
     show_default=True,
     is_flag=True,
 )
+@click.option(
+    "--facet",
+    help="Plot the benchmarks of every host, module or node type separately.",
+    type=click.Choice(["host", "module", "gpu"]),
+)
+@click.option(
+    "--max-legend-entries",
+    help="Maximal number of benchmark groups listed in the legend.",
+    type=click.IntRange(1, None),
+    default=20,
+    show_default=True,
+)
+@click.option(
+    "--plots",
+    help="YAML or JSON file describing several plots of the same data.",
+    type=click.Path(exists=True, dir_okay=False),
+)
 def plot(
     csv,
     output_name,
@@ -342,10 +842,14 @@ def plot(
     cpu,
     plot_cores,
     fit,
+    fit_model,
     font_size,
     dpi,
     xtick_step,
     watermark,
+    facet,
+    max_legend_entries,
+    plots,
 ):
     """Generate plots showing the benchmark performance.
 
@@ -354,13 +858,24 @@ def plot(
     command.
 
     You can customize the filename and file format of the generated plot with
-    the ``--output-name`` and ``--output-format`` option, respectively. Per default, a fit
-    will be plotted through the first data points of each benchmark group. To
-    disable the fit, use the ``--no-fit`` option.
+    the ``--output-name`` and ``--output-format`` option, respectively. Give
+    ``--output-format`` several times to save the plot in several formats.
+
+    Per default, a fit will be plotted through the first data points of each
+    benchmark group. To disable the fit, use the ``--no-fit`` option. Use
+    ``--fit-model`` to fit a scaling model to all data points instead.
 
     To only plot specific benchmarks, make use of the ``--module``, ``--template``,
     ``--cpu/--no-cpu`` and ``--gpu/--no-gpu`` options.
 
+    Plots of many benchmark groups quickly become hard to read. Use ``--facet``
+    to draw one subplot per host, module or node type into the same figure.
+    The legend lists at most ``--max-legend-entries`` groups.
+
+    Many plots of the same CSV files can be described in a YAML or JSON file
+    passed with ``--plots``. The data is only read once and filtered for every
+    plot. All options given on the command line serve as defaults.
+
     A small watermark will be added to the top left corner of every plot, to
     spread the usage of MDBenchmark. You can remove the watermark with the
     ``--no-watermark`` option.
@@ -381,6 +896,10 @@ def plot(
         dpi,
         xtick_step,
         watermark,
+        fit_model=fit_model,
+        facet=facet,
+        max_legend_entries=max_legend_entries,
+        plots=plots,
     )
 
 
@@ -400,7 +919,12 @@ def plot(
     is_flag=True,
 )
 @click.option("-y", "--yes", is_flag=True, help="Answer all prompts with yes.")
-def submit(directory, force_restart, yes):
+@click.option(
+    "--dry-run",
+    help="Only show what would be submitted and removed, without doing it.",
+    is_flag=True,
+)
+def submit(directory, force_restart, yes, dry_run):
     """Submit benchmarks to queuing system.
 
     Benchmarks are searched recursively starting from the directory specified
@@ -411,11 +935,115 @@ def submit(directory, force_restart, yes):
 
     Checks whether benchmark folders were already generated, exits otherwise.
     Only runs benchmarks that were not already started. Can be overwritten with
-    ``--force``.
+    ``--force``, which removes all output files of previous runs. Use
+    ``--dry-run`` to see how many files and bytes would be removed.
     """
     from mdbenchmark.cli.submit import do_submit
 
-    do_submit(directory=directory, force_restart=force_restart, yes=yes)
+    do_submit(
+        directory=directory, force_restart=force_restart, yes=yes, dry_run=dry_run
+    )
+
+
+@cli.command()
+@click.option(
+    "-t",
+    "--template",
+    "--host",
+    "host",
+    help="Save the profile into the template of this host.",
+    default=None,
+)
+def profile(host):
+    """Detect the hardware profile of the current node.
+
+    The profile contains the number of sockets, cores per socket, threads per
+    core, GPUs, NUMA domains and the memory of the node. Run this command once
+    on a compute node, as login nodes often differ from them.
+
+    Without ``--host``, the profile is printed as a metadata block to add to a
+    host template. Otherwise it is saved into a copy of the host template in
+    the user configuration folder.
+    """
+    from mdbenchmark.cli.profile import do_profile
+
+    do_profile(host=host)
+
+
+@cli.group()
+def db():
+    """Store benchmark results of many campaigns in a database.
+
+    The results of all benchmarks are collected in a SQLite database, which is
+    located at ``$XDG_DATA_HOME/MDBenchmark/results.db`` by default. This
+    allows to compare hosts and modules across many benchmark campaigns.
+    """
+    pass
+
+
+@db.command()
+@click.option(
+    "-d",
+    "--directory",
+    help="Path in which to look for benchmarks.",
+    default=".",
+    show_default=True,
+)
+@click.option("--database", help="Path to the results database.", default=None)
+def ingest(directory, database):
+    """Add finished benchmarks to the results database.
+
+    Each benchmark is stored with its host, module, layout, performance, the
+    time it finished and a hash of its input files. Benchmarks that were
+    already ingested and did not change since are skipped, so running this
+    command repeatedly only adds new results.
+    """
+    from mdbenchmark.cli.db import do_ingest
+
+    do_ingest(directory=directory, database=database)
+
+
+@db.command()
+@click.option("--database", help="Path to the results database.", default=None)
+@click.option(
+    "-n",
+    "--name",
+    help="Name of the system or prefix of the hash of its input files.",
+    default=None,
+)
+@click.option("--host", help="Only show benchmarks of this host.", multiple=True)
+@click.option("--module", help="Only show benchmarks of this module.", multiple=True)
+@click.option(
+    "--since",
+    help="Only show benchmarks finished since this date.",
+    type=click.DateTime(),
+    default=None,
+)
+@click.option(
+    "--best",
+    help="Only show the fastest benchmark of each system, host and module.",
+    is_flag=True,
+)
+@click.option("-s", "--save-csv", help="Save the results to a CSV file.", default=None)
+def query(database, name, host, module, since, best, save_csv):
+    """Query the results database.
+
+    For example, the best performance of the system ``protein`` on every host
+    since the beginning of 2020 is shown with::
+
+        mdbenchmark db query --name protein --since 2020-01-01 --best
+    """
+    from mdbenchmark.cli.db import do_query
+
+    do_query(
+        database=database,
+        name=name,
+        host=host,
+        module=module,
+        since=since,
+        best=best,
+        save_csv=save_csv,
+    )
 
 
 @cli.command()
@@ -0,0 +1,121 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import datreant as dtr
+import numpy as np
+
+from mdbenchmark import console
+from mdbenchmark.compare import compare_modules
+from mdbenchmark.utils import (
+    hide_default_columns,
+    map_columns,
+    parse_bundle,
+    print_dataframe,
+    swept_parameters,
+)
+from mdbenchmark.versions import VersionFactory
+
+# Human readable names of the columns added by `compare_modules`
+COMPARE_MAPPING = {
+    "baseline": "Baseline",
+    "baseline_performance": "Baseline (ns/day)",
+    "change": "Change (%)",
+    "change_low": "CI low (%)",
+    "change_high": "CI high (%)",
+    "significant": "Significant",
+    "status": "Status",
+}
+
+
+def do_compare(
+    directory,
+    baseline,
+    module,
+    threshold,
+    confidence,
+    save_csv,
+    save_json,
+    fail_on_regression,
+):
+    """Compare the performance of identical layouts across modules."""
+    bundle = dtr.discover(directory)
+    version = VersionFactory(categories=bundle.categories).version_class
+
+    df = parse_bundle(
+        bundle, columns=version.analyze_categories, sort_values_by=version.analyze_sort
+    )
+    df = df.drop(columns=["version", "temprange"], errors="ignore")
+
+    modules = df["module"].unique()
+    if baseline not in modules:
+        console.error("There are no benchmarks of the baseline module {}.", baseline)
+    if module:
+        df = df[df["module"].isin(list(module) + [baseline])]
+
+    # The layout of a benchmark is described by all categories except for the
+    # results and the run time
+    performance_column = "performance" if "performance" in df.columns else "ns/day"
+    columns = [
+        c
+        for c in version.analyze_printing + swept_parameters(bundle)
+        if c not in ["module", performance_column, "time", "ncores", "repeat"]
+    ]
+    comparison = compare_modules(
+        df,
+        baseline=baseline,
+        columns=columns,
+        performance_column=performance_column,
+        threshold=threshold / 100,
+        confidence=confidence,
+    )
+    if comparison.empty:
+        console.error(
+            "There are no benchmarks with the same layout as the baseline module."
+        )
+
+    if save_csv is not None:
+        if not save_csv.endswith(".csv"):
+            save_csv = "{}.csv".format(save_csv)
+        comparison.to_csv(save_csv, index=False)
+        console.info("Saved the comparison to {}.", save_csv)
+    if save_json is not None:
+        if not save_json.endswith(".json"):
+            save_json = "{}.json".format(save_json)
+        comparison.to_json(save_json, orient="records", indent=2)
+        console.info("Saved the comparison to {}.", save_json)
+
+    # Print relative changes in percent
+    table = comparison.copy()
+    for column in ["change", "change_low", "change_high"]:
+        table[column] = (100 * table[column]).round(1)
+    table = table.replace(np.nan, "?")
+    printing = hide_default_columns(table, list(table.columns))
+    mapping = dict(version.category_mapping)
+    mapping.update(COMPARE_MAPPING)
+    mapping["performance"] = version.category_mapping[performance_column]
+    print_dataframe(table[printing], columns=map_columns(mapping, printing))
+
+    regressions = (comparison["status"] == "regression").sum()
+    if regressions:
+        message = "Found {} regressions of more than {}% compared to {}."
+        if fail_on_regression:
+            console.error(message, regressions, threshold, baseline)
+        console.warn(message, regressions, threshold, baseline)
+    else:
+        console.info("Found no regressions compared to {}.", baseline)
@@ -0,0 +1,109 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import datreant as dtr
+
+from mdbenchmark import console
+from mdbenchmark.database import DEFAULT_DATABASE, connect, ingest, query_results
+from mdbenchmark.utils import hide_default_columns, map_columns, print_dataframe
+
+# Human readable names of the columns returned by `query_results`
+QUERY_MAPPING = {
+    "timestamp": "Finished",
+    "system": "System",
+    "system_hash": "Input hash",
+    "host": "Host",
+    "module": "Module",
+    "gpu": "GPUs?",
+    "nodes": "Nodes",
+    "ranks": "# ranks",
+    "threads": "# threads",
+    "pme_ranks": "# PME ranks",
+    "mdrun_nb": "-nb",
+    "mdrun_pme": "-pme",
+    "mdrun_bonded": "-bonded",
+    "mdrun_update": "-update",
+    "mdrun_dlb": "-dlb",
+    "gpus_per_rank": "GPUs per rank",
+    "sweep": "Swept parameters",
+    "multidir": "# Simulations",
+    "repeat": "Repeat",
+    "performance": "ns/day",
+}
+
+
+def do_ingest(directory, database):
+    """Add all finished benchmarks below `directory` to the database."""
+    if database is None:
+        database = DEFAULT_DATABASE
+
+    bundle = dtr.discover(directory)
+    if not bundle:
+        console.error("There are no benchmarks in {}.", directory)
+
+    connection = connect(database)
+    try:
+        added, skipped = ingest(connection, bundle)
+    finally:
+        connection.close()
+
+    console.success(
+        "Added {} benchmarks to {}. Skipped {} unchanged or unfinished benchmarks.",
+        added,
+        database,
+        skipped,
+    )
+
+
+def do_query(database, name, host, module, since, best, save_csv):
+    """Print the benchmarks in the database matching the filters."""
+    if database is None:
+        database = DEFAULT_DATABASE
+
+    connection = connect(database)
+    try:
+        df = query_results(
+            connection,
+            system=name,
+            hosts=host,
+            modules=module,
+            since=since,
+            best=best,
+        )
+    finally:
+        connection.close()
+
+    if df.empty:
+        console.error("There are no benchmarks matching the query.")
+
+    if save_csv is not None:
+        if not save_csv.endswith(".csv"):
+            save_csv = "{}.csv".format(save_csv)
+        df.to_csv(save_csv, index=False)
+        console.info("Saved the results to {}.", save_csv)
+
+    # The full hash is too long for the console. Layout columns that were
+    # never set are not printed.
+    df["system_hash"] = df["system_hash"].str[:12]
+    printing = [
+        c
+        for c in hide_default_columns(df, list(df.columns))
+        if c not in ["gpus_per_rank", "sweep"] or df[c].notnull().any()
+    ]
+    print_dataframe(df[printing], columns=map_columns(QUERY_MAPPING, printing))
@@ -20,20 +20,33 @@
 import os.path
 
 import click
-import pandas as pd
 
 from mdbenchmark import console, mdengines, utils
 from mdbenchmark.cli.validators import (
     validate_cpu_gpu_flags,
+    validate_host_nodes,
     validate_number_of_nodes,
     validate_number_of_simulations,
 )
-from mdbenchmark.mdengines.utils import write_benchmark
+from mdbenchmark.mdengines.utils import (
+    CALIBRATION_TIME,
+    RESERVED_CATEGORIES,
+    write_benchmark,
+)
 from mdbenchmark.models import Processor
+from mdbenchmark.sweep import (
+    load_sweep_spec,
+    merge_sweep_specs,
+    parse_sweep_options,
+    sweep_parameters,
+)
 from mdbenchmark.utils import (
-    consolidate_dataframe,
+    ConsolidatedRows,
     construct_generate_data,
+    hide_default_columns,
     map_columns,
+    node_sequence,
+    parse_nodes,
     print_dataframe,
     validate_required_files,
 )
@@ -47,6 +60,37 @@ NAMD_WARNING = (
 )
 
 
+# Number of cores per node, if neither the user nor the host template tell us
+DEFAULT_CORES = 40
+
+
+def get_processor(host, physical_cores=None, logical_cores=None):
+    """Return the processor of the compute nodes of `host`.
+
+    Cores given on the command line take precedence over the hardware profile
+    stored in the host template. Without either, we assume the default number
+    of cores.
+    """
+    if physical_cores is None and logical_cores is None:
+        processor = Processor.from_profile(utils.retrieve_host_metadata(host))
+        if processor is not None:
+            return processor
+        physical_cores = logical_cores = DEFAULT_CORES
+
+    if physical_cores and not logical_cores:
+        console.warn("Assuming logical_cores = 2 * physical_cores")
+        logical_cores = 2 * physical_cores
+    elif logical_cores and not physical_cores:
+        physical_cores = logical_cores
+
+    if logical_cores < physical_cores:
+        console.error(
+            "The number of logical cores cannot be smaller than the number of physical cores."
+        )
+
+    return Processor(physical_cores=physical_cores, logical_cores=logical_cores)
+
+
 def do_generate(
     name,
     cpu,
@@ -66,6 +110,16 @@ def do_generate(
     enable_hyperthreading,
     multidir,
     temprange,
+    repeats=1,
+    auto_layouts=False,
+    pme_ranks=(),
+    mdrun_options=None,
+    adaptive_tolerance=None,
+    telemetry=False,
+    sweep=(),
+    sweep_file=None,
+    sequence="range",
+    ratio=2,
 ):
     """Generate a bunch of benchmarks."""
 
@@ -77,32 +131,127 @@ def do_generate(
 
     # Validate the number of nodes
     validate_number_of_nodes(min_nodes=min_nodes, max_nodes=max_nodes)
-
-    if logical_cores < physical_cores:
+    if nodes and sequence != "range":
         console.error(
-            "The number of logical cores cannot be smaller than the number of physical cores."
+            "The options {} and {} cannot be combined.", "--nodes", "--node-sequence"
         )
-
-    if physical_cores and not logical_cores:
-        console.warn("Assuming logical_cores = 2 * physical_cores")
-        logical_cores = 2 * physical_cores
-
-    if physical_cores and logical_cores:
-        processor = Processor(
-            physical_cores=physical_cores, logical_cores=logical_cores
+    try:
+        node_counts = (
+            parse_nodes(nodes)
+            if nodes
+            else node_sequence(min_nodes, max_nodes, sequence=sequence, ratio=ratio)
         )
-    else:
-        processor = Processor()
+    except ValueError as e:
+        console.error(e)
+    if not node_counts:
+        console.error(
+            "The {} sequence has no numbers of nodes between {} and {}.",
+            sequence,
+            min_nodes,
+            max_nodes,
+        )
+
+    processor = get_processor(host, physical_cores, logical_cores)
 
     # Hyperthreading check
     if enable_hyperthreading and not processor.supports_hyperthreading:
         console.error("The processor of this machine does not support hyperthreading.")
 
+    if gpu and processor.gpus == 0:
+        console.error(
+            "The hardware profile of host '{}' does not list any GPUs.", host
+        )
+
+    if auto_layouts and number_of_ranks:
+        console.error(
+            "The options {} and {} cannot be combined.", "--ranks", "--auto-layouts"
+        )
+
+    if auto_layouts and pme_ranks:
+        console.error(
+            "The options {} and {} cannot be combined.",
+            "--pme-ranks",
+            "--auto-layouts",
+        )
+
+    # mdrun applies -npme to each simulation of a multidir run. Enumerated
+    # layouts skip separate PME ranks for multiple simulations as well.
+    if pme_ranks and any(m > 1 for m in multidir):
+        console.error(
+            "The options {} and {} cannot be combined.", "--pme-ranks", "--multidir"
+        )
+
+    if adaptive_tolerance is not None:
+        if any(m > 1 for m in multidir):
+            console.error(
+                "The options {} and {} cannot be combined.", "--adaptive", "--multidir"
+            )
+        if time <= 2 * CALIBRATION_TIME:
+            console.error(
+                "Adaptive benchmarks must run longer than {} minutes.",
+                2 * CALIBRATION_TIME,
+            )
+
+    # Parameters given on the command line take precedence over the sweep file
+    try:
+        sweep_spec = merge_sweep_specs(
+            load_sweep_spec(sweep_file) if sweep_file else {},
+            parse_sweep_options(sweep),
+        )
+    except ValueError as e:
+        console.error(e)
+    # Dimensions that are not categories of MDBenchmark are added as new ones
+    extra_columns = [
+        c
+        for c in sweep_parameters(sweep_spec)
+        if c not in benchmark_version.generate_categories
+    ]
+    reserved = [c for c in extra_columns if c in RESERVED_CATEGORIES]
+    if reserved:
+        console.error("Cannot sweep over {}.", ", ".join(reserved))
+
     if not number_of_ranks:
         number_of_ranks = (processor.physical_cores,)
+    # Swept numbers of ranks must be validated as well
+    swept_ranks = list(sweep_spec.get("parameters", {}).get("number_of_ranks", []))
+    swept_nodes = list(sweep_spec.get("parameters", {}).get("nodes", []))
+    for dimensions in sweep_spec.get("zip", []):
+        swept_ranks.extend(dimensions.get("number_of_ranks", []))
+        swept_nodes.extend(dimensions.get("nodes", []))
+
+    # Hosts may define their number of nodes in the template metadata
+    validate_host_nodes(
+        node_counts + swept_nodes, utils.retrieve_host_metadata(host).get("max_nodes")
+    )
+
+    # At least one rank per node must be left for the particle-particle work
+    if pme_ranks and not auto_layouts and max(pme_ranks) >= min(number_of_ranks):
+        console.error(
+            "The number of PME ranks ({}) must be smaller than the number of ranks ({}).",
+            max(pme_ranks),
+            min(number_of_ranks),
+        )
+
+    # GROMACS only supports a single PME rank with PME on the GPU. Enumerated
+    # layouts that need more are skipped instead.
+    if (
+        pme_ranks
+        and "gpu" in (mdrun_options or {}).get("mdrun_pme", [])
+        and max(pme_ranks) * max(node_counts + swept_nodes) > 1
+    ):
+        console.error(
+            "PME on the GPU only supports a single PME rank, but {} nodes with {} "
+            "PME ranks each were requested.",
+            max(node_counts + swept_nodes),
+            max(pme_ranks),
+        )
 
-    # Validate number of simulations
-    validate_number_of_simulations(multidir, min_nodes, max_nodes, number_of_ranks)
+    # Validate number of simulations. Enumerated layouts that do not fit the
+    # number of simulations are skipped instead.
+    if not auto_layouts:
+        validate_number_of_simulations(
+            multidir, node_counts + swept_nodes, list(number_of_ranks) + swept_ranks
+        )
 
     # Grab the template name for the host. This should always work because
     # click does the validation for us
@@ -111,6 +260,8 @@ def do_generate(
     # Warn the user that NAMD support is still experimental.
     if any(["namd" in m for m in module]):
         console.warn(NAMD_WARNING, "--gpu")
+        if adaptive_tolerance is not None:
+            console.warn("NAMD benchmarks always run for the full time.")
 
     # Stop if we cannot find any modules. If the user specified multiple
     # modules, we will continue with only the valid ones.
@@ -123,7 +274,7 @@ def do_generate(
 
     # Validate that we can use the number of ranks and threads.
     # We can continue, if no ValueError is thrown
-    for ranks in number_of_ranks:
+    for ranks in [] if auto_layouts else list(number_of_ranks) + swept_ranks:
         try:
             processor.get_ranks_and_threads(
                 ranks, with_hyperthreading=enable_hyperthreading
@@ -131,80 +282,115 @@ def do_generate(
         except ValueError as e:
             console.error(e)
 
-    # Create all benchmark combinations and put them into a DataFrame
-    data = construct_generate_data(
-        name,
-        job_name,
-        modules,
-        host,
-        template,
-        cpu,
-        gpu,
-        time,
-        min_nodes,
-        max_nodes,
-        nodes,
-        processor,
-        number_of_ranks,
-        enable_hyperthreading,
-        multidir,
-        temprange,
-    )
-    df = pd.DataFrame(data, columns=benchmark_version.generate_categories)
+    # Create the sweep over all benchmark combinations. Derived categories,
+    # e.g., the number of threads, cannot be swept.
+    try:
+        benchmark_sweep = construct_generate_data(
+            name,
+            job_name,
+            modules,
+            host,
+            template,
+            cpu,
+            gpu,
+            time,
+            node_counts,
+            processor,
+            number_of_ranks,
+            enable_hyperthreading,
+            multidir,
+            temprange,
+            repeats,
+            auto_layouts,
+            pme_ranks,
+            mdrun_options,
+            sweep_spec,
+        )
+    except ValueError as e:
+        console.error(e)
 
-    # Consolidate the data by grouping on the number of nodes and print to the
-    # user as an overview.
-    consolidated_df = consolidate_dataframe(
-        df, columns=benchmark_version.consolidate_categories
-    )
-    print_dataframe(
-        consolidated_df[benchmark_version.generate_printing],
-        columns=map_columns(
-            map_dict=benchmark_version.category_mapping,
-            columns=benchmark_version.generate_printing,
-        ),
+    # The sweep is only iterated once. Its rows are consolidated into the
+    # overview one at a time instead of building the whole cross product.
+    columns = [
+        c
+        for c in benchmark_version.generate_categories
+        if c not in ["base_directory", "engine", "template"]
+    ]
+    consolidated = ConsolidatedRows(
+        columns=columns + extra_columns,
+        group_columns=benchmark_version.consolidate_categories + extra_columns,
     )
 
-    # Save the number of benchmarks for later printing
-    number_of_benchmarks = df.shape[0]
-    # Ask the user for confirmation to generate files.
-    # If the user defined `--yes`, we will skip the confirmation immediately.
+    def sweep_rows():
+        try:
+            for row in benchmark_sweep:
+                consolidated.add(row)
+                yield row
+        except (KeyError, NameError, TypeError, ValueError) as e:
+            console.error("Invalid sweep: {}", e)
+
+    def write_benchmarks(rows, length=None):
+        first_benchmark = None
+        with click.progressbar(
+            rows, length=length, show_pos=True, label="Generating benchmarks"
+        ) as bar:
+            for benchmark_counter, row in enumerate(bar):
+                relative_path, file_basename = os.path.split(row["name"])
+                kwargs = {
+                    "name": file_basename,
+                    "benchmark_counter": benchmark_counter,
+                    "relative_path": relative_path,
+                    "first_benchmark": first_benchmark,
+                }
+                for key, value in benchmark_version.generate_mapping.items():
+                    kwargs[value] = row[key]
+                for key in extra_columns:
+                    kwargs[key] = row[key]
+                kwargs["adaptive_tolerance"] = adaptive_tolerance
+                kwargs["telemetry"] = telemetry
+
+                benchmark = write_benchmark(**kwargs)
+                if benchmark_counter == 0:
+                    first_benchmark = benchmark
+
+    def print_overview():
+        # Print the data grouped by the number of nodes as an overview.
+        consolidated_df = consolidated.to_dataframe()
+        printing = hide_default_columns(
+            consolidated_df, benchmark_version.generate_printing + extra_columns
+        )
+        print_dataframe(
+            consolidated_df[printing],
+            columns=map_columns(
+                map_dict=benchmark_version.category_mapping, columns=printing,
+            ),
+        )
+
+    # If the user defined `--yes`, the benchmarks are written while iterating
+    # over the sweep and the overview is printed afterwards. Otherwise the rows
+    # are kept until the user confirmed the overview.
     if yes:
+        write_benchmarks(sweep_rows())
+        if not consolidated.count:
+            console.error("The sweep does not contain any benchmarks.")
+        print_overview()
         console.info(
-            "We will generate {} "
+            "Generated {} "
             + "{benchmark}.".format(
-                benchmark="benchmark" if number_of_benchmarks == 1 else "benchmarks"
+                benchmark="benchmark" if consolidated.count == 1 else "benchmarks"
             ),
-            number_of_benchmarks,
+            consolidated.count,
         )
-    elif not click.confirm(
-        "We will generate {} benchmarks. Continue?".format(number_of_benchmarks)
-    ):
-        console.error("Exiting. No benchmarks were generated.")
-
-    # Generate the benchmarks
-    with click.progressbar(
-        df.iterrows(),
-        length=number_of_benchmarks,
-        show_pos=True,
-        label="Generating benchmarks",
-    ) as bar:
-        benchmark_counter = 0
-        for _, row in bar:
-            relative_path, file_basename = os.path.split(row["name"])
-            mappings = benchmark_version.generate_mapping
-            if benchmark_counter == 0:
-                first_benchmark = None
-            kwargs = {"name": file_basename, "benchmark_counter": benchmark_counter, 
-                      "relative_path": relative_path, "first_benchmark": first_benchmark}
-            for key, value in mappings.items():
-                kwargs[value] = row[key]
-
-            if benchmark_counter == 0:
-                first_benchmark = write_benchmark(**kwargs)
-            else:
-                _ = write_benchmark(**kwargs)
-            benchmark_counter += 1
+    else:
+        rows = list(sweep_rows())
+        if not rows:
+            console.error("The sweep does not contain any benchmarks.")
+        print_overview()
+        if not click.confirm(
+            "We will generate {} benchmarks. Continue?".format(len(rows))
+        ):
+            console.error("Exiting. No benchmarks were generated.")
+        write_benchmarks(rows, length=len(rows))
 
     # Finish up by telling the user how to submit the benchmarks
     console.info(
@@ -18,20 +18,53 @@
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
 import click
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from matplotlib import rcParams
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 
 from mdbenchmark import console
+from mdbenchmark.fitting import FIT_MODELS, fit_scaling, predict_performance
 from mdbenchmark.math import calc_slope_intercept, lin_func
 from mdbenchmark.mdengines import SUPPORTED_ENGINES
+from mdbenchmark.sweep import read_spec_file
 from mdbenchmark.utils import generate_output_name
 from mdbenchmark.versions import VersionFactory
 
-plt.switch_backend("agg")
+# Groups are drawn as a single LineCollection above this number of lines
+MAX_INDIVIDUAL_LINES = 10
+
+OUTPUT_FORMATS = ["png", "pdf", "svg", "ps"]
+
+FACET_COLUMNS = ["host", "module", "gpu"]
+
+# Options of a single plot in a plot specification, see `load_plot_spec`
+PLOT_OPTIONS = [
+    "output_name",
+    "output_format",
+    "host",
+    "module",
+    "gpu",
+    "cpu",
+    "plot_cores",
+    "fit",
+    "fit_model",
+    "font_size",
+    "dpi",
+    "xtick_step",
+    "watermark",
+    "facet",
+    "max_legend_entries",
+]
+
+PLOT_CHOICES = {
+    "output_format": OUTPUT_FORMATS,
+    "facet": FACET_COLUMNS,
+    "fit_model": ["linear"] + sorted(FIT_MODELS),
+}
 
 
 def get_xsteps(size, min_x, plot_cores, xtick_step):
@@ -59,40 +92,122 @@ def get_xsteps(size, min_x, plot_cores, xtick_step):
     return step
 
 
-def plot_projection(df, selection, color, performance_column, scaling, ax=None):
+def projection_points(df, selection, performance_column, scaling):
+    """Return the points of a linear projection through the first data point.
+
+    The second data point is projected to scale by `scaling`.
+    """
     # Grab x and y values
     xs = df[selection].iloc[0:2].values.tolist()
     ys = df[performance_column].iloc[0:2].values.tolist()
     ys[1] = ys[0] * scaling
-    
-    
+
     # Calculate slope and intercept
     p1, p2 = list(zip(xs, ys))
     slope, intercept = calc_slope_intercept(p1, p2)
 
-    # Plot the projection
     xstep = np.diff(xs)
     xmax = (df[selection].iloc[-1] + xstep).tolist()
     xs = np.array([0] + xs + xmax)
-    ax.plot(xs, lin_func(xs, slope, intercept), ls="--", color=color, alpha=0.5)
+    return xs, lin_func(xs, slope, intercept)
+
+
+def model_fit_points(df, selection, performance_column, model):
+    """Return the points of a scaling model fitted to all data points.
+
+    Returns None, if the model cannot be fitted.
+    """
+    try:
+        fit = fit_scaling(df[selection], df[performance_column], model=model)
+    except ValueError:
+        return None
+
+    xs = np.unique(df[selection].values)
+    xstep = np.diff(xs).min() if xs.size > 1 else xs[0]
+    xs = np.linspace(xs.min(), xs.max() + xstep, 100)
+    return xs, predict_performance(fit, xs)
+
+
+def fit_points(df, selection, performance_column, fit_model, scaling=2):
+    """Return the points of the fit of a group or None, if it cannot be fitted."""
+    if len(df[selection]) < 2:
+        return None
+    if fit_model != "linear":
+        return model_fit_points(df, selection, performance_column, fit_model)
+    return projection_points(df, selection, performance_column, scaling)
+
+
+def plot_projection(df, selection, color, performance_column, scaling, ax=None):
+    xs, ys = projection_points(df, selection, performance_column, scaling)
+    ax.plot(xs, ys, ls="--", color=color, alpha=0.5)
+
+    return ax
+
+
+def plot_model_fit(df, selection, color, performance_column, model, ax=None):
+    """Plot a scaling model fitted to all data points of a group."""
+    points = model_fit_points(df, selection, performance_column, model)
+    if points is not None:
+        ax.plot(*points, ls="--", color=color, alpha=0.5)
 
     return ax
 
 
-def plot_line(df, selection, label, fit, performance_column="performance", scaling=2, ax=None):
+def plot_line(
+    df,
+    selection,
+    label,
+    fit,
+    performance_column="performance",
+    scaling=2,
+    fit_model="linear",
+    color=None,
+    ax=None,
+):
     mask = np.isfinite(df[performance_column])
-    p = ax.plot(
-        df[selection][mask],
-        df[performance_column][mask],
-        ls="solid",
-        marker="o",
-        ms="8",
-        label=label,
-        # alpha=0.75,
-    )
+    ci_low = "{}_ci_low".format(performance_column)
+    ci_high = "{}_ci_high".format(performance_column)
+    if ci_low in df.columns and ci_high in df.columns:
+        # Draw error bars for repeated benchmarks
+        yerr = np.vstack(
+            [
+                df[performance_column][mask] - df[ci_low][mask],
+                df[ci_high][mask] - df[performance_column][mask],
+            ]
+        )
+        p = ax.errorbar(
+            df[selection][mask],
+            df[performance_column][mask],
+            yerr=np.nan_to_num(yerr),
+            ls="solid",
+            marker="o",
+            ms="8",
+            capsize=4,
+            label=label,
+            color=color,
+        )
+    else:
+        p = ax.plot(
+            df[selection][mask],
+            df[performance_column][mask],
+            ls="solid",
+            marker="o",
+            ms="8",
+            label=label,
+            color=color,
+        )
     color = p[0].get_color()
 
-    if fit and (len(df[selection]) > 1):
+    if fit and (len(df[selection]) > 1) and fit_model != "linear":
+        plot_model_fit(
+            df=df,
+            selection=selection,
+            color=color,
+            performance_column=performance_column,
+            model=fit_model,
+            ax=ax,
+        )
+    elif fit and (len(df[selection]) > 1):
         plot_projection(
             df=df,
             selection=selection,
@@ -101,58 +216,149 @@ def plot_line(df, selection, label, fit, performance_column="performance", scali
             scaling=scaling,
             ax=ax,
         )
-        # plot_projection(
-        #     df=df,
-        #     selection=selection,
-        #     color=color,
-        #     performance_column=performance_column,
-        #     scaling=1.5,
-        #     ax=ax,
-        # )
 
     return ax
 
 
-def plot_over_group(df, plot_cores, fit, performance_column, ax=None):
-    selection = "ncores" if plot_cores else "nodes"
+def plot_line_collection(
+    groups,
+    selection,
+    colors,
+    fit,
+    performance_column="performance",
+    fit_model="linear",
+    ax=None,
+):
+    """Plot many groups at once.
+
+    All lines are added as a single `LineCollection` and all markers as a
+    single scatter plot, instead of one artist per group. Error bars of
+    repeated benchmarks are not drawn.
+    """
+    lines, line_colors = [], []
+    fits, fit_colors = [], []
+    for label, df in groups:
+        xs = df[selection].values.astype(float)
+        ys = df[performance_column].values.astype(float)
+        mask = np.isfinite(ys)
+        lines.append(np.column_stack([xs[mask], ys[mask]]))
+        line_colors.append(colors[label])
+
+        points = None
+        if fit:
+            points = fit_points(df, selection, performance_column, fit_model)
+        if points is not None:
+            fits.append(np.column_stack(points))
+            fit_colors.append(colors[label])
+
+    ax.add_collection(LineCollection(lines, colors=line_colors))
+    if fits:
+        ax.add_collection(
+            LineCollection(fits, colors=fit_colors, linestyles="--", alpha=0.5)
+        )
+    ax.scatter(
+        np.concatenate([line[:, 0] for line in lines]),
+        np.concatenate([line[:, 1] for line in lines]),
+        c=np.repeat(line_colors, [len(line) for line in lines], axis=0),
+        s=64,
+        zorder=3,
+    )
+    ax.autoscale_view()
+
+    return ax
+
+
+def group_label(key, threads=None):
+    """Return the legend label of a benchmark group.
+
+    `key` maps the consolidated categories to the values of the group.
+    """
+    label = "{template} - {module}, {node_type}".format(
+        template=key["host"],
+        module=key["module"],
+        node_type="mixed CPU-GPU" if key.get("use_gpu", key.get("gpu")) else "CPU-only",
+    )
+
+    # Add ranks, threads and multdir information to label
+    if "number_of_ranks" in key:
+        label += " (ranks: {ranks}, threads: {threads}{ht}, nsims: {nsims})".format(
+            ranks=key["number_of_ranks"],
+            threads=threads,
+            ht=" [HT]" if key.get("hyperthreading") else "",
+            nsims=key.get("multidir", 1),
+        )
+
+    return label
+
+
+def label_groups(df, performance_column):
+    """Return the label and data of every benchmark group with performance data."""
     benchmark_version = VersionFactory(
         version="3" if "use_gpu" in df.columns else "2"
     ).version_class
+    columns = [c for c in benchmark_version.consolidate_categories if c in df.columns]
 
-    for key, group in df.groupby(benchmark_version.consolidate_categories):
+    groups = []
+    for key, group in df.groupby(columns):
         # Do not try to plot groups without performance values
         if group[performance_column].isnull().all():
             continue
 
-        if benchmark_version.version == "3":
-            module, template, gpus, ranks, hyperthreading, multidir = key
-            threads = group.number_of_threads.iloc[0]
-        else:
-            gpus, module, template = key
+        if not isinstance(key, tuple):
+            key = (key,)
+        threads = None
+        if "number_of_threads" in group.columns:
+            threads = group["number_of_threads"].iloc[0]
+        groups.append((group_label(dict(zip(columns, key)), threads), group))
 
-        label = "{template} - {module}, {node_type}".format(
-            template=template,
-            module=module,
-            node_type="mixed CPU-GPU" if gpus else "CPU-only",
-        )
+    return groups
 
-        # Add ranks, threads and multdir information to label
-        if benchmark_version.version == "3":
-            label += " (ranks: {ranks}, threads: {threads}{ht}, nsims: {nsims})".format(
-                ranks=ranks,
-                threads=threads,
-                ht=" [HT]" if hyperthreading else "",
-                nsims=multidir,
-            )
 
-        plot_line(
-            df=group,
+def assign_colors(labels):
+    """Map every label to a color of the color cycle, in order of appearance."""
+    cycle = rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = {}
+    for label in labels:
+        if label not in colors:
+            colors[label] = cycle[len(colors) % len(cycle)]
+    return colors
+
+
+def plot_over_group(
+    df, plot_cores, fit, performance_column, fit_model="linear", colors=None, ax=None
+):
+    """Plot the performance of every benchmark group.
+
+    `colors` maps the group labels to colors, so that groups keep their color
+    across several axes. Many groups are drawn with `plot_line_collection`.
+    """
+    selection = "ncores" if plot_cores else "nodes"
+    groups = label_groups(df, performance_column)
+    if colors is None:
+        colors = assign_colors(label for label, _ in groups)
+
+    if len(groups) > MAX_INDIVIDUAL_LINES:
+        plot_line_collection(
+            groups,
             selection=selection,
-            label=label,
+            colors=colors,
             fit=fit,
             performance_column=performance_column,
+            fit_model=fit_model,
             ax=ax,
         )
+    else:
+        for label, group in groups:
+            plot_line(
+                df=group,
+                selection=selection,
+                label=label,
+                fit=fit,
+                performance_column=performance_column,
+                fit_model=fit_model,
+                color=colors[label],
+                ax=ax,
+            )
 
     selection_label = "cores" if plot_cores else "nodes"
     ax.set_xlabel("Number of {selection}".format(selection=selection_label))
@@ -221,48 +427,8 @@ def filter_dataframe_for_plotting(df, host_name, module_name, gpu, cpu):
     return df
 
 
-def do_plot(
-    csv,
-    output_name,
-    output_format,
-    template,
-    module,
-    gpu,
-    cpu,
-    plot_cores,
-    fit,
-    font_size,
-    dpi,
-    xtick_step,
-    watermark,
-):
-    """Creates plots of benchmarks."""
-    if not csv:
-        raise click.BadParameter(
-            "You must specify at least one CSV file.", param_hint='"--csv"'
-        )
-
-    df = pd.concat([pd.read_csv(c) for c in csv])
-    performance_column = "performance" if "performance" in df.columns else "ns/day"
-
-    df = filter_dataframe_for_plotting(df, template, module, gpu, cpu)
-
-    # Exit if there is no performance data
-    if df[performance_column].isnull().all():
-        console.error("There is no performance data to plot.")
-
-    rcParams["font.size"] = font_size
-    fig = Figure()
-    FigureCanvas(fig)
-    ax = fig.add_subplot(111)
-    ax = plot_over_group(
-        df=df,
-        plot_cores=plot_cores,
-        fit=fit,
-        performance_column=performance_column,
-        ax=ax,
-    )
-
+def set_ticks(ax, df, performance_column, plot_cores, xtick_step):
+    """Set reasonable ticks and limits for the benchmarks in `df`."""
     # Update xticks
     selection = "ncores" if plot_cores else "nodes"
     min_x = df[selection].min() if plot_cores else 1
@@ -284,26 +450,258 @@ def do_plot(
     ax.set_yticks(yticks)
     ax.set_ylim(0, max_y + (max_y * 0.25))
 
-    # Add watermark
-    if watermark:
-        ax.text(0.025, 0.925, "MDBenchmark", transform=ax.transAxes, alpha=0.3)
+    return ax
 
-    legend = ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.175))
-    plt.tight_layout()
 
-    if output_name is None and len(csv) == 1:
-        csv_string = csv[0].split(".")[0]
-        output_name = "{}.{}".format(csv_string, output_format)
-    elif output_name is None and len(csv) != 1:
-        output_name = generate_output_name(output_format)
-    elif not output_name.endswith(".{}".format(output_format)):
-        output_name = "{}.{}".format(output_name, output_format)
-
-    fig.savefig(
-        output_name,
-        type=output_format,
-        bbox_extra_artists=(legend,),
-        bbox_inches="tight",
-        dpi=dpi,
+def plot_legend(target, colors, max_entries=None, bbox_to_anchor=(0.5, -0.175)):
+    """Add a legend for all labels in `colors` below the plot.
+
+    `target` is either an axis or a figure. If there are more than
+    `max_entries` labels, only the first ones are listed, followed by the
+    number of omitted labels.
+    """
+    labels = list(colors)
+    omitted = 0
+    if max_entries is not None and len(labels) > max_entries:
+        omitted = len(labels) - max_entries
+        labels = labels[:max_entries]
+
+    handles = [
+        Line2D([], [], color=colors[label], marker="o", ms=8) for label in labels
+    ]
+    if omitted:
+        handles.append(Line2D([], [], ls="none"))
+        labels.append("... and {} more".format(omitted))
+
+    return target.legend(
+        handles, labels, loc="upper center", bbox_to_anchor=bbox_to_anchor
     )
-    console.info("The plot was saved as '{}'.", output_name)
+
+
+def facet_title(facet, value):
+    """Return the title of the subplot showing all benchmarks with `value`."""
+    if facet == "gpu":
+        return "mixed CPU-GPU" if value else "CPU-only"
+    return str(value)
+
+
+def load_plot_spec(filename):
+    """Load the plots described in a YAML or JSON file.
+
+    The file contains a list of ``plots``. Every plot needs an ``output_name``
+    and may set any other option of `do_plot`, e.g., ``host``, ``module``,
+    ``gpu`` or a list of ``output_format``.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a valid plot specification.
+    """
+    spec = read_spec_file(filename)
+    if not isinstance(spec, dict) or not isinstance(spec.get("plots"), list):
+        raise ValueError("A plot specification must contain a list of plots.")
+
+    plots = []
+    for view in spec["plots"]:
+        if not isinstance(view, dict) or "output_name" not in view:
+            raise ValueError("Every plot needs an output_name.")
+        unknown = set(view) - set(PLOT_OPTIONS)
+        if unknown:
+            raise ValueError(
+                "Unknown plot options: {}.".format(", ".join(sorted(unknown)))
+            )
+
+        view = dict(view)
+        if "host" in view:
+            view["template"] = view.pop("host")
+        for key in ["output_format", "template", "module"]:
+            if isinstance(view.get(key), str):
+                view[key] = [view[key]]
+        for key, choices in PLOT_CHOICES.items():
+            values = view.get(key, [])
+            values = values if isinstance(values, list) else [values]
+            invalid = [str(v) for v in values if v not in choices]
+            if invalid:
+                raise ValueError(
+                    "Invalid value for {}: {}. Choose from {}.".format(
+                        key, ", ".join(invalid), ", ".join(choices)
+                    )
+                )
+        plots.append(view)
+
+    return plots
+
+
+def output_names(csv, output_name, output_format):
+    """Return the file name of the plot for every format in `output_format`."""
+    if output_name is None and len(csv) == 1:
+        output_name = csv[0].split(".")[0]
+    elif output_name is None:
+        output_name = generate_output_name(output_format[0]).rsplit(".", 1)[0]
+    else:
+        for extension in output_format:
+            if output_name.endswith(".{}".format(extension)):
+                output_name = output_name[: -len(extension) - 1]
+                break
+
+    return ["{}.{}".format(output_name, extension) for extension in output_format]
+
+
+def plot_figure(
+    df,
+    performance_column,
+    plot_cores,
+    fit,
+    font_size,
+    xtick_step,
+    watermark,
+    fit_model="linear",
+    facet=None,
+    max_legend_entries=20,
+):
+    """Return the figure and legend of the performance of all benchmarks.
+
+    With `facet`, every value of this column gets its own subplot.
+    """
+    rcParams["font.size"] = font_size
+    # Groups keep their color in all subplots
+    colors = assign_colors(label for label, _ in label_groups(df, performance_column))
+
+    if facet is None:
+        facets = [(None, df)]
+    else:
+        # Version 3 data stores the GPU flag as `use_gpu`
+        column = "use_gpu" if facet == "gpu" and "use_gpu" in df.columns else facet
+        facets = [
+            (facet_title(facet, value), group)
+            for value, group in df.groupby(column)
+            if not group[performance_column].isnull().all()
+        ]
+    ncols = int(np.ceil(np.sqrt(len(facets))))
+    nrows = int(np.ceil(len(facets) / ncols))
+    width, height = rcParams["figure.figsize"]
+    fig = Figure(figsize=(width * ncols, height * nrows))
+    FigureCanvas(fig)
+
+    for index, (title, facet_df) in enumerate(facets):
+        ax = fig.add_subplot(nrows, ncols, index + 1)
+        ax = plot_over_group(
+            df=facet_df,
+            plot_cores=plot_cores,
+            fit=fit,
+            performance_column=performance_column,
+            fit_model=fit_model,
+            colors=colors,
+            ax=ax,
+        )
+        set_ticks(ax, facet_df, performance_column, plot_cores, xtick_step)
+        if title is not None:
+            ax.set_title(title)
+
+        # Add watermark
+        if watermark and index == 0:
+            ax.text(0.025, 0.925, "MDBenchmark", transform=ax.transAxes, alpha=0.3)
+
+    if facet is None:
+        legend = plot_legend(ax, colors, max_entries=max_legend_entries)
+    else:
+        legend = plot_legend(
+            fig, colors, max_entries=max_legend_entries, bbox_to_anchor=(0.5, 0)
+        )
+    fig.tight_layout()
+
+    return fig, legend
+
+
+def do_plot(
+    csv,
+    output_name,
+    output_format,
+    template,
+    module,
+    gpu,
+    cpu,
+    plot_cores,
+    fit,
+    font_size,
+    dpi,
+    xtick_step,
+    watermark,
+    fit_model="linear",
+    facet=None,
+    max_legend_entries=20,
+    plots=None,
+):
+    """Creates plots of benchmarks.
+
+    The CSV files are read once. If `plots` names a plot specification, every
+    plot described in it is filtered from this data, see `load_plot_spec`.
+    Options given on the command line are the defaults of all plots.
+    """
+    if not csv:
+        raise click.BadParameter(
+            "You must specify at least one CSV file.", param_hint='"--csv"'
+        )
+    if isinstance(output_format, str):
+        output_format = [output_format]
+
+    options = {
+        "output_name": output_name,
+        "output_format": list(output_format),
+        "template": template,
+        "module": module,
+        "gpu": gpu,
+        "cpu": cpu,
+        "plot_cores": plot_cores,
+        "fit": fit,
+        "font_size": font_size,
+        "dpi": dpi,
+        "xtick_step": xtick_step,
+        "watermark": watermark,
+        "fit_model": fit_model,
+        "facet": facet,
+        "max_legend_entries": max_legend_entries,
+    }
+    views = [options]
+    if plots is not None:
+        try:
+            views = [{**options, **view} for view in load_plot_spec(plots)]
+        except ValueError as e:
+            console.error("{}", e)
+
+    data = pd.concat([pd.read_csv(c) for c in csv])
+    performance_column = "performance" if "performance" in data.columns else "ns/day"
+
+    for view in views:
+        df = filter_dataframe_for_plotting(
+            data, view["template"], view["module"], view["gpu"], view["cpu"]
+        )
+
+        # Exit if there is no performance data
+        if df[performance_column].isnull().all():
+            console.error("There is no performance data to plot.")
+
+        fig, legend = plot_figure(
+            df,
+            performance_column,
+            plot_cores=view["plot_cores"],
+            fit=view["fit"],
+            font_size=view["font_size"],
+            xtick_step=view["xtick_step"],
+            watermark=view["watermark"],
+            fit_model=view["fit_model"],
+            facet=view["facet"],
+            max_legend_entries=view["max_legend_entries"],
+        )
+
+        # The same figure is saved in every format
+        names = output_names(csv, view["output_name"], view["output_format"])
+        for name, extension in zip(names, view["output_format"]):
+            fig.savefig(
+                name,
+                format=extension,
+                bbox_extra_artists=(legend,),
+                bbox_inches="tight",
+                dpi=view["dpi"],
+            )
+            console.info("The plot was saved as '{}'.", name)
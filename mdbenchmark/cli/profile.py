@@ -0,0 +1,44 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import click
+
+from mdbenchmark import console
+from mdbenchmark.models import detect_hardware_profile
+from mdbenchmark.utils import (
+    format_host_metadata,
+    get_possible_hosts,
+    save_host_metadata,
+)
+
+
+def do_profile(host):
+    """Detect the hardware profile of this node and print or save it."""
+    profile = detect_hardware_profile()
+
+    if host is None:
+        console.info("Add the following block to your host template:")
+        click.echo(format_host_metadata(profile), nl=False)
+        return
+
+    if host not in get_possible_hosts():
+        console.error("Could not find template for host '{}'.", host)
+
+    path = save_host_metadata(host, profile)
+    console.success("Saved the hardware profile of host '{}' to {}.", host, path)
@@ -0,0 +1,107 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import datetime
+
+import datreant as dtr
+
+from mdbenchmark import console
+from mdbenchmark.__version__ import VERSION
+from mdbenchmark.report import (
+    REPORT_MAPPING,
+    render_report,
+    report_data,
+    scaling_efficiency,
+)
+from mdbenchmark.stats import aggregate_repeats, replicas_long_format
+from mdbenchmark.utils import hide_default_columns, parse_bundle, swept_parameters
+from mdbenchmark.versions import DETAILS_MAPPING, VersionFactory
+
+
+def do_report(directory, output, title, min_efficiency):
+    """Write an HTML report of all benchmarks below `directory`."""
+    bundle = dtr.discover(directory)
+    if not bundle:
+        console.error("There are no benchmarks in {}.", directory)
+    version = VersionFactory(categories=bundle.categories).version_class
+
+    df = parse_bundle(
+        bundle,
+        columns=version.analyze_categories,
+        sort_values_by=version.analyze_sort,
+        with_replicas=True,
+    )
+    df = df.drop(columns=["version", "temprange"], errors="ignore")
+
+    sweep_columns = swept_parameters(bundle)
+    performance_column = "performance" if "performance" in df.columns else "ns/day"
+    group_columns = [
+        c
+        for c in version.analyze_printing + sweep_columns
+        if c in df.columns and c not in [performance_column, "ncores", "repeat"]
+    ]
+
+    # Only multidir benchmarks have a breakdown of their replicas
+    replicas = None
+    if "multidir" in df.columns and (df["multidir"] > 1).any():
+        replica_columns = [
+            c for c in ["module", "host", "nodes", "repeat"] if c in df.columns
+        ]
+        replicas = replicas_long_format(df[df["multidir"] > 1], replica_columns)
+    df = df.drop(columns="replicas")
+
+    # Aggregate repeated benchmarks of the same configuration
+    printing = [c for c in version.analyze_printing + sweep_columns if c in df.columns]
+    if "repeat" in df.columns and (df["repeat"] > 0).any():
+        df = aggregate_repeats(
+            df.drop(columns="repeat"),
+            columns=group_columns,
+            performance_column=performance_column,
+        )
+        printing = [c for c in df.columns if c != "repeat"]
+
+    df = scaling_efficiency(
+        df, [c for c in group_columns if c != "nodes"], performance_column
+    )
+    printing = hide_default_columns(df, printing) + list(REPORT_MAPPING)
+
+    mapping = dict(version.category_mapping)
+    mapping.update(DETAILS_MAPPING)
+    mapping.update(REPORT_MAPPING)
+    data = report_data(
+        df,
+        columns=printing,
+        mapping=mapping,
+        performance_column=performance_column,
+        min_efficiency=min_efficiency,
+        replicas=replicas,
+    )
+    html = render_report(
+        data,
+        title=title,
+        version=VERSION,
+        date=datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+    )
+
+    if not output.endswith(".html"):
+        output = "{}.html".format(output)
+    with open(output, "w") as fh:
+        fh.write(html)
+
+    console.success("Saved the report to {}.", output)
@@ -27,12 +27,14 @@ import numpy as np
 
 from mdbenchmark import console
 from mdbenchmark.mdengines import detect_md_engine
-from mdbenchmark.mdengines.utils import cleanup_before_restart
+from mdbenchmark.mdengines.utils import cleanup_benchmarks
 from mdbenchmark.utils import (
     consolidate_dataframe,
+    hide_default_columns,
     map_columns,
     parse_bundle,
     print_dataframe,
+    swept_parameters,
 )
 from mdbenchmark.versions import VersionFactory
 
@@ -51,7 +53,18 @@ def get_batch_command():
     )
 
 
-def do_submit(directory, force_restart, yes):
+def format_size(size):
+    """Return a human readable file size."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = "TB"
+    return "{:.1f} {}".format(size, unit) if unit != "B" else "{} B".format(size)
+
+
+def do_submit(directory, force_restart, yes, dry_run=False):
     """Submit the benchmarks."""
     bundle = dtr.discover(directory)
 
@@ -91,22 +104,42 @@ def do_submit(directory, force_restart, yes):
     # Reformat NaN values nicely into question marks.
     df_to_print = df.replace(np.nan, "?")
 
-    columns_to_drop = ["ncores", "version", "temprange"]
-    df_to_print = df.drop(columns=columns_to_drop)
+    columns_to_drop = ["ncores", "version", "temprange", "repeat"]
+    df_to_print = df.drop(columns=columns_to_drop, errors="ignore")
 
     # Consolidate the data by grouping on the number of nodes and print to the
     # user as an overview.
+    sweep_columns = swept_parameters(bundles_to_start)
     consolidated_df = consolidate_dataframe(
-        df_to_print, columns=benchmark_version.consolidate_categories
+        df_to_print, columns=benchmark_version.consolidate_categories + sweep_columns
+    )
+    printing = hide_default_columns(
+        consolidated_df, benchmark_version.generate_printing[1:] + sweep_columns
     )
     print_dataframe(
-        consolidated_df,
+        consolidated_df[printing],
         columns=map_columns(
             map_dict=benchmark_version.category_mapping,
-            columns=benchmark_version.generate_printing[1:],
+            columns=printing,
         ),
     )
 
+    # Files of previous runs are removed from all benchmarks at once
+    if force_restart:
+        benchmarks = [
+            (detect_md_engine(sim.categories["module"]), sim)
+            for sim in bundles_to_start
+        ]
+    if dry_run:
+        if force_restart:
+            number_of_files, size = cleanup_benchmarks(benchmarks, dry_run=True)
+            console.info(
+                "A restart would remove {} files ({}) of previous runs.",
+                number_of_files,
+                format_size(size),
+            )
+        console.success("Dry run. No benchmarks were submitted.")
+
     # Ask the user to confirm whether they want to submit the benchmarks
     if yes:
         console.info("The above benchmarks will be submitted.")
@@ -114,12 +147,16 @@ def do_submit(directory, force_restart, yes):
         console.error("Exiting. No benchmarks submitted.")
 
     batch_cmd = get_batch_command()
+    # Remove files generated by previous mdbenchmark run
+    if force_restart:
+        number_of_files, size = cleanup_benchmarks(benchmarks)
+        console.info(
+            "Removed {} files ({}) of previous runs.",
+            number_of_files,
+            format_size(size),
+        )
     console.info("Submitting a total of {} benchmarks.", len(bundles_to_start))
     for sim in bundles_to_start:
-        # Remove files generated by previous mdbenchmark run
-        if force_restart:
-            engine = detect_md_engine(sim.categories["module"])
-            cleanup_before_restart(engine=engine, sim=sim)
         sim.categories["started"] = True
         os.chdir(sim.abspath)
         subprocess.call([batch_cmd, "bench.job"])
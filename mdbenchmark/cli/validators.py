@@ -18,9 +18,8 @@
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
 import click
-import numpy as np
 
-from mdbenchmark import console, utils
+from mdbenchmark import console
 
 
 def validate_cores(ctx, param, *args, **kwargs):
@@ -75,25 +74,38 @@ def validate_number_of_nodes(min_nodes, max_nodes):
         )
 
 
-def validate_number_of_simulations(nsims, min_nodes, max_nodes, nranks):
+def validate_number_of_simulations(nsims, nodes, nranks):
     """validate that the number of simulations is an integer multiple of
     number of nodes times number of ranks per node.
     """
-    for nn in range(min_nodes, max_nodes + 1):
-        nranks = np.array([nn * ri for ri in nranks])
+    for nn in nodes:
         for nsim in nsims:
-            if np.any(nranks % nsim):
+            if any((nn * ri) % nsim for ri in nranks):
                 raise click.BadParameter(
                     "The total number of ranks must be an integer multiple of"
                     + " the number of simulations",
-                    param_hint='"--multidir" / "--ranks" / "--min-nodes" / "--max-nodes"',
+                    param_hint='"--multidir" / "--ranks" / "--nodes"',
                 )
 
 
+def validate_host_nodes(nodes, max_host_nodes):
+    """Validate that no benchmark requests more nodes than the host has."""
+    if max_host_nodes is not None and max(nodes) > max_host_nodes:
+        raise click.BadParameter(
+            "The host only has {} nodes, but {} nodes were requested.".format(
+                max_host_nodes, max(nodes)
+            ),
+            param_hint='"--max-nodes" / "--nodes"',
+        )
+
+
 def print_known_hosts(ctx, param, value):
     """Callback to print all available hosts to the user."""
     if not value or ctx.resilient_parsing:
         return
+
+    from mdbenchmark import utils
+
     utils.print_possible_hosts()
     ctx.exit()
 
@@ -108,6 +120,8 @@ def validate_hosts(ctx, param, host=None):
     templates. If the hostname matches the template name, we continue by
     returning the hostname.
     """
+    from mdbenchmark import utils
+
     if host is None:
         host = utils.guess_host()
         if host is None:
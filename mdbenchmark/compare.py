@@ -0,0 +1,149 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import numpy as np
+import pandas as pd
+
+# Columns added by `compare_modules`
+COMPARE_COLUMNS = [
+    "baseline",
+    "module",
+    "baseline_performance",
+    "performance",
+    "change",
+    "change_low",
+    "change_high",
+    "significant",
+    "status",
+]
+
+
+def _finite_mean(values):
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    return values.mean() if values.size else np.nan
+
+
+def bootstrap_change_interval(
+    baseline, candidate, confidence=0.95, resamples=1000, random_state=None
+):
+    """Compute a percentile bootstrap confidence interval of the relative change.
+
+    The relative change is the ratio of the mean performance of `candidate` and
+    `baseline`, minus one. Both samples are resampled independently.
+
+    Returns
+    -------
+    (float, float)
+        Lower and upper bound of the interval, or NaN if either sample has
+        less than two finished repeats.
+    """
+    baseline = np.asarray(baseline, dtype=float)
+    candidate = np.asarray(candidate, dtype=float)
+    baseline = baseline[np.isfinite(baseline)]
+    candidate = candidate[np.isfinite(candidate)]
+
+    if baseline.size < 2 or candidate.size < 2:
+        return np.nan, np.nan
+
+    rng = np.random.default_rng(random_state)
+    baseline_means = rng.choice(baseline, size=(resamples, baseline.size)).mean(axis=1)
+    candidate_means = rng.choice(candidate, size=(resamples, candidate.size)).mean(
+        axis=1
+    )
+    changes = candidate_means / baseline_means - 1
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(changes, [alpha, 1 - alpha])
+
+    return low, high
+
+
+def classify_change(change, low, high, threshold):
+    """Return whether a relative change is a regression, improvement or neither.
+
+    Changes smaller than `threshold` are ignored. If a confidence interval is
+    known, it must not include zero.
+    """
+    if np.isnan(change):
+        return "failed"
+    significant = np.isnan(low) or low > 0 or high < 0
+    if change <= -threshold and significant:
+        return "regression"
+    if change >= threshold and significant:
+        return "improvement"
+    return "unchanged"
+
+
+def compare_modules(
+    df, baseline, columns, performance_column, threshold=0.05, confidence=0.95
+):
+    """Compare the performance of identical layouts across modules.
+
+    All rows of `df` sharing the values in `columns` and the module are
+    repeats of the same benchmark. Each benchmark of a module other than
+    `baseline` is compared to the benchmark of the `baseline` module with the
+    same layout. Layouts that were not run with the baseline module are
+    skipped.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per compared benchmark with the layout `columns` and the
+        `COMPARE_COLUMNS`. `change` is the relative change of the mean
+        performance. `significant` is NaN, if there were not enough repeats to
+        compute a confidence interval.
+    """
+    columns = [c for c in columns if c != "module"]
+    # Missing values, e.g., of old benchmarks, must still match each other
+    df = df.copy()
+    df[columns] = df[columns].astype(object).where(df[columns].notnull(), "?")
+    samples = {
+        key: group[performance_column].astype(float).tolist()
+        for key, group in df.groupby(["module"] + columns, dropna=False, sort=False)
+    }
+
+    rows = []
+    for key, values in samples.items():
+        module, layout = key[0], key[1:]
+        reference = samples.get((baseline,) + layout)
+        if module == baseline or reference is None:
+            continue
+
+        reference_mean, mean = _finite_mean(reference), _finite_mean(values)
+        change = mean / reference_mean - 1
+        low, high = bootstrap_change_interval(
+            reference, values, confidence=confidence, random_state=0
+        )
+        significant = np.nan if np.isnan(low) else bool(low > 0 or high < 0)
+        rows.append(
+            list(layout)
+            + [
+                baseline,
+                module,
+                reference_mean,
+                mean,
+                change,
+                low,
+                high,
+                significant,
+                classify_change(change, low, high, threshold),
+            ]
+        )
+
+    return pd.DataFrame(rows, columns=columns + COMPARE_COLUMNS)
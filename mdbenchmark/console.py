@@ -17,10 +17,30 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import contextlib
 import sys
 
 import click
 
+# Stream that all messages are written to, None for stdout
+MESSAGE_FILE = None
+
+
+@contextlib.contextmanager
+def redirect_messages(stream):
+    """Write all messages to `stream` instead of stdout.
+
+    This keeps stdout free for machine readable output, e.g., when the results
+    are piped into another program.
+    """
+    global MESSAGE_FILE
+    previous = MESSAGE_FILE
+    MESSAGE_FILE = stream
+    try:
+        yield
+    finally:
+        MESSAGE_FILE = previous
+
 
 def console_wrapper(
     message,
@@ -68,6 +88,8 @@ def console_wrapper(
     """
     if args is None:
         args = []
+    if filehandler is None:
+        filehandler = MESSAGE_FILE
 
     if prefix is not None:
         message = "{} {}".format(prefix, message)
@@ -88,10 +110,10 @@ def console_wrapper(
 
     try:
         if newlines:
-            click.echo("")
+            click.echo("", file=filehandler)
         click.echo(message.format(*args, **kwargs), file=filehandler)
         if newlines:
-            click.echo("")
+            click.echo("", file=filehandler)
     except IndexError:
         raise ValueError(
             "Number of placeholders do not correspond to the number of curly brackets "
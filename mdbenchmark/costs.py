@@ -0,0 +1,73 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import numpy as np
+import pandas as pd
+
+COST_COLUMNS = ["wall_clock_hours", "node_hours", "core_hours", "energy_kwh"]
+
+
+def node_power(df, metadata, gpu_column="use_gpu", power_per_node=None):
+    """Return the power draw per node in watts for each benchmark.
+
+    The power is looked up in the host metadata of every benchmark. GPU
+    benchmarks use ``power_per_gpu_node`` and fall back to ``power_per_node``.
+    A value given in `power_per_node` overrides the host metadata. Benchmarks
+    without any power figure are NaN.
+    """
+    if power_per_node is not None:
+        return pd.Series(float(power_per_node), index=df.index)
+
+    power = []
+    for _, row in df.iterrows():
+        host = metadata.get(row.get("host"), {})
+        value = host.get("power_per_node", np.nan)
+        if gpu_column in row and row[gpu_column]:
+            value = host.get("power_per_gpu_node", value)
+        power.append(value)
+
+    return pd.Series(power, index=df.index, dtype=float)
+
+
+def time_to_solution(df, target_ns, performance_column, power=None):
+    """Estimate the resources needed to simulate `target_ns` nanoseconds.
+
+    For every benchmark we compute the wall-clock time in hours, the node and
+    core hours and, if the power draw per node in watts is known, the energy
+    in kWh. The target refers to the performance as reported, i.e., to the sum
+    of all simulations of multidir benchmarks.
+    """
+    df = df.copy()
+    performance = pd.to_numeric(df[performance_column], errors="coerce")
+    performance = performance.where(performance > 0)
+
+    wall_clock = target_ns / performance * 24
+    df["wall_clock_hours"] = wall_clock.round(2)
+    df["node_hours"] = (wall_clock * df["nodes"]).round(1)
+    if "ncores" in df.columns:
+        ncores = pd.to_numeric(df["ncores"], errors="coerce")
+        df["core_hours"] = (wall_clock * ncores).round(0)
+    else:
+        df["core_hours"] = np.nan
+
+    if power is None:
+        power = np.nan
+    df["energy_kwh"] = (wall_clock * df["nodes"] * power / 1000).round(1)
+
+    return df
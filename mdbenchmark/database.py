@@ -0,0 +1,293 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import datetime as dt
+import json
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import xdg
+
+from mdbenchmark.mdengines import detect_md_engine, utils
+from mdbenchmark.mdengines.gromacs import MDRUN_OPTIONS
+
+# Default location of the results database
+DEFAULT_DATABASE = os.path.join(xdg.XDG_DATA_HOME, "MDBenchmark", "results.db")
+
+# Columns describing the layout of a benchmark beyond its ranks and threads.
+# `sweep` holds the swept parameters as JSON. Databases created before these
+# columns existed are extended by `connect`.
+LAYOUT_COLUMNS = {
+    **{category: "TEXT" for category in MDRUN_OPTIONS},
+    "gpus_per_rank": "REAL",
+    "sweep": "TEXT",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS benchmarks (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    finished REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    ingested TEXT NOT NULL,
+    system TEXT,
+    system_hash TEXT NOT NULL,
+    host TEXT,
+    module TEXT,
+    gpu INTEGER,
+    nodes INTEGER,
+    ranks INTEGER,
+    threads INTEGER,
+    hyperthreading INTEGER,
+    pme_ranks INTEGER,
+    {layout}multidir INTEGER,
+    repeat INTEGER,
+    ncores INTEGER,
+    performance REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS benchmarks_by_hash
+    ON benchmarks (system_hash, timestamp);
+CREATE INDEX IF NOT EXISTS benchmarks_by_system
+    ON benchmarks (system, timestamp);
+CREATE INDEX IF NOT EXISTS benchmarks_by_host
+    ON benchmarks (host, module);
+""".format(
+    layout="".join(
+        "{} {},\n    ".format(name, kind) for name, kind in LAYOUT_COLUMNS.items()
+    )
+)
+
+# Columns of the `benchmarks` table that describe a benchmark
+COLUMNS = [
+    "path",
+    "finished",
+    "timestamp",
+    "ingested",
+    "system",
+    "system_hash",
+    "host",
+    "module",
+    "gpu",
+    "nodes",
+    "ranks",
+    "threads",
+    "hyperthreading",
+    "pme_ranks",
+    *LAYOUT_COLUMNS,
+    "multidir",
+    "repeat",
+    "ncores",
+    "performance",
+]
+
+# Columns returned by `query_results`
+QUERY_COLUMNS = [
+    "timestamp",
+    "system",
+    "system_hash",
+    "host",
+    "module",
+    "gpu",
+    "nodes",
+    "ranks",
+    "threads",
+    "pme_ranks",
+    *LAYOUT_COLUMNS,
+    "multidir",
+    "repeat",
+    "performance",
+]
+
+# Benchmarks of the same system are only compared within these columns
+BEST_OF_COLUMNS = ["system_hash", "host", "module", "gpu", *LAYOUT_COLUMNS]
+
+
+def connect(filename=DEFAULT_DATABASE):
+    """Open the results database and create the schema if necessary."""
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(filename)
+    connection.executescript(SCHEMA)
+
+    existing = {row[1] for row in connection.execute("PRAGMA table_info(benchmarks)")}
+    with connection:
+        for name, kind in LAYOUT_COLUMNS.items():
+            if name not in existing:
+                connection.execute(
+                    "ALTER TABLE benchmarks ADD COLUMN {} {}".format(name, kind)
+                )
+    return connection
+
+
+def _to_sql(value):
+    """Convert NumPy values and NaN into types understood by sqlite3."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def benchmark_record(engine, treant, finished, ingested):
+    """Return the database row of a benchmark that finished at `finished`.
+
+    Returns None, if the benchmark failed.
+    """
+    (
+        module,
+        nodes,
+        performance,
+        _,
+        gpu,
+        host,
+        ncores,
+        ranks,
+        threads,
+        hyperthreading,
+        multidir,
+        _,
+        repeat,
+        pme_ranks,
+        gpus_per_rank,
+        *mdrun_options,
+    ) = utils.analyze_benchmark(engine=engine, benchmark=treant)
+    if not np.isfinite(performance):
+        return None
+
+    categories = treant.categories
+    swept = categories["sweep"].split(",") if "sweep" in categories else []
+    record = {
+        "path": treant.abspath,
+        "finished": finished,
+        "timestamp": dt.datetime.fromtimestamp(finished).isoformat(
+            sep=" ", timespec="seconds"
+        ),
+        "ingested": ingested,
+        "system": categories["name"] if "name" in categories else None,
+        "system_hash": utils.hash_input_files(engine, treant),
+        "host": host,
+        "module": module,
+        "gpu": gpu,
+        "nodes": nodes,
+        "ranks": ranks,
+        "threads": threads,
+        "hyperthreading": hyperthreading,
+        "pme_ranks": pme_ranks,
+        **dict(zip(MDRUN_OPTIONS, mdrun_options)),
+        "gpus_per_rank": None if gpus_per_rank == -1 else gpus_per_rank,
+        "sweep": (
+            json.dumps({key: categories[key] for key in swept}, sort_keys=True)
+            if swept
+            else None
+        ),
+        "multidir": multidir,
+        "repeat": repeat,
+        "ncores": ncores,
+        "performance": performance,
+    }
+    return {key: _to_sql(value) for key, value in record.items()}
+
+
+def ingest(connection, bundle):
+    """Add all finished benchmarks of `bundle` to the database.
+
+    Benchmarks are identified by their path. Benchmarks whose output did not
+    change since they were last ingested are skipped without parsing them
+    again.
+
+    Returns
+    -------
+    tuple
+        The number of added or updated benchmarks and of skipped benchmarks.
+    """
+    known = dict(connection.execute("SELECT path, finished FROM benchmarks"))
+    ingested = dt.datetime.now().isoformat(sep=" ", timespec="seconds")
+
+    records = []
+    skipped = 0
+    for treant in bundle:
+        if "module" not in treant.categories:
+            skipped += 1
+            continue
+        engine = detect_md_engine(treant.categories["module"])
+        finished = utils.finish_time(engine, treant)
+        if finished is None or known.get(treant.abspath) == finished:
+            skipped += 1
+            continue
+
+        record = benchmark_record(engine, treant, finished, ingested)
+        if record is None:
+            skipped += 1
+            continue
+        records.append(record)
+
+    with connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO benchmarks ({}) VALUES ({})".format(
+                ", ".join(COLUMNS), ", ".join(":" + c for c in COLUMNS)
+            ),
+            records,
+        )
+
+    return len(records), skipped
+
+
+def query_results(
+    connection, system=None, hosts=(), modules=(), since=None, best=False
+):
+    """Return the benchmarks in the database as a DataFrame.
+
+    `system` is either the name of the simulated system or a prefix of the hash
+    of its input files. Results can be restricted to `hosts`, `modules` and
+    benchmarks finished `since` a date. With `best`, only the fastest
+    benchmark of each system, host, module, processor type and layout, see
+    `BEST_OF_COLUMNS`, is returned.
+    """
+    conditions = []
+    parameters = []
+    if system is not None:
+        conditions.append("(system = ? OR system_hash LIKE ?)")
+        parameters.extend([system, system + "%"])
+    for column, values in [("host", hosts), ("module", modules)]:
+        if values:
+            conditions.append("{} IN ({})".format(column, ", ".join("?" * len(values))))
+            parameters.extend(values)
+    if since is not None:
+        conditions.append("timestamp >= ?")
+        parameters.append(since.isoformat(sep=" "))
+
+    columns = ", ".join(QUERY_COLUMNS)
+    query = "SELECT {} FROM benchmarks".format(columns)
+    if best:
+        # SQLite returns the values of the row holding the maximum for all
+        # other columns of the group
+        query = "SELECT {}, MAX(performance) AS best FROM benchmarks".format(columns)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if best:
+        query += " GROUP BY " + ", ".join(BEST_OF_COLUMNS)
+    query += " ORDER BY system, performance DESC"
+
+    df = pd.read_sql_query(query, connection, params=parameters)
+    df = df.drop(columns="best", errors="ignore")
+    df["gpu"] = df["gpu"].astype(bool)
+    return df
@@ -0,0 +1,159 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+ScalingFit = namedtuple(
+    "ScalingFit", ["model", "reference_performance", "serial_fraction", "overhead"]
+)
+
+
+def _prepare_points(nodes, performance):
+    """Return finite, positive data points as float arrays."""
+    nodes = np.asarray(nodes, dtype=float)
+    performance = np.asarray(performance, dtype=float)
+    mask = np.isfinite(nodes) & np.isfinite(performance) & (performance > 0)
+    return nodes[mask], performance[mask]
+
+
+def _lstsq(design, target):
+    coefficients, _, _, _ = np.linalg.lstsq(design, target, rcond=None)
+    return coefficients
+
+
+def fit_amdahl(nodes, performance):
+    """Fit Amdahl's law to all data points.
+
+    The inverse performance is linear in the inverse number of nodes,
+    ``1 / P(n) = a + b / n``, which we solve with linear least squares. The
+    serial fraction is ``a / (a + b)`` and the single node performance
+    ``1 / (a + b)``.
+    """
+    nodes, performance = _prepare_points(nodes, performance)
+    design = np.column_stack([np.ones_like(nodes), 1 / nodes])
+    a, b = _lstsq(design, 1 / performance)
+    return ScalingFit("amdahl", 1 / (a + b), a / (a + b), 0.0)
+
+
+def fit_gustafson(nodes, performance):
+    """Fit Gustafson's law to all data points.
+
+    The scaled performance ``P(n) = P1 * (s + (1 - s) * n)`` is linear in the
+    number of nodes.
+    """
+    nodes, performance = _prepare_points(nodes, performance)
+    design = np.column_stack([np.ones_like(nodes), nodes])
+    intercept, slope = _lstsq(design, performance)
+    reference = intercept + slope
+    return ScalingFit("gustafson", reference, intercept / reference, 0.0)
+
+
+def fit_overhead(nodes, performance):
+    """Fit Amdahl's law with an additional communication overhead term.
+
+    The overhead grows linearly with the number of nodes, i.e.,
+    ``1 / P(n) = a + b / n + c * n``. The overhead is reported relative to the
+    single node runtime ``a + b``.
+    """
+    nodes, performance = _prepare_points(nodes, performance)
+    design = np.column_stack([np.ones_like(nodes), 1 / nodes, nodes])
+    a, b, c = _lstsq(design, 1 / performance)
+    return ScalingFit("overhead", 1 / (a + b), a / (a + b), c / (a + b))
+
+
+FIT_MODELS = {
+    "amdahl": (fit_amdahl, 2),
+    "gustafson": (fit_gustafson, 2),
+    "overhead": (fit_overhead, 3),
+}
+
+
+def fit_scaling(nodes, performance, model="amdahl"):
+    """Fit the requested scaling model to all finite data points.
+
+    Raises
+    ------
+    ValueError
+        If the model is unknown or there are not enough data points to
+        determine all model parameters.
+    """
+    if model not in FIT_MODELS:
+        raise ValueError(
+            "Unknown scaling model '{}'. Available models are: {}.".format(
+                model, ", ".join(sorted(FIT_MODELS))
+            )
+        )
+
+    fit_function, number_of_parameters = FIT_MODELS[model]
+    finite_nodes, _ = _prepare_points(nodes, performance)
+    if np.unique(finite_nodes).size < number_of_parameters:
+        raise ValueError(
+            "The '{}' model needs at least {} different node counts.".format(
+                model, number_of_parameters
+            )
+        )
+
+    return fit_function(nodes, performance)
+
+
+def predict_performance(fit, nodes):
+    """Return the performance predicted by `fit` for the given node counts."""
+    nodes = np.asarray(nodes, dtype=float)
+    s = fit.serial_fraction
+
+    if fit.model == "gustafson":
+        return fit.reference_performance * (s + (1 - s) * nodes)
+
+    return fit.reference_performance / (s + (1 - s) / nodes + fit.overhead * nodes)
+
+
+def fit_dataframe(df, columns, model, performance_column, predict_nodes=()):
+    """Fit a scaling model to each group of benchmarks in a DataFrame.
+
+    Returns a DataFrame with one row per group, containing the group keys, the
+    fit parameters and the predicted performance for every node count in
+    `predict_nodes`. Groups that cannot be fitted are skipped.
+    """
+    rows = []
+    for key, group in df.groupby(columns, dropna=False):
+        try:
+            fit = fit_scaling(group["nodes"], group[performance_column], model=model)
+        except ValueError:
+            continue
+
+        if not isinstance(key, tuple):
+            key = (key,)
+        predictions = predict_performance(fit, predict_nodes).round(3).tolist()
+        rows.append(
+            list(key)
+            + [
+                fit.model,
+                round(fit.reference_performance, 3),
+                round(fit.serial_fraction, 4),
+                round(fit.overhead, 4),
+            ]
+            + predictions
+        )
+
+    fit_columns = ["model", "reference_performance", "serial_fraction", "overhead"]
+    prediction_columns = ["predicted_{}".format(n) for n in predict_nodes]
+    return pd.DataFrame(rows, columns=list(columns) + fit_columns + prediction_columns)
@@ -17,14 +17,25 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import json
 import os
+import re
+import subprocess
 from collections import defaultdict
 
+import xdg
+
 from mdbenchmark import console
 from mdbenchmark.mdengines import gromacs, namd, rest2
 
 SUPPORTED_ENGINES = {"gromacs": gromacs, "namd": namd, "rest2": rest2}
 
+# Index of all modules found in `MODULEPATH`
+MODULE_CACHE = os.path.join(xdg.XDG_CACHE_HOME, "MDBenchmark", "modules.json")
+
+# Markers of the module command, e.g., `(default)` or `<L>`
+_MODULE_MARKERS = re.compile(r"(\([^)]*\)|<[^>]*>)$")
+
 
 def detect_md_engine(modulename):
     """Detects the MD engine based on the available modules.
@@ -68,9 +79,136 @@ def prepare_module_name(module, skip_validation=False):
     return basename, version
 
 
+def _walk_module_paths(module_paths):
+    """Find all module versions of supported MD engines below `module_paths`.
+
+    Returns
+    -------
+    available_modules : dict
+        Dictionary containing all available engines as keys and their versions
+        as a list.
+    directories : dict
+        Modification times of all visited directories.
+    """
+    available_modules = dict((mdengine, []) for mdengine in SUPPORTED_ENGINES)
+    directories = {}
+
+    # Go through the directory structure and grab all version of modules that we support.
+    for paths in module_paths.split(":"):
+        for path, _, files in os.walk(paths):
+            try:
+                directories[path] = os.stat(path).st_mtime
+            except OSError:
+                continue
+            for mdengine in SUPPORTED_ENGINES:
+                if mdengine in path:
+                    for name in files:
+                        if not name.startswith("."):
+                            available_modules[mdengine].append(name)
+
+    return available_modules, directories
+
+
+def _load_module_cache(module_paths):
+    """Return the cached modules, if no directory of `module_paths` changed."""
+    try:
+        with open(MODULE_CACHE) as fh:
+            cache = json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+    if cache.get("modulepath") != module_paths:
+        return None
+    for path, mtime in cache["directories"].items():
+        try:
+            if os.stat(path).st_mtime != mtime:
+                return None
+        except OSError:
+            return None
+
+    # New directories change the modification time of their parent, so we
+    # would have noticed them above. Only new roots need to be checked.
+    roots = [p for p in module_paths.split(":") if os.path.isdir(p)]
+    if any(root not in cache["directories"] for root in roots):
+        return None
+
+    return cache["modules"]
+
+
+def _save_module_cache(module_paths, available_modules, directories):
+    """Save the modules found below `module_paths`. Errors are ignored."""
+    cache = {
+        "modulepath": module_paths,
+        "directories": directories,
+        "modules": available_modules,
+    }
+    try:
+        os.makedirs(os.path.dirname(MODULE_CACHE), exist_ok=True)
+        with open(MODULE_CACHE, "w") as fh:
+            json.dump(cache, fh)
+    except OSError:
+        pass
+
+
+def _query_module_command():
+    """Ask Lmod or Environment Modules for all available modules.
+
+    This is only done if the environment variable `MDBENCHMARK_MODULE_AVAIL` is
+    set, as listing all modules is slow on some systems, too. Lmod answers
+    from its spider cache, if one exists.
+
+    Returns
+    -------
+    If no module command is available or it fails, we return `None`.
+
+    available_modules : dict
+        Dictionary containing all available engines as keys and their versions as a list.
+    """
+    if not os.environ.get("MDBENCHMARK_MODULE_AVAIL"):
+        return None
+
+    command = None
+    if os.environ.get("LMOD_CMD"):
+        command = [os.environ["LMOD_CMD"], "bash", "--terse", "avail"]
+    elif os.environ.get("MODULESHOME"):
+        modulecmd = os.path.join(os.environ["MODULESHOME"], "bin", "modulecmd")
+        command = [modulecmd, "bash", "-t", "avail"]
+    if command is None:
+        return None
+
+    try:
+        process = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=60
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if process.returncode != 0:
+        return None
+
+    # Both commands print the modules to stderr, one per line. Directories of
+    # the module path end with a colon, markers like `(default)` are removed.
+    available_modules = dict((mdengine, []) for mdengine in SUPPORTED_ENGINES)
+    for line in process.stderr.decode(errors="replace").splitlines():
+        line = _MODULE_MARKERS.sub("", line.strip())
+        if not line or line.endswith(":") or "/" not in line:
+            continue
+        path, version = line.rsplit("/", 1)
+        for mdengine in SUPPORTED_ENGINES:
+            if mdengine in path and version not in available_modules[mdengine]:
+                available_modules[mdengine].append(version)
+
+    return available_modules
+
+
 def get_available_modules():
     """Return all available module versions for a given MD engine.
 
+    Walking through all directories of `MODULEPATH` can take a long time on
+    network file systems. The result is therefore cached in the XDG cache
+    folder and only renewed if the modification time of any directory
+    changed. If the environment variable `MDBENCHMARK_MODULE_AVAIL` is set,
+    the module command is asked first.
+
     Returns
     -------
     If we cannot access the `MODULEPATH` environment variable, we return `None`.
@@ -80,20 +218,21 @@ def get_available_modules():
     """
 
     MODULE_PATHS = os.environ.get("MODULEPATH", None)
-    available_modules = dict((mdengine, []) for mdengine in SUPPORTED_ENGINES)
 
     # Return `None` if the environment variable `MODULEPATH` does not exist.
     if not MODULE_PATHS:
         return None
 
-    # Go through the directory structure and grab all version of modules that we support.
-    for paths in MODULE_PATHS.split(":"):
-        for path, _, files in os.walk(paths):
-            for mdengine in SUPPORTED_ENGINES:
-                if mdengine in path:
-                    for name in files:
-                        if not name.startswith("."):
-                            available_modules[mdengine].append(name)
+    available_modules = _query_module_command()
+    if available_modules is not None:
+        return available_modules
+
+    available_modules = _load_module_cache(MODULE_PATHS)
+    if available_modules is not None:
+        return available_modules
+
+    available_modules, directories = _walk_module_paths(MODULE_PATHS)
+    _save_module_cache(MODULE_PATHS, available_modules, directories)
 
     return available_modules
 
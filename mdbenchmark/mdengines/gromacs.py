@@ -18,6 +18,7 @@
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
 import os
+import re
 import string
 from shutil import copyfile
 
@@ -25,6 +26,39 @@ from mdbenchmark import console
 
 NAME = "gromacs"
 
+# Rows of the cycle and time accounting table that are summed up into one
+# column each. The values are the share of the total wall time in percent.
+CYCLE_ACCOUNTING = {
+    "domain_decomposition": lambda row: row.startswith("Domain decomp"),
+    "neighbor_search": lambda row: row.startswith("Neighbor search"),
+    "force": lambda row: row in ("Force", "Launch GPU ops.", "Launch PP GPU ops."),
+    "pme_mesh": lambda row: row.startswith("PME") and "wait" not in row.lower(),
+    "comm_wait": lambda row: "wait" in row.lower() or row.startswith("Comm."),
+}
+
+# mdrun options that control the offloading of tasks to GPUs
+OFFLOAD_OPTIONS = ("-nb", "-pme", "-bonded", "-update", "-npme")
+
+# Swept parameters with this prefix are passed to mdrun as options
+MDRUN_PREFIX = "mdrun_"
+
+# mdrun options that can be swept by `mdbenchmark generate`
+MDRUN_OPTIONS = {
+    "mdrun_nb": "-nb",
+    "mdrun_pme": "-pme",
+    "mdrun_bonded": "-bonded",
+    "mdrun_update": "-update",
+    "mdrun_dlb": "-dlb",
+}
+
+_CYCLE_ROW = re.compile(r"^\s(\S.*?)\s{2,}([-\d.\s]+)$")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_GPUS = re.compile(r"(\d+) GPUs? (?:auto-)?selected for this run")
+
+
+def _first_number(text):
+    return float(_NUMBER.search(text).group())
+
 
 def prepare_benchmark(name, relative_path, *args, **kwargs):
     benchmark = kwargs["benchmark"]
@@ -58,6 +92,87 @@ def prepare_multidir(multidir):
     return multidir_string
 
 
+def prepare_mdrun_options(nodes, pme_ranks, options):
+    """Return the additional mdrun command line options of a benchmark.
+
+    `options` maps parameters starting with ``mdrun_`` to their values, e.g.,
+    ``mdrun_nb`` to ``-nb``. Options set to "auto" and a negative number of PME
+    ranks are left to mdrun. The number of PME ranks is given per node, while
+    `-npme` expects the total.
+    """
+    mdrun_options = []
+    if pme_ranks >= 0:
+        mdrun_options.append("-npme {}".format(pme_ranks * nodes))
+    for category, value in options.items():
+        if category.startswith(MDRUN_PREFIX) and value != "auto":
+            mdrun_options.append("-{} {}".format(category[len(MDRUN_PREFIX) :], value))
+
+    return " ".join(mdrun_options)
+
+
+def parse_log_details(fh):
+    """Parse load balancing and timing details from a GROMACS log file.
+
+    Extracts the share of the wall time spent in the main parts of the cycle
+    and time accounting table, the domain decomposition load imbalance, the
+    PME/PP load ratio, the final value of nstlist, the number of GPUs in use
+    and the GPU offload options given on the command line.
+
+    Parameters
+    ----------
+    fh : filehandle
+        Log file to read
+
+    Returns
+    -------
+    dict
+        Parsed values. Values that were not found in the log are missing.
+    """
+    details = {}
+    in_accounting = False
+    command_line = False
+
+    for line in fh:
+        if command_line:
+            options = line.split()
+            for option in OFFLOAD_OPTIONS:
+                if option in options[:-1]:
+                    details[option[1:]] = options[options.index(option) + 1]
+            command_line = False
+        elif line.startswith("Command line:"):
+            command_line = True
+        elif line.startswith("Changing nstlist from"):
+            details["nstlist"] = int(line.split()[5].rstrip(","))
+        elif _GPUS.search(line):
+            details["gpus"] = int(_GPUS.search(line).group(1))
+        elif "Average load imbalance:" in line:
+            details["load_imbalance"] = _first_number(line.split(":")[1])
+        elif "waiting due to load imbalance:" in line:
+            details["imbalance_wait"] = _first_number(line.split(":")[1])
+        elif "Average PME mesh/force load:" in line:
+            details["pme_pp_load"] = _first_number(line.split(":")[1])
+        elif "R E A L   C Y C L E   A N D   T I M E   A C C O U N T I N G" in line:
+            in_accounting = True
+            for column in CYCLE_ACCOUNTING:
+                details[column] = 0.0
+        elif in_accounting:
+            match = _CYCLE_ROW.match(line)
+            if match is None:
+                continue
+
+            row, values = match.group(1).strip(), match.group(2).split()
+            if row == "Total":
+                in_accounting = False
+                continue
+
+            for column, belongs_to in CYCLE_ACCOUNTING.items():
+                if belongs_to(row):
+                    details[column] += float(values[-1])
+                    break
+
+    return details
+
+
 def check_input_file_exists(name):
     """Check if the TPR file exists."""
     fn = name
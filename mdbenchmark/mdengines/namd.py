@@ -18,12 +18,20 @@
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
 import os
+import re
 from shutil import copyfile
 
+import numpy as np
+
 from mdbenchmark import console
 
 NAME = "namd"
 
+# Number of samples at the start of a run that are discarded as warm-up
+WARMUP_SAMPLES = 1
+
+_MEMORY = re.compile(r"([\d.]+) MB")
+
 
 def prepare_benchmark(name, relative_path, *args, **kwargs):
     benchmark = kwargs["benchmark"]
@@ -57,6 +65,10 @@ def prepare_multidir(multidir):
     return None
 
 
+def prepare_mdrun_options(nodes, pme_ranks, options):
+    return ""
+
+
 def analyze_namd_file(fh):
     """ Check whether the NAMD config file has any relative imports or variables
     """
@@ -80,6 +92,86 @@ def analyze_namd_file(fh):
             console.error("No absolute path detected in NAMD file!")
 
 
+def parse_timings(fh):
+    """Collect the timing series of a NAMD output file.
+
+    Returns
+    -------
+    dict
+        The performance in ns/day of all ``Benchmark time`` lines
+        (``benchmark``), the wall time per step of all ``TIMING`` lines
+        (``timing``), the memory usage in MB reported on any of these lines
+        (``memory``) and the timestep in fs (``timestep``, NaN if not found).
+    """
+    timings = {"benchmark": [], "timing": [], "memory": [], "timestep": np.nan}
+
+    for line in fh:
+        line = line.strip()
+        if "Benchmark time" in line:
+            timings["benchmark"].append(1 / float(line.split()[7]))
+        elif line.startswith("TIMING:"):
+            wall = line.split("Wall:")[1].split(",")[1]
+            timings["timing"].append(float(wall.split("/")[0]))
+        elif line.startswith("Info: TIMESTEP"):
+            timings["timestep"] = float(line.split()[2])
+        else:
+            continue
+
+        memory = _MEMORY.search(line)
+        if memory is not None:
+            timings["memory"].append(float(memory.group(1)))
+
+    return timings
+
+
+def steady_state(samples, warmup=WARMUP_SAMPLES):
+    """Return the median of all samples after the warm-up phase.
+
+    If there are not more samples than the warm-up phase is long, the median of
+    all samples is returned.
+    """
+    if len(samples) > warmup:
+        samples = samples[warmup:]
+
+    if not samples:
+        return np.nan
+
+    return float(np.median(samples))
+
+
+def parse_ns_day(fh):
+    """Return the steady-state performance of all ``Benchmark time`` lines."""
+    return steady_state(parse_timings(fh)["benchmark"])
+
+
+def parse_log_details(fh):
+    """Parse the timing series and memory usage from a NAMD output file.
+
+    Besides the number of samples, the steady-state performance of the
+    ``TIMING`` lines is reported if the timestep is known, and the peak memory
+    usage in MB.
+    """
+    timings = parse_timings(fh)
+    details = {}
+
+    if timings["benchmark"]:
+        details["benchmark_samples"] = len(timings["benchmark"])
+
+    if timings["timing"]:
+        details["timing_samples"] = len(timings["timing"])
+        if np.isfinite(timings["timestep"]):
+            # Convert seconds per step into nanoseconds per day
+            seconds_per_step = steady_state(timings["timing"])
+            details["timing_performance"] = round(
+                86400 * timings["timestep"] * 1e-6 / seconds_per_step, 3
+            )
+
+    if timings["memory"]:
+        details["peak_memory"] = max(timings["memory"])
+
+    return details
+
+
 def check_input_file_exists(name):
     """Check and append the correct file extensions for the NAMD module."""
     # Check whether the needed files are there.
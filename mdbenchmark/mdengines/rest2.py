@@ -27,6 +27,10 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 # from shutil import copyfile
 
 from mdbenchmark import console
+from mdbenchmark.mdengines.gromacs import (  # noqa: F401
+    parse_log_details,
+    prepare_mdrun_options,
+)
 
 NAME = "rest2"
 
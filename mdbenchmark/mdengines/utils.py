@@ -17,17 +17,52 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
+from shutil import copyfile
 
 import datreant as dtr
 import numpy as np
 
-FILES_TO_KEEP = {
-    "gromacs": [".*/bench.job", ".*.tpr", ".*.mdp"],
-    "namd": [".*/bench.job", ".*.namd", ".*.psf", ".*.pdb"],
-    "rest2": [".*/bench.job", ".*.tpr", ".*.mdp"],
+from mdbenchmark import monitor
+from mdbenchmark.mdengines import namd
+from mdbenchmark.mdengines.gromacs import MDRUN_OPTIONS, MDRUN_PREFIX
+from mdbenchmark.outliers import expand_nodelist
+from mdbenchmark.telemetry import read_telemetry, summarize_telemetry
+
+# Input files of each MD engine. Patterns are matched against file names,
+# `*` matches any characters.
+INPUT_FILES = {
+    "gromacs": ["*.tpr", "*.mdp"],
+    "namd": ["*.namd", "*.psf", "*.pdb"],
+    "rest2": ["*.tpr", "*.mdp"],
+}
+
+# Files written by `write_benchmark` for every MD engine: the job script and
+# the monitor script of adaptive benchmarks and telemetry
+JOB_FILES = ["bench.job", "mdbenchmark_monitor.py"]
+
+FILES_TO_KEEP = {name: patterns + JOB_FILES for name, patterns in INPUT_FILES.items()}
+
+
+def compile_file_patterns(patterns):
+    """Return a regular expression matching file names against all `patterns`."""
+    return re.compile(
+        "(?:{})\\Z".format(
+            "|".join(re.escape(p).replace("\\*", ".*") for p in patterns)
+        )
+    )
+
+
+# A single regular expression per MD engine, matching all files to keep
+KEEP_PATTERNS = {
+    name: compile_file_patterns(patterns) for name, patterns in FILES_TO_KEEP.items()
+}
+INPUT_PATTERNS = {
+    name: compile_file_patterns(patterns) for name, patterns in INPUT_FILES.items()
 }
 
 PARSE_ENGINE = {
@@ -36,13 +71,17 @@ PARSE_ENGINE = {
         "performance_return": lambda line: float(line.split()[1]),
         "ncores": "Running on",
         "ncores_return": lambda line: int(line.split()[6]),
+        "hostname": "Host:",
+        "hostname_return": lambda line: line.split()[1],
         "analyze": "**/[!#]*log*",
     },
     "namd": {
         "performance": "Benchmark time",
         "performance_return": lambda line: 1 / float(line.split()[7]),
+        "performance_parser": namd.parse_ns_day,
         "ncores": "Benchmark time",
         "ncores_return": lambda line: int(line.split()[3]),
+        "hostname": None,
         "analyze": "*out*",
     },
     "rest2": {
@@ -50,11 +89,19 @@ PARSE_ENGINE = {
         "performance_return": lambda line: float(line.split()[1]),
         "ncores": "Running on",
         "ncores_return": lambda line: int(line.split()[6]),
+        "hostname": "Host:",
+        "hostname_return": lambda line: line.split()[1],
         "analyze": "**/[!#]*log*",
     },
 
 }
 
+# File written by the job templates, containing the allocated nodes
+NODELIST_FILE = "nodelist"
+
+# File written by the telemetry sampler of the job templates
+TELEMETRY_FILE = "telemetry.jsonl"
+
 
 def parse_ns_day(engine, fh):
     """Parse the performance (ns/day) from any MD engine log file.
@@ -69,6 +116,10 @@ def parse_ns_day(engine, fh):
     float / np.nan
         Nanoseconds per day or NaN
     """
+    # Some engines report the performance multiple times during a run
+    if "performance_parser" in PARSE_ENGINE[engine.NAME]:
+        return PARSE_ENGINE[engine.NAME]["performance_parser"](fh)
+
     lines = fh.readlines()
 
     for line in lines:
@@ -100,9 +151,170 @@ def parse_ncores(engine, fh):
     return np.nan
 
 
-def analyze_benchmark(engine, benchmark):
+def parse_hostnames(engine, fh):
+    """Parse the names of the hosts from any MD engine log file.
+
+    Parameters
+    ----------
+    fh : str / filehandle
+        Filename or string of log file to read
+
+    Returns
+    -------
+    list
+        Hostnames found in the log file
+    """
+    prefix = PARSE_ENGINE[engine.NAME]["hostname"]
+    if prefix is None:
+        return []
+
+    return [
+        PARSE_ENGINE[engine.NAME]["hostname_return"](line)
+        for line in fh.readlines()
+        if line.startswith(prefix)
+    ]
+
+
+def collect_hostnames(engine, benchmark):
+    """Return all hostnames a benchmark was run on.
+
+    Hostnames are collected from the MD engine log files and from the nodelist
+    written by the job template.
+    """
+    hostnames = set()
+
+    output_files = glob(
+        os.path.join(benchmark.relpath, PARSE_ENGINE[engine.NAME]["analyze"]),
+        recursive=True,
+    )
+    for f in output_files:
+        with open(f) as fh:
+            hostnames.update(parse_hostnames(engine, fh))
+
+    nodelist = os.path.join(benchmark.relpath, NODELIST_FILE)
+    if os.path.exists(nodelist):
+        with open(nodelist) as fh:
+            hostnames.update(expand_nodelist(fh.read().strip()))
+
+    return sorted(hostnames)
+
+
+def collect_details(engine, benchmark):
+    """Return the log file details of a benchmark.
+
+    Details of all log files of a benchmark, i.e., of all replicas of multidir
+    simulations, are averaged. Non-numerical details are taken from the first
+    log file.
+    """
+    details = []
+
+    output_files = glob(
+        os.path.join(benchmark.relpath, PARSE_ENGINE[engine.NAME]["analyze"]),
+        recursive=True,
+    )
+    for f in sorted(output_files):
+        with open(f) as fh:
+            details.append(engine.parse_log_details(fh))
+
+    combined = {}
+    for d in details:
+        for key, value in d.items():
+            combined.setdefault(key, []).append(value)
+
+    return {
+        key: np.mean(values)
+        if all(isinstance(v, (int, float)) for v in values)
+        else values[0]
+        for key, values in combined.items()
+    }
+
+
+def collect_telemetry(benchmark):
+    """Return the summary of the telemetry sampled during a benchmark.
+
+    All values are NaN if the benchmark has no telemetry file, see
+    `mdbenchmark.telemetry.summarize_telemetry`.
+    """
+    filename = os.path.join(benchmark.relpath, TELEMETRY_FILE)
+    if not os.path.exists(filename):
+        return summarize_telemetry([])
+
+    return summarize_telemetry(read_telemetry(filename))
+
+
+def hash_input_files(engine, benchmark):
+    """Return a SHA-256 hash of the input files of a benchmark.
+
+    The input files are the files whose name matches `INPUT_PATTERNS` of the
+    MD engine. Copies of the same file in replica directories are only hashed
+    once, so the hash identifies the simulated system independent of the
+    layout of the benchmark and of its outputs.
+    """
+    inputs = INPUT_PATTERNS[engine.NAME]
+    files = {}
+    for f in sorted(glob(os.path.join(benchmark.relpath, "**", "*"), recursive=True)):
+        basename = os.path.basename(f)
+        if os.path.isfile(f) and inputs.match(basename):
+            files.setdefault(basename, f)
+
+    sha = hashlib.sha256()
+    for basename in sorted(files):
+        with open(files[basename], "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                sha.update(chunk)
+    return sha.hexdigest()
+
+
+def finish_time(engine, benchmark):
+    """Return the modification time of the newest output file of a benchmark.
+
+    Returns None, if the benchmark did not write any output yet.
+    """
+    output_files = glob(
+        os.path.join(benchmark.relpath, PARSE_ENGINE[engine.NAME]["analyze"]),
+        recursive=True,
+    )
+    if not output_files:
+        return None
+    return max(os.path.getmtime(f) for f in output_files)
+
+
+def analyze_replicas(engine, benchmark):
+    """Analyze the performance of each replica of a benchmark.
+
+    Every output file of a benchmark belongs to one replica. Benchmarks run
+    without multidir have a single replica.
+
+    Returns
+    -------
+    list
+        Tuples of the replica directory, relative to the benchmark, its
+        performance and number of cores. Both are NaN for failed replicas.
+    """
+    output_files = glob(
+        os.path.join(benchmark.relpath, PARSE_ENGINE[engine.NAME]["analyze"]),
+        recursive=True,
+    )
+
+    replicas = []
+    for f in sorted(output_files):
+        with open(f) as fh:
+            performance = parse_ns_day(engine, fh)
+            fh.seek(0)
+            ncores = parse_ncores(engine, fh)
+        replica = os.path.relpath(os.path.dirname(f), benchmark.relpath)
+        replicas.append((replica, performance, ncores))
+
+    return replicas
+
+
+def analyze_benchmark(engine, benchmark, replicas=None):
     """
     Analyze performance data from a simulation run with any MD engine.
+
+    The performance of a multidir run is the sum over all replicas that
+    finished. `replicas` can be given as returned by `analyze_replicas` to
+    avoid parsing the log files again.
     """
     performance = np.nan
     ncores = np.nan
@@ -112,22 +324,19 @@ def analyze_benchmark(engine, benchmark):
     module = None
     multidir = np.nan
     temprange = None
-
-    # search all output files
-    output_files = glob(
-        os.path.join(benchmark.relpath, PARSE_ENGINE[engine.NAME]["analyze"]),
-        recursive=True,
-    )
-    if output_files:
-        performance = []
-        ncores = []
-        for f in output_files:
-            with open(f) as fh:
-                performance.append(parse_ns_day(engine, fh))
-                fh.seek(0)
-                ncores.append(parse_ncores(engine, fh))
+    repeat = np.nan
+    # Benchmarks without separate PME ranks let the MD engine decide
+    pme_ranks = -1
+    # Only enumerated layouts know how the ranks share the GPUs
+    gpus_per_rank = -1
+
+    if replicas is None:
+        replicas = analyze_replicas(engine, benchmark)
+    finished = [r for r in replicas if np.isfinite(r[1])]
+    if finished:
+        _, performance, ncores = zip(*finished)
         performance = np.sum(performance)
-        ncores = ncores[0]
+        ncores = next((n for n in ncores if np.isfinite(n)), np.nan)
 
     if "time" not in benchmark.categories:
         benchmark.categories["time"] = 0
@@ -135,6 +344,21 @@ def analyze_benchmark(engine, benchmark):
     if "multidir" in benchmark.categories:
         multidir = benchmark.categories["multidir"]
 
+    if "repeat" in benchmark.categories:
+        repeat = benchmark.categories["repeat"]
+
+    if "pme_ranks" in benchmark.categories:
+        pme_ranks = benchmark.categories["pme_ranks"]
+
+    if "gpus_per_rank" in benchmark.categories:
+        gpus_per_rank = benchmark.categories["gpus_per_rank"]
+
+    # mdrun options that were not swept were left to the MD engine
+    mdrun_options = [
+        benchmark.categories[category] if category in benchmark.categories else "auto"
+        for category in MDRUN_OPTIONS
+    ]
+
     if "rest2" in engine.NAME:
         temprange = benchmark.categories["temprange"]
 
@@ -169,27 +393,102 @@ def analyze_benchmark(engine, benchmark):
         hyperthreading,
         multidir,
         temprange,
-    ]
+        repeat,
+        pme_ranks,
+        gpus_per_rank,
+    ] + mdrun_options
+
+
+def files_to_clean(engine, directory):
+    """Return all files in `directory` that are removed by a restart.
+
+    Hidden files and subdirectories are never removed. All other files are
+    removed, unless their name matches `KEEP_PATTERNS` of the MD engine.
+
+    Returns
+    -------
+    list
+        Tuples of the path and size in bytes of each file.
+    """
+    keep = KEEP_PATTERNS[engine.NAME]
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or entry.is_dir(follow_symlinks=False):
+                continue
+            if keep.match(entry.name):
+                continue
+            files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+
+    return sorted(files)
+
 
+def cleanup_before_restart(engine, sim, dry_run=False):
+    """Remove all files of a previous run of a benchmark.
 
-def cleanup_before_restart(engine, sim):
-    whitelist = FILES_TO_KEEP[engine.NAME]
-    whitelist = [re.compile(fname) for fname in whitelist]
+    With `dry_run`, the files are only listed. See `files_to_clean` for the
+    return value.
+    """
+    files = files_to_clean(engine, sim.abspath)
+    if not dry_run:
+        for path, _ in files:
+            os.remove(path)
 
-    files_found = []
+    return files
 
-    for fname in sim.leaves():
-        keep = False
-        for wl in whitelist:
-            if wl.match(str(fname)):
-                keep = True
-        if keep:
-            continue
 
-        files_found.append(fname.relpath)
+def cleanup_benchmarks(benchmarks, dry_run=False, max_workers=None):
+    """Remove the files of previous runs of many benchmarks in parallel.
 
-    for fn in files_found:
-        os.remove(fn)
+    `benchmarks` holds tuples of the MD engine and the benchmark. Deleting
+    files is bound by the file system, so we use threads.
+
+    Returns
+    -------
+    (int, int)
+        Number of removed files and their size in bytes.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        removed = executor.map(
+            lambda benchmark: cleanup_before_restart(*benchmark, dry_run=dry_run),
+            benchmarks,
+        )
+        files = [f for files in removed for f in files]
+
+    return len(files), sum(size for _, size in files)
+
+
+# Categories of every benchmark that cannot be swept over freely
+RESERVED_CATEGORIES = [
+    "module",
+    "gpu",
+    "nodes",
+    "host",
+    "time",
+    "name",
+    "started",
+    "ranks",
+    "threads",
+    "hyperthreading",
+    "version",
+    "multidir",
+    "temprange",
+    "repeat",
+    "pme_ranks",
+    "gpus_per_rank",
+    "sweep",
+    "tolerance",
+    "telemetry",
+]
+
+# Name of the monitor script of adaptive benchmarks
+MONITOR_SCRIPT = "mdbenchmark_monitor.py"
+
+# Run time of the calibration run of adaptive benchmarks in minutes
+CALIBRATION_TIME = 1
+
+# Seconds between two telemetry records
+TELEMETRY_INTERVAL = 10
 
 
 def write_benchmark(
@@ -211,19 +510,64 @@ def write_benchmark(
     temprange,
     benchmark_counter,
     first_benchmark,
+    repeat=0,
+    number_of_pme_ranks=-1,
+    gpus_per_rank=-1,
+    adaptive_tolerance=None,
+    telemetry=False,
+    **parameters,
 ):
-    """Generate a benchmark folder with the respective Benchmark object."""
+    """Generate a benchmark folder with the respective Benchmark object.
+
+    `gpus_per_rank` is the share of the GPUs of a node each rank uses, or -1
+    if it is not known from the layout. If `adaptive_tolerance` is given, GROMACS
+    benchmarks are stopped as soon as their performance is stable within this
+    relative tolerance, see `mdbenchmark.monitor`. With `telemetry`, the job
+    script samples the progress and the utilization of the node while the
+    benchmark runs.
+
+    Additional keyword arguments are further swept parameters. Parameters
+    starting with ``mdrun_`` are passed to mdrun as options, e.g.,
+    ``mdrun_nb="gpu"`` as ``-nb gpu``. All parameters are stored as categories
+    and passed to the template.
+    """
+    reserved = set(parameters) & set(RESERVED_CATEGORIES)
+    if reserved:
+        raise ValueError(
+            "Cannot sweep over the reserved categories: {}.".format(
+                ", ".join(sorted(reserved))
+            )
+        )
+
+    mdrun_options = {category: "auto" for category in MDRUN_OPTIONS}
+    mdrun_options.update(
+        {k: v for k, v in parameters.items() if k.startswith(MDRUN_PREFIX)}
+    )
+    # Parameters that are not known to MDBenchmark are listed in the `sweep`
+    # category, so that `mdbenchmark analyze` can find them.
+    extra_parameters = {k: v for k, v in parameters.items() if k not in MDRUN_OPTIONS}
+
     # Create the `dtr.Treant` object
     hyperthreading_string = "wht" if hyperthreading else "woht"
-    directory = base_directory[
-        "n{nodes:03d}_r{ranks:02d}_t{threads:02d}_{ht}_nsim{nsim:01d}/".format(
-            nodes=nodes,
-            ranks=number_of_ranks,
-            threads=number_of_threads,
-            ht=hyperthreading_string,
-            nsim=multidir,
-        )
-    ]
+    directory_name = "n{nodes:03d}_r{ranks:02d}_t{threads:02d}_{ht}_nsim{nsim:01d}".format(
+        nodes=nodes,
+        ranks=number_of_ranks,
+        threads=number_of_threads,
+        ht=hyperthreading_string,
+        nsim=multidir,
+    )
+    if number_of_pme_ranks >= 0:
+        directory_name += "_pme{pme:02d}".format(pme=number_of_pme_ranks)
+    for category, value in mdrun_options.items():
+        if value != "auto":
+            directory_name += "_{}{}".format(category[len(MDRUN_PREFIX) :], value)
+    for key, value in extra_parameters.items():
+        if not key.startswith(MDRUN_PREFIX):
+            directory_name += "_{}{}".format(key, value)
+    # Repeated benchmarks of the same configuration get their own directory
+    if repeat:
+        directory_name += "_rep{repeat:02d}".format(repeat=repeat)
+    directory = base_directory[directory_name + "/"]
     benchmark = dtr.Treant(directory)
 
     # Do MD engine specific things. Here we also format the name.
@@ -249,7 +593,30 @@ def write_benchmark(
         "version": 3,
         "multidir": multidir,
         "temprange": temprange,
+        "repeat": repeat,
+        "pme_ranks": number_of_pme_ranks,
+        "gpus_per_rank": gpus_per_rank,
+        **mdrun_options,
+        **extra_parameters,
     }
+    if extra_parameters:
+        benchmark.categories["sweep"] = ",".join(extra_parameters)
+
+    # Adaptive benchmarks are watched by the monitor script
+    adaptive = adaptive_tolerance is not None and engine.NAME == "gromacs"
+    if adaptive:
+        benchmark.categories["tolerance"] = adaptive_tolerance
+    if telemetry:
+        benchmark.categories["telemetry"] = True
+    if adaptive or telemetry:
+        copyfile(monitor.__file__, benchmark[MONITOR_SCRIPT].relpath)
+
+    # The sampler follows the log file of the first simulation
+    telemetry_log = None
+    if engine.NAME == "gromacs":
+        telemetry_log = "{}.log".format(name)
+        if multidir > 1:
+            telemetry_log = "rep01/{}".format(telemetry_log)
 
     # Add some time buffer to the requested time. Otherwise the queuing system
     # kills the job before the benchmark is finished
@@ -272,6 +639,19 @@ def write_benchmark(
         number_of_threads=number_of_threads,
         hyperthreading=hyperthreading,
         multidir=multidir_string,
+        number_of_pme_ranks=number_of_pme_ranks,
+        gpus_per_rank=gpus_per_rank,
+        adaptive=adaptive,
+        tolerance=adaptive_tolerance,
+        calibration_time=CALIBRATION_TIME,
+        telemetry=telemetry,
+        telemetry_file=TELEMETRY_FILE,
+        telemetry_interval=TELEMETRY_INTERVAL,
+        telemetry_log=telemetry_log,
+        mdrun_options=engine.prepare_mdrun_options(
+            nodes, number_of_pme_ranks, mdrun_options
+        ),
+        **{**mdrun_options, **extra_parameters},
     )
 
     # Write the actual job script that is going to be submitted to the cluster
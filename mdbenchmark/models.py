@@ -17,7 +17,26 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
-from psutil import cpu_count
+import glob
+import os
+from collections import namedtuple
+
+from psutil import cpu_count, virtual_memory
+
+# Keys of the hardware profile stored in the host template metadata
+PROFILE_KEYS = [
+    "sockets",
+    "cores_per_socket",
+    "threads_per_core",
+    "gpus_per_node",
+    "numa_domains",
+    "memory_gb",
+]
+
+# A rank and thread layout of a single node. `pme_ranks` is the number of
+# separate PME ranks per node, -1 lets the MD engine decide. `gpus_per_rank`
+# is -1 if the number of GPUs of the node is unknown.
+Layout = namedtuple("Layout", ["ranks", "threads", "gpus_per_rank", "pme_ranks"])
 
 
 class Processor:
@@ -27,13 +46,45 @@ class Processor:
     multiple CPU sockets.
     """
 
-    def __init__(self, physical_cores=0, logical_cores=0):
+    def __init__(
+        self,
+        physical_cores=0,
+        logical_cores=0,
+        sockets=1,
+        numa_domains=1,
+        gpus=None,
+        memory_gb=None,
+    ):
         self.physical_cores = physical_cores
         self.logical_cores = logical_cores
+        self.sockets = sockets
+        self.numa_domains = numa_domains
+        self.gpus = gpus
+        self.memory_gb = memory_gb
 
         if self.physical_cores == 0 or self.logical_cores == 0:
             self._set_number_of_available_cores()
 
+    @classmethod
+    def from_profile(cls, profile):
+        """Create a processor from the hardware profile of a host template.
+
+        Returns None if the profile does not define the number of cores.
+        """
+        if "cores_per_socket" not in profile:
+            return None
+
+        sockets = profile.get("sockets", 1)
+        physical_cores = sockets * profile["cores_per_socket"]
+        return cls(
+            physical_cores=physical_cores,
+            logical_cores=physical_cores * profile.get("threads_per_core", 1),
+            sockets=sockets,
+            numa_domains=profile.get("numa_domains", sockets),
+            gpus=profile.get("gpus_per_node"),
+            memory_gb=profile.get("memory_gb"),
+        )
+
     def __repr__(self):
         return f"<Processor physical_cores={self.physical_cores}, logical_cores={self.logical_cores}, supports_hyperthreading={self.supports_hyperthreading}>"
 
@@ -93,3 +144,97 @@ class Processor:
             number_of_threads //= 2
 
         return (number_of_ranks, number_of_threads)
+
+    def _pme_rank_candidates(self, number_of_ranks, gpu):
+        """Return the numbers of separate PME ranks worth benchmarking."""
+        candidates = [0]
+        if gpu:
+            # PME can be offloaded to the GPU of one separate rank
+            if number_of_ranks > 1:
+                candidates.append(1)
+        elif number_of_ranks >= 8:
+            # Without GPUs, a quarter of all ranks is a good starting point
+            candidates.append(number_of_ranks // 4)
+
+        return candidates
+
+    def enumerate_layouts(self, with_hyperthreading=False, gpu=False):
+        """Enumerate all sensible rank and thread layouts of a single node.
+
+        The threads of every rank must fit into a single NUMA domain. Layouts
+        where ranks straddle the boundary between two domains are skipped. With
+        `gpu` and a known number of GPUs, all ranks must be evenly distributed
+        over the GPUs.
+
+        Returns
+        -------
+        list
+            `Layout` tuples sorted by the number of ranks.
+        """
+        if with_hyperthreading and not self.supports_hyperthreading:
+            raise ValueError("The processor does not support hyperthreading.")
+
+        cores = self.logical_cores if with_hyperthreading else self.physical_cores
+        cores_per_domain = cores
+        if self.numa_domains and cores % self.numa_domains == 0:
+            cores_per_domain = cores // self.numa_domains
+
+        layouts = []
+        for number_of_ranks in range(1, cores + 1):
+            if cores % number_of_ranks:
+                continue
+            number_of_threads = cores // number_of_ranks
+            if cores_per_domain % number_of_threads:
+                continue
+
+            gpus_per_rank = 0
+            if gpu and self.gpus is None:
+                gpus_per_rank = -1
+            elif gpu:
+                # Each GPU is shared by the same number of ranks
+                if not self.gpus or number_of_ranks % self.gpus:
+                    continue
+                gpus_per_rank = self.gpus / number_of_ranks
+
+            for pme_ranks in self._pme_rank_candidates(number_of_ranks, gpu):
+                layouts.append(
+                    Layout(number_of_ranks, number_of_threads, gpus_per_rank, pme_ranks)
+                )
+
+        return layouts
+
+
+def _count_sockets():
+    """Count the distinct physical ids in `/proc/cpuinfo`."""
+    try:
+        with open("/proc/cpuinfo") as fh:
+            ids = {
+                line.split(":")[1].strip()
+                for line in fh
+                if line.startswith("physical id")
+            }
+    except OSError:
+        return 1
+    return max(len(ids), 1)
+
+
+def detect_hardware_profile():
+    """Detect the hardware profile of the machine we are running on.
+
+    This should be run on a compute node, as login nodes often differ from the
+    nodes the benchmarks run on.
+    """
+    physical_cores = cpu_count(logical=False)
+    logical_cores = cpu_count(logical=True)
+    sockets = _count_sockets()
+    numa_domains = len(glob.glob("/sys/devices/system/node/node[0-9]*")) or sockets
+    gpus = len(glob.glob(os.path.join("/dev", "nvidia[0-9]*")))
+
+    return {
+        "sockets": sockets,
+        "cores_per_socket": physical_cores // sockets,
+        "threads_per_core": logical_cores // physical_cores,
+        "gpus_per_node": gpus,
+        "numa_domains": numa_domains,
+        "memory_gb": round(virtual_memory().total / 1024**3),
+    }
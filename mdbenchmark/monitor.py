@@ -0,0 +1,305 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+"""Monitor running benchmarks on the compute node.
+
+This script is copied next to the job script of adaptive benchmarks and of
+benchmarks with telemetry. It runs on the compute node, so it must only use
+the standard library. It has three commands:
+
+``steps LOG TIME CALIBRATION``
+    Read the log file of a short calibration run and print the step at which
+    the counters are reset and the maximal number of steps that fit into the
+    run time of ``TIME`` minutes.
+
+``watch LOG PID``
+    Follow the log file of the benchmark and send SIGTERM to ``PID`` once the
+    rolling ns/day estimate is stable. GROMACS then stops gracefully and
+    reports the performance since the counters were reset.
+
+``sample OUTPUT [--log LOG]``
+    Append a JSON record with the current step, ns/day and the CPU, memory
+    and GPU utilization of the node to ``OUTPUT`` at regular intervals, until
+    the process is killed.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import time
+
+_DT = re.compile(r"^\s*dt\s*=\s*([-+.\deE]+)", re.MULTILINE)
+_PERFORMANCE = re.compile(r"^Performance:\s+([.\d]+)", re.MULTILINE)
+_STEP_HEADER = re.compile(r"^\s+Step\s+Time\s*$")
+_RESET = "resetting all time and cycle counters"
+
+# Share of the steps we plan with, to leave time for the final output
+SAFETY_FACTOR = 0.9
+
+
+def calibrate(log, run_time, calibration_time):
+    """Return the reset step and number of steps of the benchmark.
+
+    The performance of the calibration run gives the number of steps per
+    minute. The counters are reset after as many steps as the calibration run
+    took, and the number of steps is chosen so that the benchmark finishes
+    within the remaining run time in minutes.
+    """
+    dt = float(_DT.search(log).group(1))
+    ns_per_day = float(_PERFORMANCE.findall(log)[-1])
+    steps_per_minute = ns_per_day * 1000 / dt / (24 * 60)
+
+    reset_step = int(steps_per_minute * calibration_time)
+    number_of_steps = int(steps_per_minute * (run_time - calibration_time))
+    return reset_step, max(int(number_of_steps * SAFETY_FACTOR), 2 * reset_step)
+
+
+def parse_steps(lines):
+    """Yield all steps with energy output in `lines` of a GROMACS log file."""
+    header = False
+    for line in lines:
+        if header:
+            header = False
+            try:
+                yield int(line.split()[0])
+            except (IndexError, ValueError):
+                pass
+        header = bool(_STEP_HEADER.match(line))
+
+
+def rolling_performance(samples, dt):
+    """Return the ns/day between consecutive `(seconds, step)` samples."""
+    return [
+        (step - last_step) * dt / 1000 / (seconds - last_seconds) * 24 * 3600
+        for (last_seconds, last_step), (seconds, step) in zip(samples, samples[1:])
+        if seconds > last_seconds and step > last_step
+    ]
+
+
+def converged(estimates, tolerance, window):
+    """Return whether the last `window` estimates agree within `tolerance`."""
+    if len(estimates) < window:
+        return False
+    recent = estimates[-window:]
+    mean = sum(recent) / window
+    return (max(recent) - min(recent)) / mean <= tolerance
+
+
+class LogFollower:
+    """Read the lines that are appended to a GROMACS log file."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.dt = None
+        self._position = 0
+        self._remainder = ""
+        self._last_line = []
+
+    def read(self):
+        """Return all complete lines appended since the last call."""
+        try:
+            with open(self.filename) as fh:
+                fh.seek(self._position)
+                text = self._remainder + fh.read()
+                self._position = fh.tell()
+        except OSError:
+            return []
+
+        # Only complete lines are parsed, the rest is kept for later
+        lines = text.split("\n")
+        self._remainder = lines.pop()
+        if self.dt is None and _DT.search(text):
+            self.dt = float(_DT.search(text).group(1))
+        return lines
+
+    def steps(self, lines):
+        """Return the steps with energy output in `lines`."""
+        # The header of the last energy output may be the last complete line
+        steps = list(parse_steps(self._last_line + lines))
+        self._last_line = lines[-1:] or self._last_line
+        return steps
+
+
+def watch(filename, pid, tolerance, interval, window):
+    """Follow the log file and stop the benchmark once it converged."""
+    log = LogFollower(filename)
+    reset = False
+    samples = []
+
+    while True:
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return False
+
+        time.sleep(interval)
+        lines = log.read()
+        if not reset and any(_RESET in line.lower() for line in lines):
+            reset = True
+            samples = []
+
+        steps = log.steps(lines)
+        if not reset or log.dt is None or not steps:
+            continue
+        samples.append((time.time(), steps[-1]))
+
+        if converged(rolling_performance(samples, log.dt), tolerance, window):
+            os.kill(pid, signal.SIGTERM)
+            return True
+
+
+def cpu_times():
+    """Return the busy and total CPU time of the node from /proc/stat."""
+    try:
+        with open("/proc/stat") as fh:
+            # user, nice, system, idle, iowait, irq, softirq, steal
+            values = [int(v) for v in fh.readline().split()[1:9]]
+    except (OSError, ValueError):
+        return None
+    return sum(values) - sum(values[3:5]), sum(values)
+
+
+def cpu_usage(last, current):
+    """Return the CPU utilization in percent between two `cpu_times`."""
+    if last is None or current is None or current[1] <= last[1]:
+        return None
+    return round(100 * (current[0] - last[0]) / (current[1] - last[1]), 1)
+
+
+def memory_usage():
+    """Return the used memory of the node in percent from /proc/meminfo."""
+    meminfo = {}
+    try:
+        with open("/proc/meminfo") as fh:
+            for line in fh:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0])
+        return round(100 * (1 - meminfo["MemAvailable"] / meminfo["MemTotal"]), 1)
+    except (OSError, ValueError, KeyError, ZeroDivisionError):
+        return None
+
+
+def gpu_usage():
+    """Return the mean utilization of all GPUs in percent, if nvidia-smi exists."""
+    if shutil.which("nvidia-smi") is None:
+        return None
+    try:
+        output = subprocess.run(
+            [
+                "nvidia-smi",
+                "--query-gpu=utilization.gpu",
+                "--format=csv,noheader,nounits",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            timeout=10,
+        ).stdout
+        values = [float(v) for v in output.split()]
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+    return round(sum(values) / len(values), 1) if values else None
+
+
+def sample(output, filename=None, interval=10):
+    """Append telemetry records to `output` until the process is killed.
+
+    Every record holds the seconds since the start of sampling and the CPU,
+    memory and GPU utilization of the node. If the log file `filename` is
+    given, the last step and the ns/day since the previous record are added.
+    """
+    log = LogFollower(filename) if filename else None
+    start = time.time()
+    last_cpu = cpu_times()
+    last_sample = None
+
+    with open(output, "a") as fh:
+        while True:
+            time.sleep(interval)
+            now = time.time()
+            record = {"time": round(now - start, 1)}
+
+            if log is not None:
+                steps = log.steps(log.read())
+                performance = []
+                if steps:
+                    current = (now, steps[-1])
+                    if last_sample is not None and log.dt is not None:
+                        performance = rolling_performance(
+                            [last_sample, current], log.dt
+                        )
+                    last_sample = current
+                record["step"] = last_sample[1] if last_sample else None
+                record["ns_per_day"] = round(performance[0], 3) if performance else None
+
+            current_cpu = cpu_times()
+            record["cpu"] = cpu_usage(last_cpu, current_cpu)
+            record["memory"] = memory_usage()
+            record["gpu"] = gpu_usage()
+            last_cpu = current_cpu
+
+            fh.write(json.dumps(record) + "\n")
+            fh.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+
+    steps = commands.add_parser("steps")
+    steps.add_argument("log")
+    steps.add_argument("time", type=float)
+    steps.add_argument("calibration", type=float)
+
+    watcher = commands.add_parser("watch")
+    watcher.add_argument("log")
+    watcher.add_argument("pid", type=int)
+    watcher.add_argument("--tolerance", type=float, default=0.02)
+    watcher.add_argument("--interval", type=float, default=10)
+    watcher.add_argument("--window", type=int, default=6)
+
+    sampler = commands.add_parser("sample")
+    sampler.add_argument("output")
+    sampler.add_argument("--log")
+    sampler.add_argument("--interval", type=float, default=10)
+
+    args = parser.parse_args(argv)
+    if args.command == "steps":
+        with open(args.log) as fh:
+            reset_step, number_of_steps = calibrate(
+                fh.read(), args.time, args.calibration
+            )
+        print(reset_step, number_of_steps)
+    elif args.command == "watch":
+        watch(args.log, args.pid, args.tolerance, args.interval, args.window)
+    elif args.command == "sample":
+        sample(args.output, args.log, args.interval)
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import re
+
+import numpy as np
+import pandas as pd
+
+
+def expand_nodelist(nodelist):
+    """Expand a compressed SLURM nodelist into a list of hostnames.
+
+    For example ``dra[0001-0003,0010],drb01`` becomes ``["dra0001", "dra0002",
+    "dra0003", "dra0010", "drb01"]``. Leading zeros of ranges are preserved.
+    """
+    hostnames = []
+    for prefix, ranges, plain in re.findall(
+        r"([^,\[]+)\[([^\]]+)\]|([^,\[\]]+)", nodelist
+    ):
+        if plain:
+            hostnames.append(plain.strip())
+            continue
+
+        for part in ranges.split(","):
+            if "-" not in part:
+                hostnames.append(prefix + part)
+                continue
+
+            start, end = part.split("-")
+            width = len(start)
+            for number in range(int(start), int(end) + 1):
+                hostnames.append("{}{:0{}d}".format(prefix, number, width))
+
+    return [h for h in hostnames if h]
+
+
+def flag_outliers(df, columns, performance_column, threshold=0.2):
+    """Flag benchmarks that perform far below the median of their configuration.
+
+    All rows sharing the values in `columns` belong to the same configuration.
+    The relative deviation from the configuration median is stored in the
+    `deviation` column. Rows deviating more than `threshold` below the median
+    are marked in the `outlier` column. Configurations with a single finished
+    benchmark are never flagged.
+    """
+    df = df.copy()
+    performance = df[performance_column].astype(float)
+    grouped = performance.groupby([df[c] for c in columns], dropna=False, sort=False)
+    median = grouped.transform("median")
+    finished = grouped.transform("count")
+
+    df["deviation"] = (performance / median - 1).where(finished > 1)
+    df["outlier"] = (df["deviation"] < -threshold).fillna(False)
+
+    return df
+
+
+def node_slowness(df):
+    """Compute a slowness score for every node a benchmark was run on.
+
+    Expects the `hostnames`, `deviation` and `outlier` columns as produced by
+    `flag_outliers`. The slowness score of a node is the negative mean relative
+    deviation of all benchmarks that used it, i.e., positive scores indicate
+    nodes that are slower than their peers.
+    """
+    nodes = df[["hostnames", "deviation", "outlier"]].explode("hostnames")
+    nodes = nodes.dropna(subset=["hostnames", "deviation"])
+
+    if nodes.empty:
+        return pd.DataFrame(columns=["hostname", "runs", "outliers", "slowness"])
+
+    nodes["deviation"] = nodes["deviation"].astype(float)
+    slowness = nodes.groupby("hostnames").agg(
+        runs=("deviation", "size"),
+        outliers=("outlier", "sum"),
+        slowness=("deviation", lambda d: -np.mean(d)),
+    )
+    slowness = slowness.reset_index().rename(columns={"hostnames": "hostname"})
+    slowness["outliers"] = slowness["outliers"].astype(int)
+    # Adding zero turns negative zeros into positive ones for printing
+    slowness["slowness"] = slowness["slowness"].round(4) + 0.0
+
+    return slowness.sort_values(
+        ["slowness", "hostname"], ascending=[False, True]
+    ).reset_index(drop=True)
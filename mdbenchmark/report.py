@@ -0,0 +1,312 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import json
+
+import pandas as pd
+from jinja2 import Environment
+from markupsafe import Markup
+
+REPORT_MAPPING = {
+    "performance_per_node": "ns/day per node",
+    "efficiency": "Efficiency (%)",
+}
+
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{{ title }}</title>
+<style>
+body { font-family: sans-serif; margin: 2em auto; max-width: 70em; color: #222; }
+table { border-collapse: collapse; margin: 1em 0; font-size: 0.9em; }
+th, td { border: 1px solid #ccc; padding: 0.25em 0.6em; text-align: right; }
+th { background: #f0f0f0; cursor: pointer; }
+td.missing { color: #999; }
+svg text { font-size: 12px; }
+.legend span { display: inline-block; margin-right: 1.5em; }
+.legend i { display: inline-block; width: 1em; height: 0.6em; margin-right: 0.3em; }
+</style>
+</head>
+<body>
+<h1>{{ title }}</h1>
+<p>Generated by MDBenchmark {{ version }} on {{ date }}.</p>
+<h2>Recommendation</h2>
+<div id="recommendations"></div>
+<h2>Scaling</h2>
+<svg id="scaling" width="800" height="400"></svg>
+<div id="legend" class="legend"></div>
+<h2>Parallel efficiency</h2>
+<div id="efficiency"></div>
+<h2>Benchmarks</h2>
+<div id="results"></div>
+<div id="replica-section">
+<h2>Replicas</h2>
+<div id="replicas"></div>
+</div>
+<script type="application/json" id="data">{{ data }}</script>
+<script>
+var data = JSON.parse(document.getElementById("data").textContent);
+var colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+              "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"];
+
+function format(value) {
+  if (value === null || value === undefined) return "?";
+  if (typeof value === "number" && !Number.isInteger(value))
+    return value.toFixed(2);
+  return String(value);
+}
+
+function table(target, columns, rows) {
+  var element = document.createElement("table");
+  var head = element.createTHead().insertRow();
+  columns.forEach(function (column, index) {
+    var cell = document.createElement("th");
+    cell.textContent = column.name;
+    cell.onclick = function () {
+      var ascending = cell.dataset.order !== "asc";
+      cell.dataset.order = ascending ? "asc" : "desc";
+      rows.sort(function (a, b) {
+        var x = a[column.key], y = b[column.key];
+        if (x === y) return 0;
+        if (x === null) return 1;
+        if (y === null) return -1;
+        return (x < y ? -1 : 1) * (ascending ? 1 : -1);
+      });
+      fill();
+    };
+    head.appendChild(cell);
+  });
+  var body = element.createTBody();
+  function fill() {
+    body.innerHTML = "";
+    rows.forEach(function (row) {
+      var tr = body.insertRow();
+      columns.forEach(function (column) {
+        var cell = tr.insertCell();
+        cell.textContent = format(row[column.key]);
+        if (row[column.key] === null) cell.className = "missing";
+      });
+    });
+  }
+  fill();
+  document.getElementById(target).appendChild(element);
+}
+
+function chart(target, curves) {
+  var svg = document.getElementById(target);
+  var width = svg.getAttribute("width"), height = svg.getAttribute("height");
+  var margin = 50, xs = [], ys = [0];
+  curves.forEach(function (curve) {
+    xs = xs.concat(curve.nodes);
+    ys = ys.concat(curve.performance.filter(function (y) { return y !== null; }));
+  });
+  var xmax = Math.max.apply(null, xs), ymax = Math.max.apply(null, ys) * 1.1 || 1;
+  function x(value) { return margin + value / xmax * (width - 2 * margin); }
+  function y(value) { return height - margin - value / ymax * (height - 2 * margin); }
+  function add(tag, attributes, text) {
+    var node = document.createElementNS("http://www.w3.org/2000/svg", tag);
+    for (var key in attributes) node.setAttribute(key, attributes[key]);
+    if (text !== undefined) node.textContent = text;
+    svg.appendChild(node);
+  }
+  add("line", {x1: x(0), y1: y(0), x2: x(xmax), y2: y(0), stroke: "#222"});
+  add("line", {x1: x(0), y1: y(0), x2: x(0), y2: y(ymax), stroke: "#222"});
+  Array.from(new Set(xs)).forEach(function (node) {
+    add("text", {x: x(node), y: y(0) + 18, "text-anchor": "middle"}, node);
+  });
+  for (var i = 0; i <= 5; i++) {
+    var value = ymax * i / 5;
+    add("text", {x: x(0) - 6, y: y(value) + 4, "text-anchor": "end"}, value.toFixed(0));
+  }
+  add("text", {x: width / 2, y: height - 10, "text-anchor": "middle"},
+      "Number of nodes");
+  add("text", {x: 14, y: height / 2, transform: "rotate(-90 14 " + height / 2 + ")",
+               "text-anchor": "middle"}, data.performance_name);
+  var legend = document.getElementById("legend");
+  curves.forEach(function (curve, index) {
+    var color = colors[index % colors.length], points = [];
+    curve.nodes.forEach(function (node, j) {
+      if (curve.performance[j] === null) return;
+      points.push(x(node) + "," + y(curve.performance[j]));
+      add("circle", {cx: x(node), cy: y(curve.performance[j]), r: 4, fill: color});
+    });
+    add("polyline", {points: points.join(" "), fill: "none", stroke: color});
+    legend.innerHTML += '<span><i style="background:' + color + '"></i></span>';
+    legend.lastChild.appendChild(document.createTextNode(curve.label));
+  });
+}
+
+function efficiencyTable(target, curves) {
+  var nodes = [];
+  curves.forEach(function (curve) { nodes = nodes.concat(curve.nodes); });
+  nodes = Array.from(new Set(nodes)).sort(function (a, b) { return a - b; });
+  var columns = [{key: "label", name: "Benchmark"}].concat(nodes.map(function (n) {
+    return {key: n, name: n + (n === 1 ? " node" : " nodes")};
+  }));
+  var rows = curves.map(function (curve) {
+    var row = {label: curve.label};
+    nodes.forEach(function (n) { row[n] = null; });
+    curve.nodes.forEach(function (n, j) { row[n] = curve.efficiency[j]; });
+    return row;
+  });
+  table(target, columns, rows);
+}
+
+if (data.recommendations.length) {
+  table("recommendations", data.columns, data.recommendations);
+} else {
+  document.getElementById("recommendations").textContent =
+    "No benchmark reached the minimal parallel efficiency.";
+}
+chart("scaling", data.curves);
+efficiencyTable("efficiency", data.curves);
+table("results", data.columns, data.rows);
+if (data.replicas.rows.length) {
+  table("replicas", data.replicas.columns, data.replicas.rows);
+} else {
+  document.getElementById("replica-section").style.display = "none";
+}
+</script>
+</body>
+</html>
+"""
+
+
+def scaling_efficiency(df, columns, performance_column):
+    """Add the performance per node and the parallel efficiency of benchmarks.
+
+    The efficiency in percent is the performance per node relative to the
+    performance per node of the smallest finished node count of the same
+    group, i.e., of all benchmarks sharing the values in `columns`.
+    """
+    df = df.sort_values("nodes").copy()
+    performance = pd.to_numeric(df[performance_column], errors="coerce")
+    per_node = performance / df["nodes"]
+    reference = per_node.groupby(
+        [df[c] for c in columns], dropna=False, sort=False
+    ).transform("first")
+
+    df["performance_per_node"] = per_node.round(3)
+    df["efficiency"] = (100 * per_node / reference).round(1)
+
+    return df.sort_index()
+
+
+def recommend(df, performance_column, min_efficiency=70):
+    """Return the fastest benchmark of every host that scales efficiently.
+
+    Only benchmarks with a parallel efficiency of at least `min_efficiency`
+    percent are considered, see `scaling_efficiency`.
+    """
+    candidates = df[df["efficiency"] >= min_efficiency]
+    candidates = candidates.dropna(subset=[performance_column])
+    best = candidates.groupby("host", sort=True)[performance_column].idxmax()
+
+    return candidates.loc[best.values].reset_index(drop=True)
+
+
+def group_curves(df, columns, mapping, performance_column):
+    """Return the scaling curve of every group of benchmarks.
+
+    Groups share the values in `columns`. Their labels only list the columns
+    whose values differ between groups.
+    """
+    varying = [c for c in columns if df[c].nunique(dropna=False) > 1]
+    curves = []
+    for key, group in df.groupby(columns, dropna=False, sort=True):
+        if group[performance_column].isnull().all():
+            continue
+        if not isinstance(key, tuple):
+            key = (key,)
+        values = dict(zip(columns, key))
+        label = ", ".join(
+            "{}: {}".format(mapping.get(c, c), values[c]) for c in varying
+        )
+
+        group = group.sort_values("nodes")
+        curves.append(
+            {
+                "label": label or str(values.get("module", "")),
+                "nodes": group["nodes"].tolist(),
+                "performance": _json_values(group[performance_column]),
+                "efficiency": _json_values(group["efficiency"]),
+            }
+        )
+
+    return curves
+
+
+def _json_values(series):
+    return [None if pd.isnull(v) else float(v) for v in series]
+
+
+def _records(df, columns):
+    """Return the rows of `df` as JSON compatible dictionaries."""
+    return json.loads(df[columns].to_json(orient="records"))
+
+
+def report_data(
+    df, columns, mapping, performance_column, min_efficiency=70, replicas=None
+):
+    """Collect all data shown in the report.
+
+    `columns` are the printed columns of `df`, `mapping` maps them to human
+    readable names. `replicas` is an optional DataFrame with one row per
+    replica, see `mdbenchmark.stats.replicas_long_format`.
+    """
+    recommendations = recommend(df, performance_column, min_efficiency)
+    group_columns = [
+        c
+        for c in columns
+        if c not in ["nodes", "ncores", performance_column]
+        and c not in REPORT_MAPPING
+        and not c.startswith(performance_column + "_")
+    ]
+
+    data = {
+        "performance_name": mapping.get(performance_column, performance_column),
+        "columns": [{"key": c, "name": mapping.get(c, c)} for c in columns],
+        "rows": _records(df, columns),
+        "recommendations": _records(recommendations, columns),
+        "curves": group_curves(df, group_columns, mapping, performance_column),
+        "replicas": {"columns": [], "rows": []},
+    }
+    if replicas is not None and not replicas.empty:
+        data["replicas"] = {
+            "columns": [
+                {"key": c, "name": mapping.get(c, c)} for c in replicas.columns
+            ],
+            "rows": _records(replicas, list(replicas.columns)),
+        }
+
+    return data
+
+
+def render_report(data, title, version, date):
+    """Return a self-contained HTML report of `data`.
+
+    The data is embedded as compact JSON and rendered in the browser.
+    """
+    # A closing tag in the data would end the script element early
+    embedded = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+    template = Environment(autoescape=True).from_string(REPORT_TEMPLATE)
+    return template.render(
+        title=title, version=version, date=date, data=Markup(embedded)
+    )
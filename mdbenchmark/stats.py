@@ -0,0 +1,177 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import numpy as np
+import pandas as pd
+
+STATISTICS = ["std", "min", "max", "ci_low", "ci_high", "repeats"]
+
+
+def bootstrap_confidence_interval(
+    values, confidence=0.95, resamples=1000, random_state=None
+):
+    """Compute a percentile bootstrap confidence interval of the mean.
+
+    Parameters
+    ----------
+    values : array_like
+        Performance values of all repeats. NaN values are ignored.
+    confidence : float
+        Confidence level of the interval.
+    resamples : int
+        Number of bootstrap resamples.
+    random_state : int
+        Seed for the random number generator, to get reproducible intervals.
+
+    Returns
+    -------
+    (float, float)
+        Lower and upper bound of the interval, or NaN if there are no values.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+
+    if values.size == 0:
+        return np.nan, np.nan
+    if values.size == 1:
+        return values[0], values[0]
+
+    rng = np.random.default_rng(random_state)
+    samples = rng.choice(values, size=(resamples, values.size), replace=True)
+    means = samples.mean(axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+
+    return low, high
+
+
+def summarize_replicas(df):
+    """Add per-replica statistics to a DataFrame with a `replicas` column.
+
+    The `replicas` column holds lists of `(replica, performance)` tuples, as
+    returned by `parse_bundle(..., with_replicas=True)`. We add the number of
+    replicas, the number of failed replicas, the performance of the slowest and
+    fastest replica and the imbalance ratio, i.e., the fastest divided by the
+    slowest performance. Minimum, maximum and imbalance only consider finished
+    replicas.
+    """
+    df = df.copy()
+    summary = []
+    for replicas in df["replicas"]:
+        performance = np.array([p for _, p in replicas], dtype=float)
+        finished = performance[np.isfinite(performance)]
+        summary.append(
+            [
+                performance.size,
+                performance.size - finished.size,
+                finished.min() if finished.size else np.nan,
+                finished.max() if finished.size else np.nan,
+                finished.max() / finished.min() if finished.size else np.nan,
+            ]
+        )
+
+    summary = pd.DataFrame(
+        summary,
+        index=df.index,
+        columns=[
+            "replicas",
+            "replicas_failed",
+            "replica_min",
+            "replica_max",
+            "replica_imbalance",
+        ],
+    )
+    return pd.concat([df.drop(columns="replicas"), summary], axis=1)
+
+
+def replicas_long_format(df, columns):
+    """Return one row per replica with its performance.
+
+    `columns` are taken over from each benchmark to identify the replicas.
+    """
+    long = df[list(columns) + ["replicas"]].explode("replicas")
+    long = long.dropna(subset=["replicas"])
+    long["replica"] = [r[0] for r in long["replicas"]]
+    long["replica_performance"] = [r[1] for r in long["replicas"]]
+
+    return long.drop(columns="replicas").reset_index(drop=True)
+
+
+def _first_valid(values):
+    """Return the first value of a Series that is not missing."""
+    valid = values.dropna()
+    return valid.iloc[0] if not valid.empty else values.iloc[0]
+
+
+def aggregate_repeats(
+    df, columns, performance_column, confidence=0.95, measured_columns=()
+):
+    """Aggregate repeated benchmarks of the same configuration.
+
+    All rows sharing the values in `columns` are considered repeats. The mean
+    performance replaces `performance_column`, while the standard deviation,
+    minimum, maximum, bootstrap confidence interval and number of finished
+    repeats are added as `<performance_column>_<statistic>` columns. Other
+    numerical values measured for each repeat are listed in `measured_columns`
+    and averaged. All remaining columns describe the configuration, e.g., the
+    number of cores, and take their first value that is not missing.
+    """
+    other_columns = [
+        c for c in df.columns if c not in columns and c != performance_column
+    ]
+    rows = []
+    for key, group in df.groupby(columns, dropna=False, sort=False):
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        values = group[performance_column].astype(float)
+        finished = values.dropna()
+        ci_low, ci_high = bootstrap_confidence_interval(
+            finished, confidence=confidence, random_state=0
+        )
+
+        rows.append(
+            list(key)
+            + [
+                (
+                    group[c].mean()
+                    if c in measured_columns and pd.api.types.is_numeric_dtype(group[c])
+                    else _first_valid(group[c])
+                )
+                for c in other_columns
+            ]
+            + [
+                finished.mean() if not finished.empty else np.nan,
+                finished.std(ddof=1) if finished.size > 1 else np.nan,
+                finished.min() if not finished.empty else np.nan,
+                finished.max() if not finished.empty else np.nan,
+                ci_low,
+                ci_high,
+                finished.size,
+            ]
+        )
+
+    statistics = ["{}_{}".format(performance_column, s) for s in STATISTICS]
+    aggregated = pd.DataFrame(
+        rows, columns=list(columns) + other_columns + [performance_column] + statistics
+    )
+
+    # Restore the original column order and append the statistics
+    original = [c for c in df.columns if c in aggregated.columns]
+    return aggregated[original + statistics]
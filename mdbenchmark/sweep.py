@@ -0,0 +1,268 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import json
+
+import pandas as pd
+
+
+def convert_value(value):
+    """Convert a string into a bool, int or float, if possible."""
+    value = value.strip()
+    if value.lower() in ["true", "false"]:
+        return value.lower() == "true"
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
+class Sweep:
+    """Declarative sweep over benchmark parameters.
+
+    Dimensions are combined as a cartesian product in the order they were
+    added. Zipped dimensions vary together. The values of a dimension can be a
+    function of the values chosen for the dimensions before it. Derived values
+    are computed for each combination before constraints drop unwanted
+    combinations, so constraints can use derived values, but derived values
+    cannot be swept. All combinations are created lazily.
+    """
+
+    def __init__(self, constants=None):
+        self.constants = dict(constants or {})
+        self._dimensions = []
+        self._derived = []
+        self._constraints = []
+
+    @property
+    def dimensions(self):
+        """Return the names of all dimensions in the order they are iterated."""
+        return [name for names, _ in self._dimensions for name in names]
+
+    def _position(self, names):
+        """Remove the dimensions `names` and return the position of the first."""
+        derived = [name for name, _ in self._derived if name in names]
+        if derived:
+            raise ValueError(
+                "Cannot sweep over {}, because it is derived from other "
+                "dimensions.".format(", ".join(derived))
+            )
+        positions = [
+            i
+            for i, (group, _) in enumerate(self._dimensions)
+            if set(group) & set(names)
+        ]
+        for i in reversed(positions):
+            group, _ = self._dimensions[i]
+            if not set(group) <= set(names):
+                raise ValueError(
+                    "Cannot replace part of the zipped dimensions {}.".format(
+                        ", ".join(group)
+                    )
+                )
+            del self._dimensions[i]
+
+        return positions[0] if positions else len(self._dimensions)
+
+    def add(self, name, values):
+        """Add a dimension, replacing an existing dimension of the same name.
+
+        `values` is either an iterable or a function that receives the values
+        of all previous dimensions as a dictionary and returns an iterable.
+        """
+        if not callable(values):
+            values = list(values)
+        self._dimensions.insert(self._position([name]), ((name,), values))
+        return self
+
+    def zip(self, **dimensions):
+        """Add dimensions whose values vary together."""
+        values = [list(v) for v in dimensions.values()]
+        if len({len(v) for v in values}) > 1:
+            raise ValueError(
+                "Zipped dimensions must have the same number of values: {}.".format(
+                    ", ".join(dimensions)
+                )
+            )
+        names = tuple(dimensions)
+        self._dimensions.insert(self._position(names), (names, list(zip(*values))))
+        return self
+
+    def derive(self, name, function):
+        """Compute the value of `name` from each combination."""
+        if name in self.dimensions:
+            raise ValueError(
+                "Cannot derive {}, because it is already a dimension.".format(name)
+            )
+        self._derived.append((name, function))
+        return self
+
+    def constrain(self, constraint):
+        """Only keep combinations that fulfill `constraint`.
+
+        The constraint is either a function that receives a combination as a
+        dictionary, or a Python expression using the dimension names, e.g.,
+        ``"pme_ranks < number_of_ranks"``.
+        """
+        if isinstance(constraint, str):
+            code = compile(constraint, "<constraint>", "eval")
+
+            def check(row, code=code):
+                return eval(code, {"__builtins__": {}}, dict(row))
+
+            constraint = check
+
+        self._constraints.append(constraint)
+        return self
+
+    def _combinations(self, row, dimensions):
+        if not dimensions:
+            yield row
+            return
+
+        (names, values), remaining = dimensions[0], dimensions[1:]
+        if callable(values):
+            values = values(row)
+        for value in values:
+            if len(names) == 1:
+                value = (value,)
+            yield from self._combinations({**row, **dict(zip(names, value))}, remaining)
+
+    def __iter__(self):
+        for row in self._combinations(dict(self.constants), self._dimensions):
+            for name, function in self._derived:
+                row[name] = function(row)
+            if all(constraint(row) for constraint in self._constraints):
+                yield row
+
+    def to_dataframe(self, columns=None):
+        """Return all combinations as a DataFrame with inferred column types."""
+        df = pd.DataFrame.from_records(list(self), columns=columns)
+        return df.infer_objects()
+
+    def apply(self, spec):
+        """Apply a sweep specification, see `load_sweep_spec`."""
+        for name, values in spec.get("parameters", {}).items():
+            self.add(name, values)
+        for dimensions in spec.get("zip", []):
+            self.zip(**dimensions)
+        for constraint in spec.get("constraints", []):
+            self.constrain(constraint)
+        return self
+
+
+def parse_sweep_options(options):
+    """Parse ``key=v1,v2`` options into the parameters of a sweep specification.
+
+    Raises
+    ------
+    ValueError
+        If an option is not of the form ``key=v1,v2``.
+    """
+    parameters = {}
+    for option in options:
+        name, separator, values = option.partition("=")
+        if not separator or not name.strip() or not values.strip():
+            raise ValueError(
+                "Sweep options must be given as key=v1,v2, not '{}'.".format(option)
+            )
+        parameters[name.strip()] = [convert_value(v) for v in values.split(",")]
+
+    return {"parameters": parameters}
+
+
+def read_spec_file(filename):
+    """Return the content of a YAML or JSON file.
+
+    YAML files need PyYAML to be installed, JSON files are read with the
+    standard library if PyYAML is missing.
+
+    Raises
+    ------
+    ValueError
+        If the file cannot be parsed.
+    """
+    with open(filename) as fh:
+        content = fh.read()
+
+    try:
+        import yaml
+    except ImportError:
+        if not filename.endswith(".json"):
+            raise ValueError("PyYAML is needed to read {}.".format(filename))
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise ValueError("Cannot read {}: {}".format(filename, e))
+
+    try:
+        return yaml.safe_load(content)
+    except yaml.YAMLError as e:
+        raise ValueError("Cannot read {}: {}".format(filename, e))
+
+
+def load_sweep_spec(filename):
+    """Load a sweep specification from a YAML or JSON file.
+
+    The specification can contain the keys ``parameters``, a mapping of
+    dimension names to their values, ``zip``, a list of such mappings whose
+    values vary together, and ``constraints``, a list of Python expressions.
+    YAML files need PyYAML to be installed.
+
+    Raises
+    ------
+    ValueError
+        If the file cannot be read as a sweep specification.
+    """
+    spec = read_spec_file(filename)
+
+    if not isinstance(spec, dict) or set(spec) - {"parameters", "zip", "constraints"}:
+        raise ValueError(
+            "A sweep specification may only contain parameters, zip and constraints."
+        )
+
+    parameters = {
+        name: values if isinstance(values, list) else [values]
+        for name, values in (spec.get("parameters") or {}).items()
+    }
+    return {
+        "parameters": parameters,
+        "zip": spec.get("zip") or [],
+        "constraints": spec.get("constraints") or [],
+    }
+
+
+def merge_sweep_specs(*specs):
+    """Merge sweep specifications. Later parameters take precedence."""
+    merged = {"parameters": {}, "zip": [], "constraints": []}
+    for spec in specs:
+        merged["parameters"].update(spec.get("parameters", {}))
+        merged["zip"].extend(spec.get("zip", []))
+        merged["constraints"].extend(spec.get("constraints", []))
+    return merged
+
+
+def sweep_parameters(spec):
+    """Return the names of all dimensions of a sweep specification."""
+    names = list(spec.get("parameters", {}))
+    for dimensions in spec.get("zip", []):
+        names.extend(n for n in dimensions if n not in names)
+    return names
@@ -0,0 +1,104 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import json
+
+import numpy as np
+
+TELEMETRY_COLUMNS = [
+    "warmup",
+    "sampled_performance",
+    "performance_variation",
+    "cpu_usage",
+    "memory_usage",
+    "gpu_usage",
+]
+
+
+def read_telemetry(filename):
+    """Return all records of a telemetry file written by `mdbenchmark.monitor`.
+
+    Lines that cannot be parsed, e.g., the last line written before the
+    sampler was killed, are skipped.
+    """
+    records = []
+    with open(filename) as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "time" in record:
+                records.append(record)
+    return records
+
+
+def warmup_time(times, performance, tolerance=0.1):
+    """Return the time at which the benchmark reached its steady state.
+
+    The steady state is the median performance of the second half of all
+    samples. The warm-up ends with the first sample after the last sample of
+    the first half that deviates by more than `tolerance` from it.
+    """
+    times = np.asarray(times, dtype=float)
+    performance = np.asarray(performance, dtype=float)
+    if performance.size < 2:
+        return np.nan
+
+    half = performance.size // 2
+    steady = np.median(performance[half:])
+    outside = np.abs(performance[:half] - steady) > tolerance * steady
+    if not outside.any():
+        return times[0]
+    return times[np.flatnonzero(outside)[-1] + 1]
+
+
+def _mean(records, key):
+    values = [r[key] for r in records if r.get(key) is not None]
+    return round(float(np.mean(values)), 1) if values else np.nan
+
+
+def summarize_telemetry(records, tolerance=0.1):
+    """Summarize the telemetry records of a single benchmark.
+
+    Returns the warm-up time in seconds, the mean sampled performance after
+    the warm-up and its coefficient of variation in percent, and the mean CPU,
+    memory and GPU utilization after the warm-up. Missing values are NaN.
+    """
+    samples = [r for r in records if r.get("ns_per_day") is not None]
+    times = [r["time"] for r in samples]
+    performance = np.array([r["ns_per_day"] for r in samples], dtype=float)
+
+    warmup = warmup_time(times, performance, tolerance=tolerance)
+    summary = dict.fromkeys(TELEMETRY_COLUMNS, np.nan)
+    summary["warmup"] = warmup
+
+    if np.isfinite(warmup):
+        steady = performance[np.asarray(times) >= warmup]
+        summary["sampled_performance"] = round(steady.mean(), 3)
+        if steady.size > 1:
+            summary["performance_variation"] = round(
+                100 * steady.std(ddof=1) / steady.mean(), 1
+            )
+        records = [r for r in records if r["time"] >= warmup]
+
+    for key in ["cpu", "memory", "gpu"]:
+        summary["{}_usage".format(key)] = _mean(records, key)
+
+    return summary
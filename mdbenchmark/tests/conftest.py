@@ -61,3 +61,11 @@ def data(request):
     """access test directory in a pytest. This works independent of where tests are
     started"""
     return TestDataDir(request.fspath.dirname, "data")
+
+
+@pytest.fixture(autouse=True)
+def module_cache(monkeypatch, tmp_path):
+    """Keep the module index of the tests out of the user's cache folder."""
+    filename = str(tmp_path / "cache" / "modules.json")
+    monkeypatch.setattr("mdbenchmark.mdengines.MODULE_CACHE", filename)
+    return filename
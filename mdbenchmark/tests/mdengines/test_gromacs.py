@@ -103,6 +103,30 @@ def test_analyze_benchmark_backward_compatibility(sim_old):
     assert np.isnan(res[6])  # ncores
 
 
+def test_analyze_benchmark_mdrun_options(sim):
+    """Test that the mdrun options default to auto for older benchmarks."""
+    res = utils.analyze_benchmark(gromacs, sim)
+    assert res[-7:] == [-1, -1, "auto", "auto", "auto", "auto", "auto"]
+
+    sim.categories["pme_ranks"] = 2
+    sim.categories["gpus_per_rank"] = 0.5
+    sim.categories["mdrun_pme"] = "gpu"
+    res = utils.analyze_benchmark(gromacs, sim)
+    assert res[-7:] == [2, 0.5, "auto", "gpu", "auto", "auto", "auto"]
+
+
+def test_prepare_mdrun_options():
+    """Test the mdrun command line options of a benchmark."""
+    assert gromacs.prepare_mdrun_options(2, -1, {}) == ""
+    assert gromacs.prepare_mdrun_options(2, 0, {}) == "-npme 0"
+    assert (
+        gromacs.prepare_mdrun_options(
+            4, 2, {"mdrun_nb": "gpu", "mdrun_pme": "auto", "mdrun_dlb": "no"}
+        )
+        == "-npme 8 -nb gpu -dlb no"
+    )
+
+
 @pytest.mark.parametrize("input_name", ["md", "md.tpr"])
 @pytest.mark.skip()
 def test_check_file_extension(capsys, input_name, tmpdir):
@@ -121,3 +145,74 @@ def test_check_file_extension(capsys, input_name, tmpdir):
             fh.write("dummy file")
 
         assert gromacs.check_input_file_exists(input_name)
+
+
+@pytest.fixture
+def detailed_log():
+    return StringIO(
+        """Command line:
+  gmx_mpi mdrun -v -nb gpu -pme cpu -npme 2 -deffnm md
+
+On host dra0001 2 GPUs selected for this run.
+Changing nstlist from 10 to 80, rlist from 1 to 1.118
+
+     R E A L   C Y C L E   A N D   T I M E   A C C O U N T I N G
+
+On 8 MPI ranks doing PP, each using 4 OpenMP threads, and
+on 2 MPI ranks doing PME, each using 4 OpenMP threads
+
+ Computing:          Num   Num      Call    Wall time         Giga-Cycles
+                     Ranks Threads  Count      (s)         total sum    %
+-----------------------------------------------------------------------------
+ Domain decomp.         8    4        126       1.000        100.000   2.0
+ Neighbor search        8    4        126       2.000        200.000   4.0
+ Launch GPU ops.        8    4      20002       5.000        500.000  10.0
+ Force                  8    4      10001      10.000       1000.000  20.0
+ Wait + Comm. F         8    4      10001       3.000        300.000   6.0
+ PME mesh               2    4      10001      15.000       1500.000  30.0
+ PME wait for PP        2    4                  4.000        400.000   8.0
+ Wait GPU NB local      8    4      10001       1.000        100.000   2.0
+ Comm. coord.           8    4       9875       2.000        200.000   4.0
+ Rest                                           7.000        700.000  14.0
+-----------------------------------------------------------------------------
+ Total                                         50.000       5000.000 100.0
+-----------------------------------------------------------------------------
+ Breakdown of PME mesh computation
+-----------------------------------------------------------------------------
+ PME 3D-FFT             2    4      20002       5.000        500.000  10.0
+-----------------------------------------------------------------------------
+
+ Average load imbalance: 12.5%.
+ Part of the total run time spent waiting due to load imbalance: 3.1%.
+ Average PME mesh/force load: 0.845
+               Core t (s)   Wall t (s)        (%)
+       Time:     1600.000       50.000     3200.0
+                 (ns/day)    (hour/ns)
+Performance:      123.450        0.194
+"""
+    )
+
+
+def test_parse_log_details(detailed_log):
+    """Test that the cycle accounting and load balancing details are parsed."""
+    details = gromacs.parse_log_details(detailed_log)
+
+    assert details == {
+        "nb": "gpu",
+        "pme": "cpu",
+        "npme": "2",
+        "gpus": 2,
+        "nstlist": 80,
+        "domain_decomposition": 2.0,
+        "neighbor_search": 4.0,
+        "force": 30.0,
+        "pme_mesh": 30.0,
+        "comm_wait": 20.0,
+        "load_imbalance": 12.5,
+        "imbalance_wait": 3.1,
+        "pme_pp_load": 0.845,
+    }
+
+
+def test_parse_log_details_empty(empty_log):
+    assert gromacs.parse_log_details(empty_log) == {}
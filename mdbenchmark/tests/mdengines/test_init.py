@@ -255,3 +255,51 @@ def test_generate_validation(cli_runner, tmpdir, monkeypatch):
 
         assert result.exit_code == 1
         assert result.output == output
+
+
+def test_module_cache(monkeypatch, tmpdir, module_cache):
+    """Test that the module index is cached until a directory changes."""
+    with tmpdir.as_cwd():
+        os.makedirs(os.path.join("applications", "gromacs"))
+        open(os.path.join("applications", "gromacs", "2018.1"), "a").close()
+        monkeypatch.setenv("MODULEPATH", os.path.join(os.getcwd(), "applications"))
+
+        assert get_available_modules()["gromacs"] == ["2018.1"]
+        assert os.path.exists(module_cache)
+
+        # The cached index is used without walking the directories again
+        def fail(*args):
+            raise AssertionError("The module path was walked again.")
+
+        with monkeypatch.context() as m:
+            m.setattr("mdbenchmark.mdengines._walk_module_paths", fail)
+            assert get_available_modules()["gromacs"] == ["2018.1"]
+
+        # New modules change the modification time of their directory
+        open(os.path.join("applications", "gromacs", "2020.1"), "a").close()
+        os.utime(os.path.join("applications", "gromacs"), (0, 0))
+        assert sorted(get_available_modules()["gromacs"]) == ["2018.1", "2020.1"]
+
+
+def test_module_command(monkeypatch, tmpdir):
+    """Test that the output of the module command is parsed."""
+    with tmpdir.as_cwd():
+        with open("lmod", "w") as fh:
+            fh.write(
+                "#!/bin/sh\n"
+                "echo '/opt/modules:' >&2\n"
+                "echo 'gromacs/2018.1(default)' >&2\n"
+                "echo 'apps/namd/2.14' >&2\n"
+                "echo 'vmd/1.9.3' >&2\n"
+            )
+        os.chmod("lmod", 0o755)
+        monkeypatch.setenv("MODULEPATH", "/does/not/exist")
+        monkeypatch.setenv("LMOD_CMD", os.path.join(os.getcwd(), "lmod"))
+
+        # The module command is only used on request
+        assert get_available_modules()["gromacs"] == []
+
+        monkeypatch.setenv("MDBENCHMARK_MODULE_AVAIL", "1")
+        modules = get_available_modules()
+        assert modules["gromacs"] == ["2018.1"]
+        assert modules["namd"] == ["2.14"]
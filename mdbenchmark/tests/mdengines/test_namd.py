@@ -151,3 +151,46 @@ def test_analyze_namd_file(
                 namd.analyze_namd_file(fh)
                 out, _ = capsys.readouterr()
                 assert out == output
+
+
+@pytest.fixture
+def timing_log():
+    return StringIO(
+        """Info: TIMESTEP         2
+Info: Benchmark time: 4 CPUs 0.5 s/step 5.0 days/ns 1000.0 MB memory
+Info: Benchmark time: 4 CPUs 0.25 s/step 2.5 days/ns 1100.0 MB memory
+Info: Benchmark time: 4 CPUs 0.2 s/step 2.0 days/ns 1050.0 MB memory
+TIMING: 500  CPU: 150, 0.3/step  Wall: 150, 0.3/step, 0.1 hours remaining, 1200.0 MB of memory in use.
+TIMING: 1000  CPU: 250, 0.2/step  Wall: 250, 0.2/step, 0 hours remaining, 1150.0 MB of memory in use.
+TIMING: 1500  CPU: 350, 0.2/step  Wall: 350, 0.2/step, 0 hours remaining, 1150.0 MB of memory in use.
+"""
+    )
+
+
+def test_parse_ns_day_steady_state(timing_log):
+    """Test that the warm-up sample is excluded from the performance."""
+    assert utils.parse_ns_day(namd, timing_log) == np.median([1 / 2.5, 1 / 2.0])
+
+
+def test_parse_timings(timing_log):
+    timings = namd.parse_timings(timing_log)
+
+    assert timings["benchmark"] == [1 / 5.0, 1 / 2.5, 1 / 2.0]
+    assert timings["timing"] == [0.3, 0.2, 0.2]
+    assert timings["timestep"] == 2
+    assert max(timings["memory"]) == 1200.0
+
+
+def test_parse_log_details(timing_log):
+    details = namd.parse_log_details(timing_log)
+
+    assert details == {
+        "benchmark_samples": 3,
+        "timing_samples": 3,
+        "timing_performance": round(86400 * 2e-6 / 0.2, 3),
+        "peak_memory": 1200.0,
+    }
+
+
+def test_parse_log_details_empty(empty_log):
+    assert namd.parse_log_details(empty_log) == {}
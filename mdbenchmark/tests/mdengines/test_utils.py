@@ -23,7 +23,7 @@ from glob import glob
 import datreant as dtr
 import pytest
 
-from mdbenchmark.mdengines import gromacs, namd, utils
+from mdbenchmark.mdengines import gromacs, namd, rest2, utils
 from mdbenchmark.utils import retrieve_host_template
 
 
@@ -178,3 +178,98 @@ def test_cleanup_before_restart(engine, files_to_delete, files_to_keep, tmpdir):
 
     # Get rid of the `tmp` path and only compare the actual filenames
     assert files_to_keep == [x[len(str(tmp)) + 1 :] for x in files_found]
+
+
+def test_cleanup_benchmarks(tmpdir):
+    """Test the dry run and parallel cleanup of many benchmarks."""
+    benchmarks = []
+    for i in range(3):
+        tree = dtr.Tree(tmpdir.mkdir("bench{}".format(i)).strpath)
+        for f, content in [("md.tpr", "tpr"), ("md.log", "log"), ("md.cpt", "cpt!")]:
+            with open(os.path.join(tree.abspath, f), "w") as fh:
+                fh.write(content)
+        tree["rep01/"].make()
+        benchmarks.append((gromacs, tree))
+
+    files = utils.files_to_clean(gromacs, benchmarks[0][1].abspath)
+    assert [(os.path.basename(f), size) for f, size in files] == [
+        ("md.cpt", 4),
+        ("md.log", 3),
+    ]
+
+    # A dry run does not remove anything
+    assert utils.cleanup_benchmarks(benchmarks, dry_run=True) == (6, 21)
+    assert len(glob(os.path.join(tmpdir.strpath, "*", "md.*"))) == 9
+
+    assert utils.cleanup_benchmarks(benchmarks, max_workers=2) == (6, 21)
+    remaining = glob(os.path.join(tmpdir.strpath, "*", "*"))
+    assert sorted(os.path.basename(f) for f in remaining) == ["md.tpr"] * 3 + [
+        "rep01"
+    ] * 3
+
+
+def test_files_to_clean_namd(tmpdir):
+    """Test that NAMD outputs are removed, even below a `*_namd` directory."""
+    tree = dtr.Tree(tmpdir.mkdir("draco_namd").mkdir("n001").strpath)
+    for f in ["bench.out", "nodelist", "bench.job", "md.namd", "md.pdb", "md.psf"]:
+        open(os.path.join(tree.abspath, f), "a").close()
+
+    files = utils.files_to_clean(namd, tree.abspath)
+    assert [os.path.basename(f) for f, _ in files] == ["bench.out", "nodelist"]
+
+    utils.cleanup_before_restart(namd, tree)
+    assert sorted(os.listdir(tree.abspath)) == [
+        "bench.job",
+        "md.namd",
+        "md.pdb",
+        "md.psf",
+    ]
+
+
+@pytest.mark.parametrize("engine", (gromacs, namd, rest2))
+def test_files_to_clean_keeps_monitor(engine, tmpdir):
+    """Test that the monitor script survives a forced restart of every engine."""
+    tree = dtr.Tree(tmpdir.mkdir("draco_{}".format(engine.NAME)).strpath)
+    for f in ["bench.job", utils.MONITOR_SCRIPT, "telemetry.jsonl"]:
+        open(os.path.join(tree.abspath, f), "a").close()
+
+    files = utils.files_to_clean(engine, tree.abspath)
+    assert [os.path.basename(f) for f, _ in files] == ["telemetry.jsonl"]
+
+
+def test_hash_input_files(tmpdir):
+    """Test that only the input files of a benchmark are hashed."""
+    for engine, inputs, outputs in [
+        (namd, ["md.namd", "md.pdb", "md.psf"], ["bench.out", "nodelist"]),
+        (gromacs, ["md.tpr"], ["md.log", "telemetry.jsonl"]),
+    ]:
+        tree = dtr.Tree(tmpdir.mkdir("draco_{}".format(engine.NAME)).strpath)
+        for f in inputs + ["bench.job"]:
+            with open(os.path.join(tree.abspath, f), "w") as fh:
+                fh.write(f)
+
+        expected = utils.hash_input_files(engine, tree)
+        for f in outputs:
+            with open(os.path.join(tree.abspath, f), "w") as fh:
+                fh.write("Performance: 12.3")
+        assert utils.hash_input_files(engine, tree) == expected
+
+        with open(os.path.join(tree.abspath, inputs[0]), "a") as fh:
+            fh.write("changed")
+        assert utils.hash_input_files(engine, tree) != expected
+
+
+def test_collect_hostnames(tmpdir):
+    """Test that hostnames are read from log files and the nodelist."""
+    with tmpdir.as_cwd():
+        benchmark = dtr.Treant("benchmark")
+        with open(benchmark["bench.log"].relpath, "w") as fh:
+            fh.write("Host: dra0025  pid: 1025  rank ID: 0  number of ranks:  64\n")
+        with open(benchmark[utils.NODELIST_FILE].relpath, "w") as fh:
+            fh.write("dra[0025-0026]\n")
+
+        hostnames = utils.collect_hostnames(gromacs, benchmark)
+
+        assert hostnames == ["dra0025", "dra0026"]
+        with open(benchmark["bench.log"].relpath) as fh:
+            assert utils.parse_hostnames(namd, fh) == []
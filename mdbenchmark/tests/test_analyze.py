@@ -17,6 +17,9 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+
 import datreant as dtr
 import numpy as np
 import pandas as pd
@@ -108,3 +111,369 @@ def test_analyze_console_messages(cli_runner, tmpdir):
         output = "Setting up...\nERROR There is no data for the given path.\n"
         assert result.exit_code == 1
         assert result.output == output
+
+
+def test_analyze_fit_model(cli_runner, tmpdir, data):
+    """Test that the scaling fit and predictions are printed."""
+    with tmpdir.as_cwd():
+        result = cli_runner.invoke(
+            cli,
+            [
+                "analyze",
+                "--directory={}".format(data["analyze-files-gromacs"]),
+                "--fit-model=amdahl",
+                "--predict-nodes=8,16",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Serial fraction" in result.output
+        assert "16 nodes (ns/day)" in result.output
+
+
+def test_analyze_predict_nodes_error(cli_runner, tmpdir, data):
+    """Test that we exit when the node counts cannot be parsed."""
+    with tmpdir.as_cwd():
+        result = cli_runner.invoke(
+            cli,
+            [
+                "analyze",
+                "--directory={}".format(data["analyze-files-gromacs"]),
+                "--fit-model=amdahl",
+                "--predict-nodes=eight",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "--predict-nodes" in result.output
+
+
+def test_analyze_repeats(cli_runner, tmpdir, data):
+    """Test that repeated benchmarks are aggregated."""
+    with tmpdir.as_cwd():
+        for repeat, log in enumerate(["1", "1", "2"], start=1):
+            treant = dtr.Treant("rep{}".format(repeat))
+            treant.categories = {
+                "module": "gromacs/2016.3",
+                "gpu": False,
+                "nodes": 1,
+                "host": "draco",
+                "time": 15,
+                "name": "bench",
+                "started": True,
+                "ranks": 32,
+                "threads": 1,
+                "hyperthreading": False,
+                "version": 3,
+                "multidir": 1,
+                "temprange": "300,500",
+                "repeat": repeat,
+            }
+            with open(os.path.join(data["analyze-files-gromacs"], log, "bench.log")) as fh:
+                content = fh.read()
+            with open(treant["bench.log"].relpath, "w") as fh:
+                fh.write(content)
+
+        result = cli_runner.invoke(cli, ["analyze", "--save-csv=results.csv"])
+
+        assert result.exit_code == 0
+        df = pd.read_csv("results.csv")
+        assert df.shape[0] == 1
+        assert df["performance_repeats"].iloc[0] == 3
+        assert df["performance_min"].iloc[0] == 98.147
+        assert df["performance_max"].iloc[0] == 178.044
+
+
+def test_analyze_repeats_gpus_per_rank(cli_runner, tmpdir, data):
+    """Test that layouts differing only in their GPU sharing are kept apart."""
+    with tmpdir.as_cwd():
+        for repeat, gpus_per_rank in enumerate([0.5, 0.5, 0.25], start=1):
+            treant = dtr.Treant("rep{}".format(repeat))
+            treant.categories = {
+                "module": "gromacs/2016.3",
+                "gpu": True,
+                "nodes": 1,
+                "host": "draco",
+                "time": 15,
+                "name": "bench",
+                "started": True,
+                "ranks": 4,
+                "threads": 8,
+                "hyperthreading": False,
+                "version": 3,
+                "multidir": 1,
+                "repeat": repeat,
+                "gpus_per_rank": gpus_per_rank,
+            }
+            with open(os.path.join(data["analyze-files-gromacs"], "1", "bench.log")) as fh:
+                content = fh.read()
+            with open(treant["bench.log"].relpath, "w") as fh:
+                fh.write(content)
+
+        result = cli_runner.invoke(cli, ["analyze", "--save-csv=results.csv"])
+
+        assert result.exit_code == 0
+        df = pd.read_csv("results.csv")
+        assert df.sort_values("gpus_per_rank")["performance_repeats"].tolist() == [1, 2]
+
+
+def test_analyze_detect_outliers(cli_runner, tmpdir, data):
+    """Test that slow benchmarks and their nodes are reported."""
+    with tmpdir.as_cwd():
+        for repeat, nodelist in enumerate(["dra0001", "dra0002", "dra0003"], start=1):
+            treant = dtr.Treant("rep{}".format(repeat))
+            treant.categories = {
+                "module": "gromacs/2016.3",
+                "gpu": False,
+                "nodes": 1,
+                "host": "draco",
+                "time": 15,
+                "name": "bench",
+                "started": True,
+                "ranks": 32,
+                "threads": 1,
+                "hyperthreading": False,
+                "version": 3,
+                "multidir": 1,
+                "temprange": "300,500",
+                "repeat": repeat,
+            }
+            with open(os.path.join(data["analyze-files-gromacs"], "1", "bench.log")) as fh:
+                content = fh.read()
+            if repeat == 3:
+                content = content.replace("98.147", "50.000")
+            with open(treant["bench.log"].relpath, "w") as fh:
+                fh.write(content)
+            with open(treant["nodelist"].relpath, "w") as fh:
+                fh.write(nodelist)
+
+        result = cli_runner.invoke(cli, ["analyze", "--detect-outliers"])
+
+        assert result.exit_code == 0
+        assert "Found 1 outliers" in result.output
+        assert "dra0003, dra0479" in result.output
+        assert "Slowness" in result.output
+
+
+def test_analyze_log_details(cli_runner, tmpdir, data):
+    """Test that details parsed from the log files are saved as columns."""
+    with tmpdir.as_cwd():
+        treant = dtr.Treant("benchmark")
+        treant.categories = {
+            "module": "gromacs/2016.3",
+            "gpu": False,
+            "nodes": 1,
+            "host": "draco",
+            "time": 15,
+            "name": "bench",
+            "started": True,
+            "ranks": 32,
+            "threads": 1,
+            "hyperthreading": False,
+            "version": 3,
+            "multidir": 1,
+            "temprange": "300,500",
+        }
+        with open(os.path.join(data["analyze-files-gromacs"], "1", "bench.log")) as fh:
+            content = fh.read()
+        with open(treant["bench.log"].relpath, "w") as fh:
+            fh.write(content + " Average load imbalance: 12.5%.\n")
+
+        result = cli_runner.invoke(
+            cli, ["analyze", "--log-details", "--save-csv=results.csv"]
+        )
+
+        assert result.exit_code == 0
+        df = pd.read_csv("results.csv")
+        assert df["load_imbalance"].tolist() == [12.5]
+        assert df["performance"].tolist() == [98.147]
+
+
+def test_analyze_replicas(cli_runner, tmpdir, data):
+    """Test the per-replica breakdown of multidir benchmarks."""
+    with tmpdir.as_cwd():
+        treant = dtr.Treant("benchmark")
+        treant.categories = {
+            "module": "gromacs/2016.3",
+            "gpu": False,
+            "nodes": 1,
+            "host": "draco",
+            "time": 15,
+            "name": "bench",
+            "started": True,
+            "ranks": 32,
+            "threads": 1,
+            "hyperthreading": False,
+            "version": 3,
+            "multidir": 2,
+            "temprange": "300,500",
+        }
+        with open(os.path.join(data["analyze-files-gromacs"], "1", "bench.log")) as fh:
+            content = fh.read()
+        for replica in ["rep01", "rep02"]:
+            os.mkdir(os.path.join(treant.relpath, replica))
+            with open(treant[replica + "/bench.log"].relpath, "w") as fh:
+                fh.write(content)
+
+        result = cli_runner.invoke(
+            cli, ["analyze", "--replicas", "--save-csv=results.csv"]
+        )
+
+        assert result.exit_code == 0
+        df = pd.read_csv("results.csv")
+        assert df["performance"].tolist() == [2 * 98.147]
+        assert df["replicas"].tolist() == [2]
+        assert df["replica_imbalance"].tolist() == [1.0]
+        replicas = pd.read_csv("results_replicas.csv")
+        assert replicas["replica"].tolist() == ["rep01", "rep02"]
+        assert replicas["replica_performance"].tolist() == [98.147, 98.147]
+
+        # Only the finished replicas count towards the performance
+        with open(treant["rep02/bench.log"].relpath, "w") as fh:
+            fh.write("")
+
+        result = cli_runner.invoke(
+            cli, ["analyze", "--replicas", "--save-csv=results.csv"]
+        )
+
+        assert result.exit_code == 0
+        assert "1 benchmarks have replicas that did not finish" in result.output
+        df = pd.read_csv("results.csv")
+        assert df["performance"].tolist() == [98.147]
+        assert df["replicas"].tolist() == [2]
+        assert df["replicas_failed"].tolist() == [1]
+        assert df["replica_min"].tolist() == [98.147]
+
+        # Without any finished replica the performance is missing
+        with open(treant["rep01/bench.log"].relpath, "w") as fh:
+            fh.write("")
+
+        result = cli_runner.invoke(cli, ["analyze", "--save-csv=results.csv"])
+
+        assert result.exit_code == 0
+        assert "did not finish" not in result.output
+        df = pd.read_csv("results.csv")
+        assert df["performance"].isnull().all()
+
+
+def test_analyze_target_ns(cli_runner, tmpdir, data):
+    """Test the estimated resources to simulate a target length."""
+    with tmpdir.as_cwd():
+        result = cli_runner.invoke(
+            cli,
+            [
+                "analyze",
+                "--directory={}".format(data["analyze-files-gromacs"]),
+                "--target-ns=1000",
+                "--power-per-node=400",
+                "--save-csv=results.csv",
+            ],
+        )
+
+        assert result.exit_code == 0
+        df = pd.read_csv("results.csv")
+        wall_clock = 1000 / df["ns/day"] * 24
+        assert np.allclose(df["wall_clock_hours"], wall_clock, atol=0.01)
+        assert np.allclose(df["node_hours"], wall_clock * df["nodes"], atol=0.1)
+        assert np.allclose(
+            df["energy_kwh"], wall_clock * df["nodes"] * 0.4, atol=0.1
+        )
+
+
+def test_analyze_telemetry(cli_runner, tmpdir, data):
+    """Test that the telemetry sidecar of a benchmark is summarized."""
+    with tmpdir.as_cwd():
+        treant = dtr.Treant("benchmark")
+        treant.categories = {
+            "module": "gromacs/2016.3",
+            "gpu": False,
+            "nodes": 1,
+            "host": "draco",
+            "time": 15,
+            "name": "bench",
+            "started": True,
+            "ranks": 32,
+            "threads": 1,
+            "hyperthreading": False,
+            "version": 3,
+            "multidir": 1,
+            "temprange": "300,500",
+        }
+        with open(os.path.join(data["analyze-files-gromacs"], "1", "bench.log")) as fh:
+            content = fh.read()
+        with open(treant["bench.log"].relpath, "w") as fh:
+            fh.write(content)
+
+        result = cli_runner.invoke(cli, ["analyze", "--telemetry"])
+        assert result.exit_code == 0
+        assert "No telemetry was found." in result.output
+
+        with open(treant["telemetry.jsonl"].relpath, "w") as fh:
+            for time, performance in enumerate([50, 80, 100, 100, 100, 100]):
+                fh.write(
+                    '{{"time": {}, "step": {}, "ns_per_day": {}, "cpu": 90, '
+                    '"memory": 10, "gpu": null}}\n'.format(
+                        10 * time, 1000 * time, performance
+                    )
+                )
+            fh.write('{"time": 60, "st')
+
+        result = cli_runner.invoke(
+            cli, ["analyze", "--telemetry", "--save-csv=results.csv"]
+        )
+
+        assert result.exit_code == 0
+        df = pd.read_csv("results.csv")
+        assert df["warmup"].tolist() == [20]
+        assert df["sampled_performance"].tolist() == [100]
+        assert df["performance_variation"].tolist() == [0]
+        assert df["cpu_usage"].tolist() == [90]
+        assert df["gpu_usage"].isnull().all()
+
+
+def test_analyze_machine_readable(cli_runner, tmpdir, data):
+    """Test that results can be printed as CSV and JSON."""
+    with tmpdir.as_cwd():
+        result = cli_runner.invoke(
+            cli,
+            [
+                "analyze",
+                "--directory={}".format(data["analyze-files-gromacs"]),
+                "--format=json",
+                "--sort=nodes",
+                "--descending",
+                "--limit=2",
+                "--columns=module,nodes",
+            ],
+        )
+        assert result.exit_code == 0
+        rows = json.loads(result.stdout.splitlines()[-1])
+        assert [row["nodes"] for row in rows] == [5, 4]
+        assert list(rows[0]) == ["module", "nodes"]
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "analyze",
+                "--directory={}".format(data["analyze-files-gromacs"]),
+                "--format=csv",
+                "--columns=nodes",
+            ],
+        )
+        assert result.exit_code == 0
+        assert result.stdout.endswith("nodes\n1\n2\n3\n4\n5\n")
+
+
+def test_analyze_unknown_columns(cli_runner, tmpdir, data):
+    """Test that unknown columns are reported."""
+    with tmpdir.as_cwd():
+        result = cli_runner.invoke(
+            cli,
+            [
+                "analyze",
+                "--directory={}".format(data["analyze-files-gromacs"]),
+                "--sort=speed",
+            ],
+        )
+        assert result.exit_code == 1
+        assert "ERROR Unknown columns: speed." in result.output
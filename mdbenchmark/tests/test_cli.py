@@ -17,9 +17,31 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import subprocess
+import sys
 
+import pytest
+
+from mdbenchmark import cli
+
+# Libraries that should only be imported by the subcommands that need them
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "datreant", "jinja2", "psutil"]
+
+STARTUP_SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
 from mdbenchmark import cli
 
+try:
+    cli({arguments!r})
+except SystemExit:
+    pass
+print("elapsed:", time.perf_counter() - start, file=sys.stderr)
+print("imported:", *(m for m in {modules!r} if m in sys.modules), file=sys.stderr)
+"""
+
 
 def test_aliasedgroup_unknown_command(cli_runner):
     """Test that we return an error, when invoking an unknown command."""
@@ -37,3 +59,23 @@ def test_aliasedgroup_known_alias(cli_runner):
     """Test that we can use all defined aliases."""
     result = cli_runner.invoke(cli, ["start"])
     assert result.exit_code == 1
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [["--help"], ["generate", "--help"], ["submit", "--help"], ["plot", "--help"]],
+)
+def test_startup_is_lazy(arguments):
+    """Test that the help does not import heavy libraries and report the time."""
+    script = STARTUP_SCRIPT.format(arguments=arguments, modules=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    output = dict(line.partition(":")[::2] for line in result.stderr.splitlines())
+
+    print(
+        "Startup time of 'mdbenchmark {}': {:.3f} s".format(
+            " ".join(arguments), float(output["elapsed"])
+        )
+    )
+    assert output["imported"].split() == []
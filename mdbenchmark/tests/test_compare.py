@@ -0,0 +1,137 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import json
+import os
+
+import datreant as dtr
+import numpy as np
+import pandas as pd
+
+from mdbenchmark import cli
+from mdbenchmark.compare import (
+    bootstrap_change_interval,
+    classify_change,
+    compare_modules,
+)
+
+
+def test_bootstrap_change_interval():
+    """Test that the interval contains the change and needs repeats."""
+    low, high = bootstrap_change_interval(
+        [10, 10.2, 9.8], [8, 8.1, 7.9], random_state=0
+    )
+    assert low < -0.2 < high < 0
+
+    assert np.isnan(bootstrap_change_interval([10], [8, 8])).all()
+
+
+def test_classify_change():
+    """Test the classification of relative changes."""
+    assert classify_change(-0.1, np.nan, np.nan, 0.05) == "regression"
+    assert classify_change(-0.1, -0.3, 0.1, 0.05) == "unchanged"
+    assert classify_change(0.1, 0.05, 0.15, 0.05) == "improvement"
+    assert classify_change(-0.01, np.nan, np.nan, 0.05) == "unchanged"
+    assert classify_change(np.nan, np.nan, np.nan, 0.05) == "failed"
+
+
+def test_compare_modules():
+    """Test that identical layouts are lined up with the baseline module."""
+    df = pd.DataFrame(
+        {
+            "module": ["old", "old", "new", "new", "new"],
+            "nodes": [1, 2, 1, 2, 4],
+            "performance": [10.0, 20.0, 9.0, 21.0, 30.0],
+        }
+    )
+
+    comparison = compare_modules(
+        df, baseline="old", columns=["nodes"], performance_column="performance"
+    )
+
+    assert comparison["nodes"].tolist() == [1, 2]
+    np.testing.assert_allclose(comparison["change"], [-0.1, 0.05])
+    assert comparison["status"].tolist() == ["regression", "improvement"]
+    assert comparison["significant"].isnull().all()
+
+
+def write_benchmark(directory, module, performance):
+    treant = dtr.Treant(directory)
+    treant.categories = {
+        "module": module,
+        "gpu": False,
+        "nodes": 1,
+        "host": "draco",
+        "time": 15,
+        "name": "protein",
+        "started": True,
+        "ranks": 40,
+        "threads": 1,
+        "hyperthreading": False,
+        "version": 3,
+        "multidir": 1,
+        "repeat": int(directory[-1]),
+    }
+    with open(os.path.join(treant.relpath, "protein.log"), "w") as fh:
+        fh.write("Running on 1 node with total 40 cores\n")
+        fh.write("Performance:   {}   1.0\n".format(performance))
+
+
+def test_compare(cli_runner, tmpdir):
+    """Test that regressions are detected and saved."""
+    with tmpdir.as_cwd():
+        for i, performance in enumerate([10.0, 10.1, 9.9], start=1):
+            write_benchmark("old/rep{}".format(i), "gromacs/2023", performance)
+        for i, performance in enumerate([8.0, 8.1, 7.9], start=1):
+            write_benchmark("new/rep{}".format(i), "gromacs/2024", performance)
+
+        result = cli_runner.invoke(
+            cli,
+            ["compare", "--baseline=gromacs/2023", "--save-json=compare"],
+        )
+        assert result.exit_code == 0
+        assert "Found 1 regressions" in result.output
+
+        with open("compare.json") as fh:
+            comparison = json.load(fh)
+        assert len(comparison) == 1
+        assert comparison[0]["module"] == "gromacs/2024"
+        assert comparison[0]["status"] == "regression"
+        assert comparison[0]["significant"] is True
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "compare",
+                "--baseline=gromacs/2023",
+                "--threshold=25",
+                "--fail-on-regression",
+            ],
+        )
+        assert result.exit_code == 0
+        assert "Found no regressions" in result.output
+
+        result = cli_runner.invoke(
+            cli, ["compare", "--baseline=gromacs/2023", "--fail-on-regression"]
+        )
+        assert result.exit_code == 1
+
+        result = cli_runner.invoke(cli, ["compare", "--baseline=gromacs/2016"])
+        assert result.exit_code == 1
+        assert "There are no benchmarks of the baseline module" in result.output
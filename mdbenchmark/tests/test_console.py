@@ -73,3 +73,12 @@ def test_console_error():
     assert fh.getvalue() == "ERROR Does not compute.\n"
     assert error.type == SystemExit
     assert error.value.code == 1
+
+
+def test_redirect_messages():
+    """Test that messages can be redirected to another stream."""
+    fh = StringIO()
+    with console.redirect_messages(fh):
+        console.info("Moved elsewhere.")
+    assert fh.getvalue() == "Moved elsewhere.\n"
+    assert console.MESSAGE_FILE is None
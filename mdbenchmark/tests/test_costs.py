@@ -0,0 +1,69 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal
+
+from mdbenchmark import costs
+
+
+def test_node_power():
+    """Test the lookup of the power per node in the host metadata."""
+    df = pd.DataFrame(
+        {"host": ["draco", "draco", "cobra"], "use_gpu": [False, True, False]}
+    )
+    metadata = {
+        "draco": {"power_per_node": 300, "power_per_gpu_node": 800},
+        "cobra": {},
+    }
+
+    power = costs.node_power(df, metadata)
+    assert_equal(power.tolist()[:2], [300, 800])
+    assert np.isnan(power.iloc[2])
+
+    power = costs.node_power(df, metadata, power_per_node=500)
+    assert_equal(power.tolist(), [500, 500, 500])
+
+
+def test_time_to_solution():
+    """Test the estimated wall clock time, node hours and energy."""
+    df = pd.DataFrame(
+        {"nodes": [1, 2, 4], "ncores": [32, 64, 128], "performance": [10, 20, "?"]}
+    )
+
+    result = costs.time_to_solution(
+        df, target_ns=100, performance_column="performance", power=500
+    )
+
+    assert_allclose(result["wall_clock_hours"][:2], [240, 120])
+    assert_allclose(result["node_hours"][:2], [240, 240])
+    assert_allclose(result["core_hours"][:2], [7680, 7680])
+    assert_allclose(result["energy_kwh"][:2], [120, 120])
+    assert result[costs.COST_COLUMNS].iloc[2].isnull().all()
+
+
+def test_time_to_solution_without_power():
+    """Test that the energy is missing if the power is unknown."""
+    df = pd.DataFrame({"nodes": [1], "ncores": [32], "performance": [10]})
+
+    result = costs.time_to_solution(df, target_ns=10, performance_column="performance")
+
+    assert_allclose(result["wall_clock_hours"], [24])
+    assert result["energy_kwh"].isnull().all()
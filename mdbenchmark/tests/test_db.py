@@ -0,0 +1,144 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import os
+import shutil
+import sqlite3
+
+import datreant as dtr
+import pandas as pd
+
+from mdbenchmark import cli, database
+
+
+def test_ingest_and_query(cli_runner, tmpdir, data):
+    """Test incremental ingestion and queries of the results database."""
+    with tmpdir.as_cwd():
+        shutil.copytree(data["analyze-files-gromacs"], "campaign")
+        for treant in dtr.discover("campaign"):
+            with open(os.path.join(treant.relpath, "bench.tpr"), "w") as fh:
+                fh.write("protein")
+
+        result = cli_runner.invoke(
+            cli, ["db", "ingest", "-d", "campaign", "--database", "results.db"]
+        )
+        assert result.exit_code == 0
+        assert "Added 5 benchmarks" in result.output
+
+        # Unchanged benchmarks are not ingested again
+        result = cli_runner.invoke(
+            cli, ["db", "ingest", "-d", "campaign", "--database", "results.db"]
+        )
+        assert result.exit_code == 0
+        assert "Added 0 benchmarks" in result.output
+        assert "Skipped 5" in result.output
+
+        # Benchmarks that were run again are updated
+        log = os.path.join("campaign", "1", "bench.log")
+        os.utime(log, (0, os.path.getmtime(log) + 60))
+        result = cli_runner.invoke(
+            cli, ["db", "ingest", "-d", "campaign", "--database", "results.db"]
+        )
+        assert "Added 1 benchmarks" in result.output
+
+        connection = database.connect("results.db")
+        df = database.query_results(connection, system="bench")
+        assert len(df) == 5
+        assert df["system_hash"].nunique() == 1
+        assert df["performance"].is_monotonic_decreasing
+
+        best = database.query_results(connection, system="bench", best=True)
+        assert len(best) == 1
+        assert best["performance"].iloc[0] == df["performance"].max()
+
+        assert database.query_results(connection, hosts=["cobra"]).empty
+        assert database.query_results(connection, system="unknown").empty
+        prefix = df["system_hash"].iloc[0][:8]
+        assert len(database.query_results(connection, system=prefix)) == 5
+        connection.close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "db",
+                "query",
+                "--database",
+                "results.db",
+                "--name",
+                "bench",
+                "--since",
+                "2000-01-01",
+                "--best",
+                "--save-csv",
+                "best",
+            ],
+        )
+        assert result.exit_code == 0
+        assert pd.read_csv("best.csv")["host"].tolist() == ["draco"]
+
+        result = cli_runner.invoke(
+            cli,
+            ["db", "query", "--database", "results.db", "--since", "2999-01-01"],
+        )
+        assert result.exit_code == 1
+        assert "There are no benchmarks matching the query." in result.output
+
+
+def test_query_best_per_layout(tmpdir, data):
+    """Test that benchmarks with different layouts are not mixed."""
+    with tmpdir.as_cwd():
+        shutil.copytree(data["analyze-files-gromacs"], "campaign")
+        for treant in dtr.discover("campaign"):
+            with open(os.path.join(treant.relpath, "bench.tpr"), "w") as fh:
+                fh.write("protein")
+        treant = dtr.Treant(os.path.join("campaign", "1"))
+        treant.categories["mdrun_nb"] = "gpu"
+        treant.categories["gpus_per_rank"] = 0.5
+        treant.categories["nstlist"] = 80
+        treant.categories["sweep"] = "nstlist"
+
+        connection = database.connect("results.db")
+        database.ingest(connection, dtr.discover("campaign"))
+        df = database.query_results(connection, system="bench")
+        best = database.query_results(connection, system="bench", best=True)
+        connection.close()
+
+        assert sorted(df["mdrun_nb"].tolist()) == ["auto"] * 4 + ["gpu"]
+        layout = df[df["mdrun_nb"] == "gpu"].iloc[0]
+        assert layout["gpus_per_rank"] == 0.5
+        assert layout["sweep"] == '{"nstlist": 80}'
+        assert sorted(best["mdrun_nb"].tolist()) == ["auto", "gpu"]
+
+
+def test_connect_adds_layout_columns(tmpdir):
+    """Test that databases without the layout columns are extended."""
+    with tmpdir.as_cwd():
+        connection = sqlite3.connect("old.db")
+        connection.execute(
+            "CREATE TABLE benchmarks (id INTEGER PRIMARY KEY, timestamp TEXT, "
+            "system TEXT, system_hash TEXT, host TEXT, module TEXT)"
+        )
+        connection.close()
+
+        connection = database.connect("old.db")
+        columns = {
+            row[1] for row in connection.execute("PRAGMA table_info(benchmarks)")
+        }
+        connection.close()
+        assert set(database.LAYOUT_COLUMNS) <= columns
@@ -0,0 +1,125 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from mdbenchmark import fitting
+
+NODES = np.array([1, 2, 4, 8, 16])
+
+
+def amdahl(nodes, reference, serial_fraction, overhead=0.0):
+    return reference / (
+        serial_fraction + (1 - serial_fraction) / nodes + overhead * nodes
+    )
+
+
+def test_fit_amdahl():
+    """Test that `fit_amdahl()` recovers the parameters of exact data."""
+    performance = amdahl(NODES, 50, 0.05)
+    fit = fitting.fit_amdahl(NODES, performance)
+
+    assert fit.model == "amdahl"
+    assert_allclose(fit.reference_performance, 50)
+    assert_allclose(fit.serial_fraction, 0.05)
+    assert fit.overhead == 0
+
+
+def test_fit_gustafson():
+    """Test that `fit_gustafson()` recovers the parameters of exact data."""
+    performance = 50 * (0.1 + 0.9 * NODES)
+    fit = fitting.fit_gustafson(NODES, performance)
+
+    assert_allclose(fit.reference_performance, 50)
+    assert_allclose(fit.serial_fraction, 0.1)
+
+
+def test_fit_overhead():
+    """Test that `fit_overhead()` recovers the parameters of exact data."""
+    performance = amdahl(NODES, 50, 0.02, overhead=0.001)
+    fit = fitting.fit_overhead(NODES, performance)
+
+    assert_allclose(fit.reference_performance, 50)
+    assert_allclose(fit.serial_fraction, 0.02)
+    assert_allclose(fit.overhead, 0.001)
+
+
+@pytest.mark.parametrize("model", ["amdahl", "gustafson", "overhead"])
+def test_predict_performance(model):
+    """Test that predictions reproduce the fitted data points."""
+    performance = amdahl(NODES, 50, 0.02, overhead=0.001)
+    fit = fitting.fit_scaling(NODES, performance, model=model)
+    predicted = fitting.predict_performance(fit, NODES)
+
+    if model == "overhead":
+        assert_allclose(predicted, performance)
+    assert predicted.shape == NODES.shape
+
+
+def test_fit_scaling_ignores_nan():
+    """Test that crashed benchmarks do not break the fit."""
+    performance = amdahl(NODES, 50, 0.05)
+    performance[2] = np.nan
+    fit = fitting.fit_scaling(NODES, performance, model="amdahl")
+
+    assert_allclose(fit.serial_fraction, 0.05)
+
+
+def test_fit_scaling_errors():
+    """Test that unknown models and too few data points raise errors."""
+    with pytest.raises(ValueError):
+        fitting.fit_scaling(NODES, NODES, model="unknown")
+
+    with pytest.raises(ValueError):
+        fitting.fit_scaling([1, 2], [10, np.nan], model="amdahl")
+
+    with pytest.raises(ValueError):
+        fitting.fit_scaling([1, 2], [10, 20], model="overhead")
+
+
+def test_fit_dataframe():
+    """Test that each group is fitted and predictions are added as columns."""
+    df = pd.DataFrame(
+        {
+            "module": ["gromacs/2018"] * 5 + ["gromacs/2016"] * 1,
+            "nodes": list(NODES) + [1],
+            "performance": list(amdahl(NODES, 50, 0.05)) + [40],
+        }
+    )
+    fits = fitting.fit_dataframe(
+        df,
+        columns=["module"],
+        model="amdahl",
+        performance_column="performance",
+        predict_nodes=[32],
+    )
+
+    assert fits.shape[0] == 1
+    assert list(fits.columns) == [
+        "module",
+        "model",
+        "reference_performance",
+        "serial_fraction",
+        "overhead",
+        "predicted_32",
+    ]
+    assert_allclose(fits["predicted_32"].iloc[0], amdahl(32, 50, 0.05), atol=1e-3)
@@ -20,18 +20,22 @@
 import os
 
 import datreant as dtr
+import pandas as pd
 import pytest
 from click import exceptions
+from jinja2 import DictLoader, Environment
 
 from mdbenchmark import cli
-from mdbenchmark.cli.generate import NAMD_WARNING
+from mdbenchmark.cli.generate import DEFAULT_CORES, NAMD_WARNING, get_processor
 from mdbenchmark.cli.validators import (
     print_known_hosts,
     validate_cpu_gpu_flags,
+    validate_host_nodes,
     validate_hosts,
     validate_module,
     validate_name,
     validate_number_of_nodes,
+    validate_number_of_simulations,
 )
 from mdbenchmark.mdengines import SUPPORTED_ENGINES
 
@@ -104,7 +108,7 @@ def test_generate(cli_runner, module, extensions, tmpdir):
 
         start_of_message = "WARNING Cannot locate modules available on this host. Not performing module name validation.\n\n"
         end_of_message = (
-            "We will generate 4 benchmarks.\n"
+            "Generated 4 benchmarks.\n"
             "Finished! You can submit the jobs with mdbenchmark submit.\n"
         )
         output = start_of_message + "".join(expected_output) + end_of_message
@@ -161,7 +165,7 @@ def test_generate_with_cpu_gpu(
 
         start_of_message = "WARNING Cannot locate modules available on this host. Not performing module name validation.\n\n"
         end_of_message = (
-            "We will generate 8 benchmarks.\n"
+            "Generated 8 benchmarks.\n"
             "Finished! You can submit the jobs with mdbenchmark submit.\n"
         )
         output = start_of_message + "".join(expected_output) + end_of_message
@@ -220,7 +224,7 @@ def test_generate_with_validation(cli_runner, module, monkeypatch, extensions, t
             )
 
         end_of_message = (
-            "We will generate 4 benchmarks.\n"
+            "Generated 4 benchmarks.\n"
             "Finished! You can submit the jobs with mdbenchmark submit.\n"
         )
         output = "".join(expected_output) + end_of_message
@@ -280,7 +284,7 @@ def test_generate_skip_validation(cli_runner, module, extensions, monkeypatch, t
             )
 
         end_of_message = (
-            "We will generate 4 benchmarks.\n"
+            "Generated 4 benchmarks.\n"
             "Finished! You can submit the jobs with mdbenchmark submit.\n"
         )
         output = (
@@ -445,7 +449,7 @@ def test_generate_namd_experimental_warning(cli_runner, monkeypatch, tmpdir):
         )
 
         output2 = (
-            "We will generate 5 benchmarks.\n"
+            "Generated 5 benchmarks.\n"
             "Finished! You can submit the jobs with mdbenchmark submit.\n"
         )
         output = output1 + "".join(expected_output) + output2
@@ -603,3 +607,581 @@ def test_generate_test_prompt_no(cli_runner, tmpdir):
         bundle = dtr.discover()
         assert result.exit_code == 1
         assert len(bundle) == 0
+
+
+def test_generate_repeats(cli_runner, tmpdir):
+    """Test that repeated benchmarks are generated with their repeat index."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--max-nodes=2",
+                "--name=protein",
+                "--repeats=3",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Generated 6 benchmarks." in result.output
+
+        bundle = dtr.discover()
+        assert len(bundle) == 6
+        assert sorted(bundle.categories["repeat"]) == [1, 1, 2, 2, 3, 3]
+        assert os.path.exists("draco_gromacs/2016/n001_r40_t01_woht_nsim1_rep03")
+
+
+@pytest.mark.parametrize(
+    "options, nodes",
+    [
+        (["--node-sequence=powers-of-two"], [1, 2, 4, 8, 16]),
+        (["--node-sequence=divisors"], [1, 2, 4, 5, 10, 20]),
+        (["--min-nodes=2", "--node-sequence=geometric", "--node-ratio=3"], [2, 6, 18]),
+        (["--nodes=4,1,4"], [1, 4]),
+    ],
+)
+def test_generate_node_sequence(cli_runner, tmpdir, options, nodes):
+    """Test that only the numbers of nodes of a sequence are generated."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--max-nodes=20",
+                "--name=protein",
+                "--yes",
+            ]
+            + options,
+        )
+        assert result.exit_code == 0
+        assert sorted(dtr.discover().categories["nodes"]) == nodes
+
+
+def test_generate_node_sequence_errors(cli_runner, monkeypatch, tmpdir):
+    """Test that invalid numbers of nodes are rejected."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+        options = [
+            "generate",
+            "--module=gromacs/2016",
+            "--host=draco",
+            "--name=protein",
+        ]
+
+        result = cli_runner.invoke(
+            cli, options + ["--nodes=1,2", "--node-sequence=powers-of-two"]
+        )
+        assert result.exit_code == 1
+        assert "--nodes and --node-sequence cannot be combined" in result.output
+
+        result = cli_runner.invoke(cli, options + ["--nodes=1,two"])
+        assert result.exit_code == 1
+        assert "must be a list of integers: 1,two" in result.output
+
+        result = cli_runner.invoke(
+            cli,
+            options
+            + ["--min-nodes=3", "--max-nodes=3", "--node-sequence=powers-of-two"],
+        )
+        assert result.exit_code == 1
+        assert (
+            "The powers-of-two sequence has no numbers of nodes between 3 and 3."
+            in result.output
+        )
+
+        monkeypatch.setattr(
+            "mdbenchmark.utils.retrieve_host_metadata", lambda host: {"max_nodes": 4}
+        )
+        result = cli_runner.invoke(cli, options + ["--nodes=2,8"])
+        assert result.exit_code == 2
+        assert "The host only has 4 nodes, but 8 nodes were requested." in result.output
+        assert dtr.discover() == dtr.Bundle()
+
+
+def test_validate_host_nodes():
+    """Test that the numbers of nodes are validated against the host."""
+    assert validate_host_nodes([1, 2, 4], None) is None
+    assert validate_host_nodes([1, 2, 4], 4) is None
+    with pytest.raises(exceptions.BadParameter):
+        validate_host_nodes([1, 8], 4)
+
+
+def test_validate_number_of_simulations():
+    """Test that the given numbers of nodes are validated."""
+    assert validate_number_of_simulations([2], [2, 4], [1]) is None
+    with pytest.raises(exceptions.BadParameter):
+        validate_number_of_simulations([2], [1, 2], [1])
+
+
+def test_get_processor(monkeypatch):
+    """Test that the cores are read from the hardware profile of the host."""
+    monkeypatch.setattr(
+        "mdbenchmark.utils.retrieve_host_metadata",
+        lambda host: {"sockets": 2, "cores_per_socket": 16, "threads_per_core": 2},
+    )
+
+    processor = get_processor("draco")
+    assert processor.physical_cores == 32
+    assert processor.logical_cores == 64
+
+    # Cores given by the user take precedence
+    processor = get_processor("draco", physical_cores=20, logical_cores=20)
+    assert processor.physical_cores == 20
+    assert processor.logical_cores == 20
+
+    # Without a profile we fall back to the default
+    monkeypatch.setattr("mdbenchmark.utils.retrieve_host_metadata", lambda host: {})
+    processor = get_processor("draco")
+    assert processor.physical_cores == DEFAULT_CORES
+    assert processor.logical_cores == DEFAULT_CORES
+
+
+def test_generate_auto_layouts(cli_runner, monkeypatch, tmpdir):
+    """Test that all layouts fitting the hardware profile are generated."""
+    monkeypatch.setattr(
+        "mdbenchmark.utils.retrieve_host_metadata",
+        lambda host: {"sockets": 2, "cores_per_socket": 4, "numa_domains": 2},
+    )
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--max-nodes=1",
+                "--name=protein",
+                "--auto-layouts",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 0
+        bundle = dtr.discover()
+        layouts = sorted(
+            zip(
+                bundle.categories["ranks"],
+                bundle.categories["threads"],
+                bundle.categories["pme_ranks"],
+            )
+        )
+        # One rank with eight threads would straddle both NUMA domains
+        assert layouts == [(2, 4, 0), (4, 2, 0), (8, 1, 0), (8, 1, 2)]
+
+        with open("draco_gromacs/2016/n001_r08_t01_woht_nsim1_pme02/bench.job") as fh:
+            assert "-npme 2" in fh.read()
+        with open("draco_gromacs/2016/n001_r08_t01_woht_nsim1_pme00/bench.job") as fh:
+            assert "-npme 0" in fh.read()
+
+
+def test_generate_auto_layouts_gpus_per_rank(cli_runner, monkeypatch, tmpdir):
+    """Test that the GPU share of each rank is stored and passed to the template."""
+    monkeypatch.setattr(
+        "mdbenchmark.utils.retrieve_host_metadata",
+        lambda host: {
+            "sockets": 2,
+            "cores_per_socket": 4,
+            "numa_domains": 2,
+            "gpus_per_node": 2,
+        },
+    )
+    env = Environment(loader=DictLoader({"draco": "gpus_per_rank={{ gpus_per_rank }}"}))
+    monkeypatch.setattr(
+        "mdbenchmark.utils.retrieve_host_template", lambda host: env.get_template(host)
+    )
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--max-nodes=1",
+                "--name=protein",
+                "--gpu",
+                "--no-cpu",
+                "--auto-layouts",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 0
+        bundle = dtr.discover()
+        assert sorted(
+            set(zip(bundle.categories["ranks"], bundle.categories["gpus_per_rank"]))
+        ) == [(2, 1.0), (4, 0.5), (8, 0.25)]
+
+        benchmark = "draco_gromacs/2016_gpu/n001_r04_t02_woht_nsim1_pme01"
+        with open(os.path.join(benchmark, "bench.job")) as fh:
+            assert fh.read() == "gpus_per_rank=0.5"
+
+
+def test_generate_pme_gpu_single_rank(cli_runner, monkeypatch, tmpdir):
+    """Test that PME on the GPU never uses more than one PME rank."""
+    monkeypatch.setattr(
+        "mdbenchmark.utils.retrieve_host_metadata",
+        lambda host: {
+            "sockets": 2,
+            "cores_per_socket": 4,
+            "numa_domains": 2,
+            "gpus_per_node": 2,
+        },
+    )
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+        arguments = [
+            "generate",
+            "--module=gromacs/2016",
+            "--host=draco",
+            "--name=protein",
+            "--gpu",
+            "--no-cpu",
+            "--pme=gpu",
+            "--max-nodes=2",
+        ]
+
+        result = cli_runner.invoke(cli, arguments + ["--ranks=4", "--pme-ranks=1"])
+        assert result.exit_code == 1
+        assert "PME on the GPU only supports a single PME rank" in result.output
+
+        # Enumerated layouts with a PME rank on each of two nodes are skipped
+        result = cli_runner.invoke(cli, arguments + ["--auto-layouts", "--yes"])
+        assert result.exit_code == 0
+        bundle = dtr.discover()
+        assert {
+            (nodes, pme_ranks)
+            for nodes, pme_ranks in zip(
+                bundle.categories["nodes"], bundle.categories["pme_ranks"]
+            )
+        } == {(1, 0), (1, 1), (2, 0)}
+
+
+def test_generate_auto_layouts_with_ranks(cli_runner, tmpdir):
+    """Test that --auto-layouts cannot be combined with --ranks."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--name=protein",
+                "--auto-layouts",
+                "--ranks=10",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "cannot be combined" in result.output
+
+
+def test_generate_mdrun_options(cli_runner, tmpdir):
+    """Test that mdrun options are swept and stored as categories."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--max-nodes=1",
+                "--name=protein",
+                "--cpu",
+                "--gpu",
+                "--pme=cpu",
+                "--pme=gpu",
+                "--pme-ranks=1",
+                "--dlb=no",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 0
+        # CPU benchmarks do not offload PME to GPUs
+        assert "Generated 3 benchmarks." in result.output
+
+        bundle = dtr.discover()
+        options = sorted(
+            zip(
+                bundle.categories["gpu"],
+                bundle.categories["mdrun_pme"],
+                bundle.categories["pme_ranks"],
+                bundle.categories["mdrun_dlb"],
+                bundle.categories["mdrun_nb"],
+            )
+        )
+        assert options == [
+            (False, "cpu", 1, "no", "auto"),
+            (True, "cpu", 1, "no", "auto"),
+            (True, "gpu", 1, "no", "auto"),
+        ]
+
+        job = "draco_gromacs/2016_gpu/n001_r40_t01_woht_nsim1_pme01_pmegpu_dlbno/bench.job"
+        with open(job) as fh:
+            assert fh.read().endswith("-noconfout -npme 1 -pme gpu -dlb no")
+
+
+def test_generate_too_many_pme_ranks(cli_runner, tmpdir):
+    """Test that at least one rank must be left for the PP work."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--name=protein",
+                "--ranks=4",
+                "--pme-ranks=4",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "must be smaller than the number of ranks" in result.output
+
+
+def test_generate_pme_ranks_multidir(cli_runner, tmpdir):
+    """Test that separate PME ranks cannot be used for multiple simulations."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--name=protein",
+                "--max-nodes=2",
+                "--multidir=2",
+                "--pme-ranks=4",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "--pme-ranks and --multidir cannot be combined" in result.output
+        assert dtr.discover() == dtr.Bundle()
+
+
+def test_generate_sweep(cli_runner, tmpdir):
+    """Test that unknown parameters are swept, stored and analyzed."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--name=protein",
+                "--sweep=nodes=1,2",
+                "--sweep=nstlist=40,80",
+                "--sweep=mdrun_tunepme=no",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Generated 4 benchmarks." in result.output
+
+        bundle = dtr.discover()
+        assert sorted(zip(bundle.categories["nodes"], bundle.categories["nstlist"])) == [
+            (1, 40),
+            (1, 80),
+            (2, 40),
+            (2, 80),
+        ]
+        assert set(bundle.categories["sweep"]) == {"nstlist,mdrun_tunepme"}
+
+        job = "draco_gromacs/2016/n002_r40_t01_woht_nsim1_tunepmeno_nstlist80/bench.job"
+        with open(job) as fh:
+            assert fh.read().endswith("-noconfout -tunepme no")
+
+        result = cli_runner.invoke(cli, ["analyze", "--save-csv=results.csv"])
+        assert result.exit_code == 0
+        df = pd.read_csv("results.csv")
+        assert sorted(df["nstlist"].tolist()) == [40, 40, 80, 80]
+
+
+def test_generate_sweep_file(cli_runner, tmpdir):
+    """Test zipped dimensions and constraints of a sweep file."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+        with open("sweep.json", "w") as fh:
+            fh.write(
+                '{"parameters": {"nodes": [1, 2, 4]},'
+                ' "zip": [{"number_of_ranks": [10, 20], "nstlist": [40, 80]}],'
+                ' "constraints": ["nodes * number_of_ranks <= 40"]}'
+            )
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--name=protein",
+                "--sweep-file=sweep.json",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 0
+        bundle = dtr.discover()
+        layouts = zip(
+            bundle.categories["nodes"],
+            bundle.categories["ranks"],
+            bundle.categories["threads"],
+            bundle.categories["nstlist"],
+        )
+        assert sorted(layouts) == [
+            (1, 10, 4, 40),
+            (1, 20, 2, 80),
+            (2, 10, 4, 40),
+            (2, 20, 2, 80),
+            (4, 10, 4, 40),
+        ]
+
+
+def test_generate_sweep_invalid(cli_runner, tmpdir):
+    """Test that malformed and reserved sweep parameters are rejected."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+        arguments = ["generate", "--module=gromacs/2016", "--host=draco"]
+
+        result = cli_runner.invoke(
+            cli, arguments + ["--name=protein", "--sweep=nstlist"]
+        )
+        assert result.exit_code == 1
+        assert "key=v1,v2" in result.output
+
+        result = cli_runner.invoke(
+            cli, arguments + ["--name=protein", "--sweep=started=true"]
+        )
+        assert result.exit_code == 1
+        assert "Cannot sweep over started." in result.output
+
+        # Derived categories would silently overwrite the swept values
+        result = cli_runner.invoke(
+            cli, arguments + ["--name=protein", "--sweep=number_of_threads=2,4"]
+        )
+        assert result.exit_code == 1
+        assert "Cannot sweep over number_of_threads" in result.output
+
+        result = cli_runner.invoke(
+            cli,
+            arguments + ["--name=protein", "--auto-layouts", "--sweep=pme_ranks=0,2"],
+        )
+        assert result.exit_code == 1
+        assert "Cannot sweep over pme_ranks" in result.output
+
+        # Swept ranks must fit the number of simulations as well
+        result = cli_runner.invoke(
+            cli,
+            arguments
+            + ["--name=protein", "--multidir=4", "--sweep=number_of_ranks=8,6"],
+        )
+        assert result.exit_code == 2
+        assert "integer multiple of the number of simulations" in result.output
+
+
+def test_generate_adaptive(cli_runner, tmpdir):
+    """Test that adaptive benchmarks calibrate and watch the GROMACS run."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--name=protein",
+                "--max-nodes=1",
+                "--adaptive",
+                "--tolerance=0.05",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 0
+        directory = "draco_gromacs/2016/n001_r40_t01_woht_nsim1"
+        assert os.path.exists(os.path.join(directory, "mdbenchmark_monitor.py"))
+        with open(os.path.join(directory, "bench.job")) as fh:
+            job = fh.read()
+        assert "-deffnm calibration" in job
+        assert "-resetstep $RESETSTEP -nsteps $NSTEPS" in job
+        assert "mdbenchmark_monitor.py watch protein.log $! --tolerance 0.05" in job
+        assert dtr.discover().categories["tolerance"] == [0.05]
+
+
+def test_generate_adaptive_invalid(cli_runner, tmpdir):
+    """Test that adaptive benchmarks need a single simulation and enough time."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+        options = ["generate", "--module=gromacs/2016", "--host=draco"]
+        options += ["--name=protein", "--adaptive", "--yes"]
+
+        result = cli_runner.invoke(cli, options + ["--multidir=2"])
+        assert result.exit_code == 1
+        assert "--adaptive and --multidir cannot be combined" in result.output
+
+        result = cli_runner.invoke(cli, options + ["--time=2"])
+        assert result.exit_code == 1
+        assert "must run longer than 2 minutes" in result.output
+
+
+@pytest.mark.parametrize(
+    "multidir, log", [("1", "--log protein.log"), ("2", "--log rep01/protein.log")]
+)
+def test_generate_telemetry(cli_runner, tmpdir, multidir, log):
+    """Test that the job script samples the log of the first simulation."""
+    with tmpdir.as_cwd():
+        open("protein.tpr", "a").close()
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "generate",
+                "--module=gromacs/2016",
+                "--host=draco",
+                "--name=protein",
+                "--max-nodes=1",
+                "--multidir={}".format(multidir),
+                "--telemetry",
+                "--yes",
+            ],
+        )
+
+        assert result.exit_code == 0
+        bundle = dtr.discover()
+        assert bundle.categories["telemetry"] == [True]
+        directory = bundle[0].relpath
+        assert os.path.exists(os.path.join(directory, "mdbenchmark_monitor.py"))
+        with open(os.path.join(directory, "bench.job")) as fh:
+            job = fh.read()
+        assert "sample telemetry.jsonl {} --interval 10 &".format(log) in job
+        assert job.endswith("kill $SAMPLER")
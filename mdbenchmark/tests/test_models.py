@@ -19,7 +19,7 @@
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
 import pytest
 
-from mdbenchmark.models import Processor
+from mdbenchmark.models import PROFILE_KEYS, Processor, detect_hardware_profile
 
 
 @pytest.mark.parametrize(
@@ -88,3 +88,81 @@ def test_ranks_and_threads(
     ranks_threads = obj.get_ranks_and_threads(number_of_ranks, with_hyperthreading)
 
     assert expected_result == ranks_threads
+
+
+def test_processor_from_profile():
+    """Test that a processor is created from the hardware profile of a host."""
+    profile = {
+        "sockets": 2,
+        "cores_per_socket": 20,
+        "threads_per_core": 2,
+        "gpus_per_node": 2,
+        "numa_domains": 4,
+        "memory_gb": 192,
+    }
+    obj = Processor.from_profile(profile)
+
+    assert obj.physical_cores == 40
+    assert obj.logical_cores == 80
+    assert obj.supports_hyperthreading
+    assert obj.gpus == 2
+    assert obj.numa_domains == 4
+    assert obj.memory_gb == 192
+
+    assert Processor.from_profile({"power_per_node": 300}) is None
+
+
+def test_detect_hardware_profile(monkeypatch):
+    """Test that the profile of the current node is derived from the core count."""
+    monkeypatch.setattr(
+        "mdbenchmark.models.cpu_count", lambda logical: 80 if logical else 40
+    )
+    monkeypatch.setattr("mdbenchmark.models._count_sockets", lambda: 2)
+
+    profile = detect_hardware_profile()
+
+    assert set(profile) == set(PROFILE_KEYS)
+    assert profile["sockets"] == 2
+    assert profile["cores_per_socket"] == 20
+    assert profile["threads_per_core"] == 2
+    assert Processor.from_profile(profile).physical_cores == 40
+
+
+def test_enumerate_layouts_numa():
+    """Test that layouts straddling NUMA domains are pruned."""
+    obj = Processor(40, 40, sockets=2, numa_domains=2)
+    layouts = obj.enumerate_layouts()
+
+    assert sorted({(layout.ranks, layout.threads) for layout in layouts}) == [
+        (2, 20),
+        (4, 10),
+        (8, 5),
+        (10, 4),
+        (20, 2),
+        (40, 1),
+    ]
+    assert all(layout.gpus_per_rank == 0 for layout in layouts)
+    assert [layout.pme_ranks for layout in layouts if layout.ranks == 40] == [0, 10]
+
+
+def test_enumerate_layouts_gpu():
+    """Test that all ranks are distributed evenly over the GPUs."""
+    obj = Processor(12, 12, numa_domains=1, gpus=4)
+    layouts = obj.enumerate_layouts(gpu=True)
+
+    assert sorted({layout.ranks for layout in layouts}) == [4, 12]
+    assert {layout.gpus_per_rank for layout in layouts if layout.ranks == 4} == {1.0}
+    assert {layout.pme_ranks for layout in layouts} == {0, 1}
+
+    # Without GPUs in the profile there are no GPU layouts
+    assert Processor(12, 12, gpus=0).enumerate_layouts(gpu=True) == []
+
+
+def test_enumerate_layouts_hyperthreading():
+    """Test that hyperthreading uses the logical cores."""
+    obj = Processor(4, 8)
+    layouts = obj.enumerate_layouts(with_hyperthreading=True)
+    assert {layout.ranks for layout in layouts} == {1, 2, 4, 8}
+
+    with pytest.raises(ValueError):
+        Processor(4, 4).enumerate_layouts(with_hyperthreading=True)
@@ -0,0 +1,145 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import json
+
+import pytest
+
+from mdbenchmark import monitor
+
+CALIBRATION_LOG = """
+   dt                             = 0.002
+
+               Core t (s)   Wall t (s)        (%)
+       Time:     2400.000       60.000     4000.0
+                 (ns/day)    (hour/ns)
+Performance:       86.400        0.278
+"""
+
+BENCHMARK_LOG = """
+           Step           Time
+              0        0.00000
+
+           Step           Time
+          10000       20.00000
+
+           Step           Time
+          broken
+"""
+
+
+def test_calibrate():
+    """Test that the steps are computed from the calibration performance."""
+    # 86.4 ns/day with 2 fs time steps are 30000 steps per minute
+    assert monitor.calibrate(CALIBRATION_LOG, 10, 1) == (30000, 243000)
+    # The benchmark always runs at least twice as long as the calibration
+    assert monitor.calibrate(CALIBRATION_LOG, 1.5, 1) == (30000, 60000)
+
+
+def test_parse_steps():
+    """Test that only valid steps following a step header are returned."""
+    assert list(monitor.parse_steps(BENCHMARK_LOG.splitlines())) == [0, 10000]
+
+
+def test_rolling_performance():
+    """Test the performance between consecutive samples."""
+    samples = [(0, 0), (10, 5000), (10, 5000), (20, 10000)]
+    assert monitor.rolling_performance(samples, 0.002) == pytest.approx([86.4, 86.4])
+
+
+@pytest.mark.parametrize(
+    "estimates, expected",
+    [
+        ([100, 101], False),
+        ([50, 100, 101, 99], True),
+        ([100, 110, 100], False),
+    ],
+)
+def test_converged(estimates, expected):
+    """Test that only the last estimates must agree within the tolerance."""
+    assert monitor.converged(estimates, 0.02, 3) is expected
+
+
+def test_main_steps(capsys, tmpdir):
+    """Test the command used by the job templates."""
+    log = tmpdir.join("calibration.log")
+    log.write(CALIBRATION_LOG)
+
+    assert monitor.main(["steps", str(log), "10", "1"]) == 0
+    assert capsys.readouterr().out == "30000 243000\n"
+    assert monitor.main([]) == 1
+
+
+def test_log_follower(tmpdir):
+    """Test that steps are found across incomplete reads of a growing log."""
+    log = tmpdir.join("bench.log")
+    follower = monitor.LogFollower(str(log))
+    assert follower.read() == []
+
+    log.write("   dt = 0.002\n           Step           Time\n   100")
+    assert follower.steps(follower.read()) == []
+    assert follower.dt == 0.002
+
+    log.write("   0.20000\n\n", mode="a")
+    assert follower.steps(follower.read()) == [100]
+
+
+def test_cpu_usage():
+    """Test the CPU utilization between two readings of /proc/stat."""
+    assert monitor.cpu_usage((100, 400), (400, 800)) == 75
+    assert monitor.cpu_usage((100, 400), (100, 400)) is None
+    assert monitor.cpu_usage(None, (100, 400)) is None
+
+
+def test_sample(monkeypatch, tmpdir):
+    """Test that the sampler appends one record per interval."""
+    log = tmpdir.join("bench.log")
+    log.write("   dt = 0.002\n")
+    output = tmpdir.join("telemetry.jsonl")
+
+    def sleep(interval):
+        if len(sleep.steps) == 0:
+            raise KeyboardInterrupt
+        log.write(
+            "           Step           Time\n {}  0.0\n".format(sleep.steps.pop(0)),
+            mode="a",
+        )
+
+    sleep.steps = [0, 5000, 10000]
+    clock = iter(range(0, 100, 10))
+    monkeypatch.setattr(monitor.time, "sleep", sleep)
+    monkeypatch.setattr(monitor.time, "time", lambda: next(clock))
+    monkeypatch.setattr(monitor, "cpu_times", lambda: (50, 100))
+    monkeypatch.setattr(monitor, "memory_usage", lambda: 25.0)
+    monkeypatch.setattr(monitor, "gpu_usage", lambda: None)
+
+    with pytest.raises(KeyboardInterrupt):
+        monitor.sample(str(output), str(log), interval=10)
+
+    records = [json.loads(line) for line in output.readlines()]
+    assert [r["step"] for r in records] == [0, 5000, 10000]
+    assert [r["ns_per_day"] for r in records] == [None, 86.4, 86.4]
+    assert records[0] == {
+        "time": 10,
+        "step": 0,
+        "ns_per_day": None,
+        "cpu": None,
+        "memory": 25.0,
+        "gpu": None,
+    }
@@ -0,0 +1,82 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from mdbenchmark import outliers
+
+
+@pytest.mark.parametrize(
+    "nodelist,expected",
+    [
+        ("dra0479", ["dra0479"]),
+        ("dra[0001-0003]", ["dra0001", "dra0002", "dra0003"]),
+        (
+            "dra[0009-0010,0100],drb01",
+            ["dra0009", "dra0010", "dra0100", "drb01"],
+        ),
+    ],
+)
+def test_expand_nodelist(nodelist, expected):
+    """Test that compressed SLURM nodelists are expanded."""
+    assert outliers.expand_nodelist(nodelist) == expected
+
+
+def test_flag_outliers():
+    """Test that slow benchmarks are flagged per configuration."""
+    df = pd.DataFrame(
+        {
+            "nodes": [1, 1, 1, 2],
+            "performance": [100.0, 98.0, 60.0, 150.0],
+        }
+    )
+    flagged = outliers.flag_outliers(
+        df, columns=["nodes"], performance_column="performance", threshold=0.2
+    )
+
+    assert flagged["outlier"].tolist() == [False, False, True, False]
+    assert_allclose(flagged["deviation"].iloc[:3], [100 / 98 - 1, 0, 60 / 98 - 1])
+    # A single benchmark cannot be compared to anything
+    assert np.isnan(flagged["deviation"].iloc[3])
+
+
+def test_node_slowness():
+    """Test that nodes used by slow benchmarks get a high slowness score."""
+    df = pd.DataFrame(
+        {
+            "hostnames": [["a", "b"], ["c", "d"], ["b", "e"]],
+            "deviation": [0.0, 0.05, -0.4],
+            "outlier": [False, False, True],
+        }
+    )
+    slowness = outliers.node_slowness(df)
+
+    assert slowness["hostname"].tolist() == ["e", "b", "a", "c", "d"]
+    assert slowness["outliers"].tolist() == [1, 1, 0, 0, 0]
+    assert_allclose(slowness["slowness"].iloc[:2], [0.4, 0.2])
+
+
+def test_node_slowness_without_hostnames():
+    """Test that an empty table is returned without any hostnames."""
+    df = pd.DataFrame({"hostnames": [[]], "deviation": [0.0], "outlier": [False]})
+
+    assert outliers.node_slowness(df).empty
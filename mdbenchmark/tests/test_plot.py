@@ -279,3 +279,215 @@ def test_plot_filter_empty_dataframe_error(cli_runner, capsys, tmpdir, data):
         assert out == expected_output
         assert error.type == SystemExit
         assert error.value.code == 1
+
+
+@pytest.mark.parametrize("fit_model", ("amdahl", "gustafson", "overhead"))
+def test_plot_fit_model(cli_runner, tmpdir, data, fit_model):
+    """Test that all scaling models can be plotted."""
+    with tmpdir.as_cwd():
+        result = cli_runner.invoke(
+            cli,
+            [
+                "plot",
+                "--csv={}".format(data["testcsv.csv"]),
+                "--fit-model={}".format(fit_model),
+                "--output-name=testpng",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert os.path.exists("testpng.png")
+
+
+def test_model_fit_points_unsorted():
+    """Test that the fit extends one step beyond the largest number of nodes."""
+    df = pd.DataFrame(
+        {"nodes": [4, 1, 2, 2, 3], "performance": [30.0, 10.0, 18.0, 18.0, 25.0]}
+    )
+    xs, _ = plot.model_fit_points(df, "nodes", "performance", "amdahl")
+
+    assert xs[0] == 1
+    assert xs[-1] == 5
+
+
+def test_plot_line_error_bars(tmpdir):
+    """Test that error bars are drawn for aggregated repeats."""
+    from matplotlib.figure import Figure
+
+    df = pd.DataFrame(
+        {
+            "nodes": [1, 2],
+            "performance": [10.0, 18.0],
+            "performance_ci_low": [9.0, 17.0],
+            "performance_ci_high": [11.0, 19.5],
+        }
+    )
+    ax = Figure().add_subplot(111)
+    plot.plot_line(df, "nodes", "label", fit=False, ax=ax)
+
+    assert len(ax.containers) == 1
+
+
+def many_groups(number_of_groups):
+    """Return a version 2 DataFrame with `number_of_groups` benchmark groups."""
+    return pd.DataFrame(
+        {
+            "module": ["gromacs/{}".format(i) for i in range(number_of_groups)] * 2,
+            "host": ["draco", "cobra"] * number_of_groups,
+            "gpu": [False] * 2 * number_of_groups,
+            "nodes": [1] * number_of_groups + [2] * number_of_groups,
+            "performance": [10.0] * number_of_groups + [18.0] * number_of_groups,
+        }
+    )
+
+
+def test_plot_over_group_line_collection():
+    """Test that many groups are drawn with a single collection."""
+    from matplotlib.figure import Figure
+
+    ax = Figure().add_subplot(111)
+    plot.plot_over_group(many_groups(50), False, True, "performance", ax=ax)
+
+    assert len(ax.lines) == 0
+    # Lines, fits and markers
+    assert len(ax.collections) == 3
+    assert len(ax.collections[0].get_segments()) == 50
+
+    ax = Figure().add_subplot(111)
+    plot.plot_over_group(many_groups(2), False, False, "performance", ax=ax)
+    assert len(ax.lines) == 2
+
+
+def test_label_groups():
+    """Test that the labels use the right values of each group."""
+    labels = [label for label, _ in plot.label_groups(many_groups(2), "performance")]
+
+    assert labels == ["draco - gromacs/0, CPU-only", "cobra - gromacs/1, CPU-only"]
+
+
+def test_plot_legend():
+    """Test that the legend is truncated after the maximal number of entries."""
+    from matplotlib.figure import Figure
+
+    ax = Figure().add_subplot(111)
+    colors = plot.assign_colors(str(i) for i in range(15))
+    legend = plot.plot_legend(ax, colors, max_entries=10)
+
+    texts = [t.get_text() for t in legend.get_texts()]
+    assert texts[:10] == [str(i) for i in range(10)]
+    assert texts[10] == "... and 5 more"
+
+
+def test_plot_facet(cli_runner, tmpdir):
+    """Test that facets are drawn as subplots of a single figure."""
+    with tmpdir.as_cwd():
+        many_groups(30).to_csv("many.csv", index=False)
+
+        result = cli_runner.invoke(
+            cli,
+            [
+                "plot",
+                "--csv=many.csv",
+                "--facet=host",
+                "--max-legend-entries=5",
+                "--output-name=facets",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert os.path.exists("facets.png")
+
+
+def test_plot_facet_gpu_version_3(cli_runner, tmpdir):
+    """Test that version 3 data can be split into CPU and GPU benchmarks."""
+    with tmpdir.as_cwd():
+        df = many_groups(4).rename(columns={"gpu": "use_gpu"})
+        df.loc[::2, "use_gpu"] = True
+        df.to_csv("many.csv", index=False)
+
+        result = cli_runner.invoke(
+            cli, ["plot", "--csv=many.csv", "--facet=gpu", "--output-name=facets"],
+        )
+
+        assert result.exit_code == 0
+        assert os.path.exists("facets.png")
+
+
+def test_plot_multiple_output_formats(cli_runner, tmpdir, data):
+    """Test that the same plot is saved in several formats."""
+    with tmpdir.as_cwd():
+        result = cli_runner.invoke(
+            cli,
+            [
+                "plot",
+                "--csv={}".format(data["testcsv.csv"]),
+                "--output-name=test.png",
+                "--output-format=png",
+                "--output-format=svg",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert os.path.exists("test.png")
+        assert os.path.exists("test.svg")
+
+
+def test_plot_spec(cli_runner, tmpdir, data):
+    """Test that all plots of a plot specification are created."""
+    with tmpdir.as_cwd():
+        with open("plots.json", "w") as fh:
+            fh.write(
+                '{"plots": ['
+                '{"output_name": "gpu", "cpu": false, "output_format": ["png", "pdf"]},'
+                '{"output_name": "cores", "plot_cores": true, "dpi": 50}'
+                "]}"
+            )
+
+        result = cli_runner.invoke(
+            cli,
+            ["plot", "--csv={}".format(data["testcsv.csv"]), "--plots=plots.json"],
+        )
+
+        assert result.exit_code == 0
+        assert "Plotting GPU data only." in result.output
+        assert sorted(f for f in os.listdir() if not f.endswith(".json")) == [
+            "cores.png",
+            "gpu.pdf",
+            "gpu.png",
+        ]
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ('{"plots": [{"cpu": false}]}', "Every plot needs an output_name."),
+        (
+            '{"plots": [{"output_name": "a", "color": 1}]}',
+            "Unknown plot options: color.",
+        ),
+        (
+            '{"plots": [{"output_name": "a", "output_format": "jpg"}]}',
+            "Invalid value for output_format: jpg.",
+        ),
+        ('{"views": []}', "A plot specification must contain a list of plots."),
+    ],
+)
+def test_load_plot_spec_invalid(tmpdir, spec, message):
+    """Test that invalid plot specifications are rejected."""
+    filename = tmpdir.join("plots.json")
+    filename.write(spec)
+
+    with pytest.raises(ValueError, match=message):
+        plot.load_plot_spec(str(filename))
+
+
+def test_output_names():
+    """Test the file names of plots saved in several formats."""
+    assert plot.output_names(["data.csv"], None, ["png", "pdf"]) == [
+        "data.png",
+        "data.pdf",
+    ]
+    assert plot.output_names(["a.csv"], "plot.pdf", ["png", "pdf"]) == [
+        "plot.png",
+        "plot.pdf",
+    ]
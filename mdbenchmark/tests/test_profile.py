@@ -0,0 +1,70 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from importlib import import_module
+
+from mdbenchmark import cli, utils
+
+# `mdbenchmark.cli` is shadowed by the click group of the same name
+profile_module = import_module("mdbenchmark.cli.profile")
+
+PROFILE = {
+    "sockets": 2,
+    "cores_per_socket": 16,
+    "threads_per_core": 2,
+    "gpus_per_node": 0,
+    "numa_domains": 2,
+    "memory_gb": 128,
+}
+
+
+def test_profile_print(cli_runner, monkeypatch):
+    """Test that the detected profile is printed as a metadata block."""
+    monkeypatch.setattr(profile_module, "detect_hardware_profile", lambda: PROFILE)
+
+    result = cli_runner.invoke(cli, ["profile"])
+
+    assert result.exit_code == 0
+    assert utils.format_host_metadata(PROFILE) in result.output
+
+
+def test_profile_save(cli_runner, monkeypatch, tmpdir):
+    """Test that the profile is saved into a user copy of the host template."""
+    monkeypatch.setattr(profile_module, "detect_hardware_profile", lambda: PROFILE)
+    monkeypatch.setattr("mdbenchmark.utils.xdg.XDG_CONFIG_HOME", str(tmpdir))
+
+    result = cli_runner.invoke(cli, ["profile", "--host=draco"])
+
+    assert result.exit_code == 0
+    path = os.path.join(str(tmpdir), "MDBenchmark", "draco")
+    with open(path) as fh:
+        content = fh.read()
+    assert content.startswith("#!/bin/bash")
+    assert content.endswith(utils.format_host_metadata(PROFILE))
+
+
+def test_profile_unknown_host(cli_runner, monkeypatch):
+    """Test that we cannot save a profile for an unknown host."""
+    monkeypatch.setattr(profile_module, "detect_hardware_profile", lambda: PROFILE)
+
+    result = cli_runner.invoke(cli, ["profile", "--host=minerva"])
+
+    assert result.exit_code == 1
+    assert "Could not find template for host 'minerva'." in result.output
@@ -0,0 +1,91 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+from mdbenchmark import cli
+from mdbenchmark.report import recommend, render_report, scaling_efficiency
+
+
+def benchmarks():
+    return pd.DataFrame(
+        {
+            "host": ["draco", "draco", "draco", "cobra", "cobra"],
+            "module": ["gromacs/2018"] * 5,
+            "nodes": [2, 1, 4, 1, 2],
+            "performance": [180.0, 100.0, 200.0, np.nan, 90.0],
+        }
+    )
+
+
+def test_scaling_efficiency():
+    """Test the efficiency relative to the smallest finished node count."""
+    df = scaling_efficiency(benchmarks(), ["host", "module"], "performance")
+
+    assert df["performance_per_node"].tolist()[:3] == [90, 100, 50]
+    np.testing.assert_equal(df["efficiency"].tolist(), [90, 100, 50, np.nan, 100])
+
+
+def test_recommend():
+    """Test that the fastest efficient benchmark of every host is recommended."""
+    df = scaling_efficiency(benchmarks(), ["host", "module"], "performance")
+
+    assert recommend(df, "performance")[["host", "nodes"]].values.tolist() == [
+        ["cobra", 2],
+        ["draco", 2],
+    ]
+    assert recommend(df, "performance", min_efficiency=40)["nodes"].tolist() == [2, 4]
+
+
+def test_render_report():
+    """Test that the data is embedded as JSON that cannot close the script."""
+    data = {"title": "</script><script>alert(1)</script>"}
+    html = render_report(data, title="<b>Title</b>", version="3.0", date="today")
+
+    assert "<title>&lt;b&gt;Title&lt;/b&gt;</title>" in html
+    embedded = re.search(r'id="data">(.*?)</script>', html).group(1)
+    assert json.loads(embedded) == data
+
+
+def test_report(cli_runner, tmpdir, data):
+    """Test that the report of finished benchmarks is written."""
+    with tmpdir.as_cwd():
+        result = cli_runner.invoke(
+            cli,
+            [
+                "report",
+                "--directory={}".format(data["analyze-files-gromacs"]),
+                "--output=campaign",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Saved the report to campaign.html." in result.output
+        with open("campaign.html") as fh:
+            html = fh.read()
+
+        report = json.loads(re.search(r'id="data">(.*?)</script>', html).group(1))
+        assert len(report["rows"]) == 5
+        assert report["curves"][0]["nodes"] == [1, 2, 3, 4, 5]
+        assert report["curves"][0]["efficiency"][0] == 100
+        assert [r["nodes"] for r in report["recommendations"]] == [3]
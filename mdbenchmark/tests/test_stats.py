@@ -0,0 +1,120 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal
+
+from mdbenchmark import stats
+
+
+def test_bootstrap_confidence_interval():
+    """Test that the interval encloses the mean and is reproducible."""
+    values = [10.0, 11.0, 9.5, 10.5, np.nan]
+    low, high = stats.bootstrap_confidence_interval(values, random_state=0)
+
+    assert low <= np.nanmean(values) <= high
+    assert_equal(
+        (low, high), stats.bootstrap_confidence_interval(values, random_state=0)
+    )
+
+
+def test_bootstrap_confidence_interval_few_values():
+    """Test the interval for no or a single finished repeat."""
+    assert_equal(stats.bootstrap_confidence_interval([np.nan]), (np.nan, np.nan))
+    assert_equal(stats.bootstrap_confidence_interval([5.0]), (5.0, 5.0))
+
+
+def test_aggregate_repeats():
+    """Test that repeats are aggregated per configuration."""
+    df = pd.DataFrame(
+        {
+            "module": ["gromacs/2018"] * 4,
+            "nodes": [1, 1, 1, 2],
+            "performance": [10.0, 12.0, np.nan, 20.0],
+            "ncores": [32, 16, np.nan, 64],
+            "load_imbalance": [1.0, 3.0, np.nan, 5.0],
+        }
+    )
+    aggregated = stats.aggregate_repeats(
+        df,
+        columns=["module", "nodes"],
+        performance_column="performance",
+        measured_columns=["load_imbalance"],
+    )
+
+    assert list(aggregated.columns) == [
+        "module",
+        "nodes",
+        "performance",
+        "ncores",
+        "load_imbalance",
+        "performance_std",
+        "performance_min",
+        "performance_max",
+        "performance_ci_low",
+        "performance_ci_high",
+        "performance_repeats",
+    ]
+    assert aggregated.shape[0] == 2
+    assert_allclose(aggregated["performance"], [11.0, 20.0])
+    assert_allclose(aggregated["performance_std"].iloc[0], np.std([10, 12], ddof=1))
+    assert_equal(aggregated["performance_repeats"].tolist(), [2, 1])
+    assert np.isnan(aggregated["performance_std"].iloc[1])
+    # Only measured columns are averaged, the layout keeps its first value
+    assert_equal(aggregated["ncores"].tolist(), [32, 64])
+    assert_allclose(aggregated["load_imbalance"], [2.0, 5.0])
+
+
+def test_summarize_replicas():
+    """Test the replica statistics, ignoring failed replicas."""
+    df = pd.DataFrame(
+        {
+            "nodes": [1, 2],
+            "replicas": [
+                [("rep01", 10.0), ("rep02", 20.0)],
+                [("rep01", 30.0), ("rep02", np.nan)],
+            ],
+        }
+    )
+
+    summary = stats.summarize_replicas(df)
+
+    assert "replicas" in summary.columns
+    assert_equal(summary["replicas"].tolist(), [2, 2])
+    assert_equal(summary["replicas_failed"].tolist(), [0, 1])
+    assert_equal(summary["replica_min"].tolist(), [10.0, 30.0])
+    assert_equal(summary["replica_max"].tolist(), [20.0, 30.0])
+    assert_allclose(summary["replica_imbalance"], [2.0, 1.0])
+
+
+def test_replicas_long_format():
+    """Test that every replica gets its own row."""
+    df = pd.DataFrame(
+        {
+            "nodes": [1, 2],
+            "replicas": [[("rep01", 10.0), ("rep02", 20.0)], [(".", 30.0)]],
+        }
+    )
+
+    long = stats.replicas_long_format(df, columns=["nodes"])
+
+    assert_equal(long["nodes"].tolist(), [1, 1, 2])
+    assert_equal(long["replica"].tolist(), ["rep01", "rep02", "."])
+    assert_equal(long["replica_performance"].tolist(), [10.0, 20.0, 30.0])
@@ -17,12 +17,15 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import shutil
+
 import datreant as dtr
 import pandas as pd
 import pytest
 
 from mdbenchmark import cli
-from mdbenchmark.cli.submit import get_batch_command
+from mdbenchmark.cli.submit import format_size, get_batch_command
 from mdbenchmark.mdengines import gromacs
 from mdbenchmark.utils import map_columns, print_dataframe
 from mdbenchmark.versions import Version2Categories
@@ -181,3 +184,27 @@ def test_submit_test_prompt_yes(cli_runner, tmpdir, data, monkeypatch):
         # TODO: We need to clean up all of our unit tests...
         treant = dtr.Bundle(data["analyze-files-gromacs-one-unstarted"] + "/1")
         treant.categories["started"] = False
+
+
+def test_submit_dry_run(cli_runner, tmpdir, data):
+    """Test that a dry run reports the files of previous runs and keeps them."""
+    with tmpdir.as_cwd():
+        shutil.copytree(data["analyze-files-gromacs"], "benchmarks")
+
+        result = cli_runner.invoke(
+            cli, ["submit", "--directory=benchmarks", "--force", "--dry-run"]
+        )
+
+        assert result.exit_code == 0
+        assert "A restart would remove 5 files" in result.output
+        assert "Dry run. No benchmarks were submitted." in result.output
+        assert len(dtr.discover("benchmarks")) == 5
+        assert os.path.exists("benchmarks/1/bench.log")
+
+
+def test_format_size():
+    """Test the human readable file sizes."""
+    assert format_size(12) == "12 B"
+    assert format_size(2048) == "2.0 KB"
+    assert format_size(3 * 1024**3) == "3.0 GB"
+    assert format_size(5 * 1024**4) == "5.0 TB"
@@ -0,0 +1,162 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import json
+
+import pytest
+
+from mdbenchmark import sweep
+
+
+def test_cartesian_product():
+    """Test that dimensions are combined in the order they were added."""
+    s = sweep.Sweep(constants={"host": "draco"})
+    s.add("nodes", [1, 2]).add("ranks", [4, 8])
+
+    assert s.dimensions == ["nodes", "ranks"]
+    assert list(s) == [
+        {"host": "draco", "nodes": 1, "ranks": 4},
+        {"host": "draco", "nodes": 1, "ranks": 8},
+        {"host": "draco", "nodes": 2, "ranks": 4},
+        {"host": "draco", "nodes": 2, "ranks": 8},
+    ]
+
+
+def test_replace_dimension():
+    """Test that adding a dimension again replaces it in place."""
+    s = sweep.Sweep().add("nodes", [1, 2]).add("ranks", [4])
+    s.add("nodes", [8])
+
+    assert s.dimensions == ["nodes", "ranks"]
+    assert list(s) == [{"nodes": 8, "ranks": 4}]
+
+
+def test_zip():
+    """Test that zipped dimensions vary together."""
+    s = sweep.Sweep().add("nodes", [1, 2]).zip(ranks=[4, 8], threads=[10, 5])
+
+    assert [(r["nodes"], r["ranks"], r["threads"]) for r in s] == [
+        (1, 4, 10),
+        (1, 8, 5),
+        (2, 4, 10),
+        (2, 8, 5),
+    ]
+
+    with pytest.raises(ValueError):
+        sweep.Sweep().zip(ranks=[4, 8], threads=[10])
+    with pytest.raises(ValueError):
+        s.add("ranks", [2])
+
+
+def test_dependent_values_and_derived():
+    """Test values depending on previous dimensions and derived values."""
+    s = sweep.Sweep()
+    s.add("ranks", [2, 4])
+    s.add("pme_ranks", lambda row: range(row["ranks"] // 2))
+    s.derive("threads", lambda row: 8 // row["ranks"])
+
+    assert [(r["ranks"], r["pme_ranks"], r["threads"]) for r in s] == [
+        (2, 0, 4),
+        (4, 0, 2),
+        (4, 1, 2),
+    ]
+
+
+def test_sweep_derived_dimension():
+    """Test that derived values cannot be swept and vice versa."""
+    s = sweep.Sweep().add("ranks", [2, 4])
+    s.derive("threads", lambda row: 8 // row["ranks"])
+
+    with pytest.raises(ValueError, match="Cannot sweep over threads"):
+        s.add("threads", [1, 2])
+    with pytest.raises(ValueError, match="Cannot sweep over threads"):
+        s.zip(threads=[1, 2], nodes=[1, 2])
+    with pytest.raises(ValueError, match="Cannot derive ranks"):
+        s.derive("ranks", lambda row: 4)
+
+
+def test_constraints():
+    """Test that constraints given as expressions or functions drop rows."""
+    s = sweep.Sweep().add("nodes", [1, 2, 4]).add("ranks", [1, 2])
+    s.constrain("nodes * ranks < 8")
+    s.constrain(lambda row: row["nodes"] != 2)
+
+    assert [(r["nodes"], r["ranks"]) for r in s] == [(1, 1), (1, 2), (4, 1)]
+
+    # Builtins are not available in expressions
+    s.constrain("open('file')")
+    with pytest.raises(NameError):
+        list(s)
+
+
+def test_constraints_on_derived_values():
+    """Test that derived values are available to constraints."""
+    s = sweep.Sweep().add("ranks", [1, 2, 4])
+    s.derive("threads", lambda row: 8 // row["ranks"])
+    s.constrain("threads > 2")
+
+    assert [(r["ranks"], r["threads"]) for r in s] == [(1, 8), (2, 4)]
+
+
+def test_to_dataframe():
+    """Test that the DataFrame has the requested columns and proper types."""
+    s = sweep.Sweep(constants={"name": "protein"}).add("nodes", [1, 2])
+
+    df = s.to_dataframe(columns=["nodes", "name"])
+    assert list(df.columns) == ["nodes", "name"]
+    assert df["nodes"].dtype.kind == "i"
+
+
+def test_parse_sweep_options():
+    """Test parsing of key=v1,v2 options."""
+    spec = sweep.parse_sweep_options(["nodes=1,2", "nstlist=80", "flag=true,x"])
+    assert spec == {
+        "parameters": {"nodes": [1, 2], "nstlist": [80], "flag": [True, "x"]}
+    }
+
+    for option in ["nodes", "=1", "nodes="]:
+        with pytest.raises(ValueError):
+            sweep.parse_sweep_options([option])
+
+
+def test_load_sweep_spec(tmpdir):
+    """Test loading and merging of sweep files."""
+    filename = str(tmpdir.join("sweep.json"))
+    with open(filename, "w") as fh:
+        json.dump(
+            {
+                "parameters": {"nodes": [1, 2], "nstlist": 80},
+                "zip": [{"ranks": [4, 8], "threads": [10, 5]}],
+                "constraints": ["nodes < 2"],
+            },
+            fh,
+        )
+
+    spec = sweep.load_sweep_spec(filename)
+    assert spec["parameters"] == {"nodes": [1, 2], "nstlist": [80]}
+    assert sweep.sweep_parameters(spec) == ["nodes", "nstlist", "ranks", "threads"]
+
+    merged = sweep.merge_sweep_specs(spec, {"parameters": {"nodes": [4]}})
+    assert merged["parameters"]["nodes"] == [4]
+    assert merged["constraints"] == ["nodes < 2"]
+
+    with open(filename, "w") as fh:
+        json.dump({"unknown": 1}, fh)
+    with pytest.raises(ValueError):
+        sweep.load_sweep_spec(filename)
@@ -0,0 +1,82 @@
+# -*- Mode: python; tab-width: 4; indent-tabs-mode:nil; coding:utf-8 -*-
+# vim: tabstop=4 expandtab shiftwidth=4 softtabstop=4 fileencoding=utf-8
+#
+# MDBenchmark
+# Copyright (c) 2017-2020 The MDBenchmark development team and contributors
+# (see the file AUTHORS for the full list of names)
+#
+# MDBenchmark is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# MDBenchmark is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>
+import numpy as np
+import pytest
+
+from mdbenchmark.telemetry import (
+    TELEMETRY_COLUMNS,
+    read_telemetry,
+    summarize_telemetry,
+    warmup_time,
+)
+
+
+def test_read_telemetry(tmpdir):
+    """Test that truncated and invalid lines are skipped."""
+    filename = tmpdir.join("telemetry.jsonl")
+    filename.write('{"time": 10, "cpu": 50}\n[1, 2]\n{"time": 20, "cp')
+
+    assert read_telemetry(str(filename)) == [{"time": 10, "cpu": 50}]
+
+
+@pytest.mark.parametrize(
+    "performance, expected",
+    [
+        ([100, 100, 100, 100], 10),
+        ([10, 50, 100, 101, 99, 100], 30),
+        ([10, 100, 50, 100, 100, 100], 40),
+        ([100], np.nan),
+    ],
+)
+def test_warmup_time(performance, expected):
+    """Test that the warm-up ends after the last slow sample."""
+    times = [10 * (i + 1) for i in range(len(performance))]
+    np.testing.assert_equal(warmup_time(times, performance), expected)
+
+
+def test_summarize_telemetry():
+    """Test that the steady state and utilization exclude the warm-up."""
+    records = [
+        {"time": 10, "ns_per_day": None, "cpu": 10, "memory": 5, "gpu": None},
+        {"time": 20, "ns_per_day": 20, "cpu": 50, "memory": 5, "gpu": None},
+        {"time": 30, "ns_per_day": 100, "cpu": 80, "memory": 6, "gpu": None},
+        {"time": 40, "ns_per_day": 110, "cpu": 100, "memory": 6, "gpu": None},
+        {"time": 50, "ns_per_day": 90, "cpu": 90, "memory": 6, "gpu": None},
+        {"time": 60, "ns_per_day": 100, "cpu": 90, "memory": 6, "gpu": None},
+    ]
+
+    summary = summarize_telemetry(records)
+
+    assert list(summary) == TELEMETRY_COLUMNS
+    assert summary["warmup"] == 30
+    assert summary["sampled_performance"] == 100
+    assert summary["performance_variation"] == 8.2
+    assert summary["cpu_usage"] == 90
+    assert summary["memory_usage"] == 6
+    assert np.isnan(summary["gpu_usage"])
+
+
+def test_summarize_telemetry_without_performance():
+    """Test that the utilization is summarized without a log file."""
+    summary = summarize_telemetry([{"time": 10, "cpu": 40}, {"time": 20, "cpu": 60}])
+
+    assert np.isnan(summary["warmup"])
+    assert np.isnan(summary["sampled_performance"])
+    assert summary["cpu_usage"] == 50
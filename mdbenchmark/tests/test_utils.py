@@ -17,11 +17,13 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
+import json
 import os
 
 import datreant as dtr
 import jinja2
 import pandas as pd
+import pytest
 import tabulate
 from pandas.testing import assert_frame_equal
 
@@ -99,6 +101,44 @@ def test_retrieve_host_template(monkeypatch):
     assert utils.retrieve_host_template("minerva") == "minerva"
 
 
+def test_retrieve_host_metadata(monkeypatch):
+    """Test that the metadata block of a host template is parsed."""
+    template = "#!/bin/bash\nsrun gmx mdrun\n{#- mdbenchmark\npower_per_node: 350\nqueue: gpu\nshared: false\n#}\n"
+    env = jinja2.Environment(
+        loader=jinja2.DictLoader({"minerva": template, "plain": "#!/bin/bash\n"})
+    )
+    monkeypatch.setattr("mdbenchmark.utils.ENV", env)
+
+    assert utils.retrieve_host_metadata("minerva") == {
+        "power_per_node": 350,
+        "queue": "gpu",
+        "shared": False,
+    }
+    assert utils.retrieve_host_metadata("plain") == {}
+    assert utils.retrieve_host_metadata("unknown") == {}
+
+    # The metadata must not end up in the job script
+    assert "power_per_node" not in env.get_template("minerva").render()
+
+
+def test_hide_default_columns():
+    """Test that optional columns are only shown if they hold other values."""
+    df = pd.DataFrame(
+        {
+            "nodes": [1, 2],
+            "pme_ranks": [-1, -1],
+            "mdrun_nb": ["auto", "gpu"],
+            "mdrun_pme": ["auto", "auto"],
+        }
+    )
+
+    columns = utils.hide_default_columns(
+        df, ["nodes", "pme_ranks", "mdrun_nb", "mdrun_pme", "mdrun_dlb"]
+    )
+
+    assert columns == ["nodes", "mdrun_nb", "mdrun_dlb"]
+
+
 def test_parse_bundle(data):
     bundle = dtr.discover(data["analyze-files-gromacs"])
     version = VersionFactory(categories=bundle.categories).version_class
@@ -148,6 +188,75 @@ def test_group_consecutives():
     assert test_output == expected_output
 
 
+def test_group_consecutives_step():
+    assert utils.group_consecutives([2, 4, 6, 10, 12], step=2) == [[2, 4, 6], [10, 12]]
+    assert utils.group_consecutives([]) == [[]]
+
+
+def test_format_interval_groups():
+    assert utils.format_interval_groups([1, 2, 4, 5, 7, 10]) == "1-2, 4-5, 7, 10"
+    assert utils.format_interval_groups([5, 3, 1, 4, 2]) == "1-5"
+    assert utils.format_interval_groups([1, 1, 2, 2, 3]) == "1-3"
+    assert utils.format_interval_groups([2, 4, 6, 8, 12]) == "2-8:2, 12"
+    assert utils.format_interval_groups([4, 8]) == "4, 8"
+    assert utils.format_interval_groups([1, 2, 3, 4, 6, 8, 10]) == "1-4, 6-10:2"
+    assert utils.format_interval_groups([1, 2, 3, 4, 6, 7, 8]) == "1-4, 6-8"
+    assert utils.format_interval_groups([1, 2, 4, 8, 16]) == "1-16:x2"
+    assert utils.format_interval_groups([2, 4, 8, 16, 32, 40]) == "2-32:x2, 40"
+    assert utils.format_interval_groups([1, 3, 9, 27]) == "1-27:x3"
+    assert utils.format_interval_groups([0, 1, 2]) == "0-2"
+    assert utils.format_interval_groups([1, 3, 4, 5]) == "1, 3-5"
+    assert utils.format_interval_groups([1, 3, 4, 6]) == "1, 3-4, 6"
+    assert utils.format_interval_groups([]) == ""
+
+
+def test_interval_strings():
+    groups = [1, 0, 1, 0, 1, 0, 2]
+    values = [4, 3, 8, 1, 12, 2, 7]
+    assert utils.interval_strings(groups, values) == ["1-3", "4-12:4", "7"]
+    # Every group picks arithmetic or geometric runs on its own
+    groups = [0, 0, 0, 0, 1, 1, 1, 1]
+    values = [1, 2, 3, 4, 1, 2, 4, 8]
+    assert utils.interval_strings(groups, values) == ["1-4", "1-8:x2"]
+    assert utils.interval_strings([], []) == []
+
+
+def test_consolidate_dataframe_steps():
+    df = pd.DataFrame(
+        {
+            "module": ["a", "b", "a", "b", "a", "b", "b"],
+            "host": "draco",
+            "nodes": [1, 2, 2, 4, 3, 6, 10],
+            "time": 15,
+        }
+    )
+    consolidated = utils.consolidate_dataframe(df, columns=["module", "host"])
+    assert consolidated.columns.tolist() == ["module", "host", "nodes", "time"]
+    assert consolidated["nodes"].tolist() == ["1-3", "2-6:2, 10"]
+
+
+def test_consolidated_rows():
+    df = pd.DataFrame(
+        {
+            "module": ["b", "a", "b", "a", "b", "a", "b"],
+            "host": "draco",
+            "nodes": [2, 1, 4, 2, 6, 3, 10],
+            "time": 15,
+        }
+    )
+    consolidated = utils.ConsolidatedRows(
+        columns=df.columns, group_columns=["module", "host"]
+    )
+    for row in df.to_dict("records"):
+        consolidated.add(row)
+
+    assert consolidated.count == 7
+    pd.testing.assert_frame_equal(
+        consolidated.to_dataframe(),
+        utils.consolidate_dataframe(df, columns=["module", "host"]),
+    )
+
+
 def test_print_dataframe(capsys, data):
     df = pd.read_csv(data["analyze-files-gromacs.csv"])
     version = Version2Categories()
@@ -160,3 +269,69 @@ def test_print_dataframe(capsys, data):
     out, _ = capsys.readouterr()
 
     assert "\n".join(out.split("\n")) == expected_output
+
+
+def test_print_dataframe_machine_readable(capsys):
+    df = pd.DataFrame({"module": ["gromacs/2018", "gromacs/2019"], "nodes": [1, 2]})
+
+    utils.print_dataframe(df, ["Module", "Nodes"], output_format="csv")
+    out, _ = capsys.readouterr()
+    assert out == "module,nodes\ngromacs/2018,1\ngromacs/2019,2\n"
+
+    utils.print_dataframe(df, ["Module", "Nodes"], output_format="json")
+    out, _ = capsys.readouterr()
+    assert json.loads(out) == [
+        {"module": "gromacs/2018", "nodes": 1},
+        {"module": "gromacs/2019", "nodes": 2},
+    ]
+
+
+def test_select_rows():
+    df = pd.DataFrame(
+        {"module": ["a", "b", "c", "d"], "nodes": [2, 1, 2, 3], "gpu": [0, 1, 1, 0]}
+    )
+
+    assert_frame_equal(utils.select_rows(df), df)
+
+    selected = utils.select_rows(
+        df, columns=["module"], sort=["nodes"], descending=True, limit=3
+    )
+    assert selected["module"].tolist() == ["d", "a", "c"]
+    assert selected.columns.tolist() == ["module"]
+
+    selected = utils.select_rows(df, sort=["nodes", "gpu"], limit=2)
+    assert selected["module"].tolist() == ["b", "a"]
+
+
+def test_select_rows_unknown_columns():
+    df = pd.DataFrame({"module": ["a"], "nodes": [1]})
+
+    with pytest.raises(ValueError) as error:
+        utils.select_rows(df, columns=["module", "host"], sort=["ncores"])
+    assert str(error.value) == (
+        "Unknown columns: host, ncores. Available columns are: module, nodes."
+    )
+
+
+def test_node_sequence():
+    assert utils.node_sequence(1, 5) == [1, 2, 3, 4, 5]
+    assert utils.node_sequence(1, 512, "powers-of-two") == [2 ** k for k in range(10)]
+    assert utils.node_sequence(3, 40, "powers-of-two") == [4, 8, 16, 32]
+    assert utils.node_sequence(1, 12, "divisors") == [1, 2, 3, 4, 6, 12]
+    assert utils.node_sequence(2, 12, "divisors") == [2, 3, 4, 6, 12]
+    assert utils.node_sequence(1, 10, "geometric", ratio=1.5) == [1, 2, 3, 5, 8]
+    assert utils.node_sequence(3, 100, "geometric", ratio=3) == [3, 9, 27, 81]
+
+    with pytest.raises(ValueError):
+        utils.node_sequence(1, 10, "geometric", ratio=1)
+    with pytest.raises(ValueError):
+        utils.node_sequence(1, 10, "fibonacci")
+
+
+def test_parse_nodes():
+    assert utils.parse_nodes("4,1, 2,4") == [1, 2, 4]
+
+    with pytest.raises(ValueError):
+        utils.parse_nodes("1,2.5")
+    with pytest.raises(ValueError):
+        utils.parse_nodes("0,1")
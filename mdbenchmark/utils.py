@@ -19,18 +19,29 @@
 # along with MDBenchmark.  If not, see <http://www.gnu.org/licenses/>.
 import datetime as dt
 import os
+import re
 import socket
 
 import click
 import datreant as dtr
-import pandas as pd
 import numpy as np
+import pandas as pd
 import xdg
-from jinja2 import ChoiceLoader, Environment, FileSystemLoader, PackageLoader
+from jinja2 import (
+    ChoiceLoader,
+    Environment,
+    FileSystemLoader,
+    PackageLoader,
+    TemplateNotFound,
+)
 from tabulate import tabulate
 
 from mdbenchmark import console, mdengines
 from mdbenchmark.mdengines import detect_md_engine, utils
+from mdbenchmark.mdengines.gromacs import MDRUN_OPTIONS
+from mdbenchmark.sweep import Sweep, convert_value
+from mdbenchmark.telemetry import TELEMETRY_COLUMNS
+from mdbenchmark.versions import DEFAULT_VALUES
 
 # Order where to look for host templates: HOME -> etc -> package
 # home
@@ -47,6 +58,10 @@ _loaders.extend(
 _loaders.append(PackageLoader("mdbenchmark", "templates"))
 ENV = Environment(loader=ChoiceLoader(_loaders))
 
+# Host metadata is stored as `key: value` lines in a Jinja2 comment starting
+# with "mdbenchmark", so that it never ends up in the job script.
+_HOST_METADATA = re.compile(r"\{#-?\s*mdbenchmark\s*\n(.*?)-?#\}", re.DOTALL)
+
 
 def get_possible_hosts():
     return ENV.list_templates()
@@ -84,6 +99,73 @@ def retrieve_host_template(host=None):
     return ENV.get_template(host)
 
 
+def retrieve_host_metadata(host):
+    """Read the metadata block of a host template.
+
+    The metadata is a Jinja2 comment at the end of the template::
+
+        {#- mdbenchmark
+        power_per_node: 350
+        #}
+
+    Parameter
+    ---------
+    host : str
+    Name of the host template
+
+    Returns
+    -------
+    dict
+        Metadata of the host. Empty if the template does not exist or has no
+        metadata.
+    """
+    try:
+        source, _, _ = ENV.loader.get_source(ENV, host)
+    except TemplateNotFound:
+        return {}
+
+    metadata = {}
+    for block in _HOST_METADATA.findall(source):
+        for line in block.splitlines():
+            key, separator, value = line.partition(":")
+            if not separator or not key.strip():
+                continue
+            metadata[key.strip()] = convert_value(value)
+
+    return metadata
+
+
+def format_host_metadata(metadata):
+    """Format the metadata of a host as a block for its template."""
+    lines = ["{}: {}".format(key, value) for key, value in metadata.items()]
+    return "{#- mdbenchmark\n" + "\n".join(lines) + "\n#}\n"
+
+
+def save_host_metadata(host, metadata):
+    """Save metadata into the user copy of a host template.
+
+    The template is copied to the user configuration folder, if it is not
+    already there. Existing metadata is updated with the new values.
+
+    Returns
+    -------
+    str
+        Path of the saved template.
+    """
+    source, _, _ = ENV.loader.get_source(ENV, host)
+    merged = retrieve_host_metadata(host)
+    merged.update(metadata)
+
+    source = _HOST_METADATA.sub("", source).rstrip("\n") + "\n"
+    directory = os.path.join(xdg.XDG_CONFIG_HOME, "MDBenchmark")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, host)
+    with open(path, "w") as fh:
+        fh.write(source + format_host_metadata(merged))
+
+    return path
+
+
 def validate_required_files(name, modules):
     for module in modules:
         # Here we detect the MD engine (supported: GROMACS and NAMD).
@@ -97,6 +179,65 @@ def construct_directory_name(template, module, gpu):
     )
 
 
+def node_sequence(min_nodes, max_nodes, sequence="range", ratio=2):
+    """Return the sorted numbers of nodes of a sequence.
+
+    Parameters
+    ----------
+    min_nodes, max_nodes : int
+        Lower and upper limit of the sequence.
+    sequence : str
+        "range" for all numbers of nodes, "powers-of-two" for 1, 2, 4, ...,
+        "geometric" for ``min_nodes * ratio**k`` rounded to whole nodes and
+        "divisors" for all divisors of `max_nodes`.
+    ratio : float
+        Ratio between the numbers of nodes of a geometric sequence.
+
+    Raises
+    ------
+    ValueError
+        If the sequence is unknown or the ratio is not larger than one.
+    """
+    if sequence == "range":
+        return list(range(min_nodes, max_nodes + 1))
+    if sequence == "powers-of-two":
+        values = [2 ** k for k in range(max_nodes.bit_length())]
+    elif sequence == "geometric":
+        if ratio <= 1:
+            raise ValueError("The ratio of a geometric sequence must be larger than 1.")
+        values = []
+        value = min_nodes
+        while round(value) <= max_nodes:
+            values.append(round(value))
+            value *= ratio
+    elif sequence == "divisors":
+        values = [n for n in range(1, max_nodes + 1) if not max_nodes % n]
+    else:
+        raise ValueError("Unknown sequence of nodes '{}'.".format(sequence))
+
+    return sorted({n for n in values if min_nodes <= n <= max_nodes})
+
+
+def parse_nodes(nodes):
+    """Return the sorted, unique numbers of nodes of a comma-separated list.
+
+    Raises
+    ------
+    ValueError
+        If any entry is not a positive integer.
+    """
+    try:
+        values = {int(n) for n in nodes.split(",")}
+    except ValueError:
+        raise ValueError(
+            "The number of nodes must be a list of integers: {}".format(nodes)
+        )
+    if min(values) < 1:
+        raise ValueError("The number of nodes must be positive.")
+
+    return sorted(values)
+
+
 def construct_generate_data(
     name,
     job_name,
@@ -106,66 +247,124 @@ def construct_generate_data(
     cpu,
     gpu,
     time,
-    min_nodes,
-    max_nodes,
     nodes,
     processor,
     number_of_ranks,
     enable_hyperthreading,
     multidir,
     temprange,
+    repeats=1,
+    auto_layouts=False,
+    pme_ranks=None,
+    mdrun_options=None,
+    sweep_spec=None,
 ):
-    data = []
-    for module in modules:
-        # Here we detect the MD engine (supported: GROMACS and NAMD).
-        engine = mdengines.detect_md_engine(module)
+    """Create the sweep over all benchmark combinations.
 
-        # Iterate over CPUs or GPUs
-        gpu_cpu = {"cpu": cpu, "gpu": gpu}
-        for key, value in sorted(gpu_cpu.items()):
-            # Skip the current processing unit
-            if not value:
-                continue
+    `nodes` lists the numbers of nodes, see `node_sequence`. `pme_ranks`
+    lists the numbers of separate PME ranks per node and `mdrun_options` maps
+    the mdrun option categories to the values that should be swept.
+    Offloading to GPUs is skipped for CPU benchmarks. A sweep specification
+    in `sweep_spec` replaces these dimensions or adds new ones, see
+    `mdbenchmark.sweep.load_sweep_spec`.
+
+    Returns
+    -------
+    Sweep
+        Lazy sweep whose combinations are dictionaries with the keys of
+        `Version3Categories.generate_categories` and all additional dimensions.
+    """
+    if not pme_ranks:
+        pme_ranks = [-1]
+    if mdrun_options is None:
+        mdrun_options = {}
+
+    sweep = Sweep(
+        constants={
+            "name": name,
+            "job_name": job_name,
+            "host": host,
+            "template": template,
+            "time": time,
+            "hyperthreading": enable_hyperthreading,
+            "temprange": temprange,
+        }
+    )
+    sweep.add("module", modules)
+    # Iterate over CPUs before GPUs
+    sweep.add("use_gpu", [g for g, enabled in [(False, cpu), (True, gpu)] if enabled])
+    sweep.add("nodes", nodes)
+
+    # Either enumerate all sensible layouts of a node or use the requested
+    # number of ranks
+    if auto_layouts:
+        sweep.add(
+            "layout",
+            lambda row: processor.enumerate_layouts(
+                with_hyperthreading=enable_hyperthreading, gpu=row["use_gpu"]
+            ),
+        )
+        sweep.derive("number_of_ranks", lambda row: row["layout"].ranks)
+        sweep.derive("number_of_threads", lambda row: row["layout"].threads)
+        sweep.derive("pme_ranks", lambda row: row["layout"].pme_ranks)
+        sweep.derive("gpus_per_rank", lambda row: row["layout"].gpus_per_rank)
+    else:
+        sweep.add("number_of_ranks", number_of_ranks)
+        sweep.add("pme_ranks", pme_ranks)
+        sweep.derive(
+            "number_of_threads",
+            lambda row: processor.get_ranks_and_threads(
+                row["number_of_ranks"], with_hyperthreading=enable_hyperthreading
+            )[1],
+        )
+        # Only enumerated layouts know how the ranks share the GPUs
+        sweep.derive("gpus_per_rank", lambda row: -1)
+
+    sweep.add("multidir", multidir)
+    if auto_layouts:
+        # Enumerated layouts may not fit all simulations. Separate PME ranks
+        # are only used for single simulations.
+        sweep.constrain(
+            lambda row: not (row["nodes"] * row["layout"].ranks) % row["multidir"]
+            and not (row["multidir"] > 1 and row["layout"].pme_ranks > 0)
+        )
+
+    # Repeats are counted from 1. A single run per configuration is marked
+    # with 0.
+    sweep.add("repeat", range(1, repeats + 1) if repeats > 1 else [0])
+
+    # CPU benchmarks cannot offload anything to GPUs
+    for category in MDRUN_OPTIONS:
+        values = mdrun_options.get(category, ["auto"])
+        sweep.add(
+            category,
+            lambda row, values=values: values
+            if row["use_gpu"]
+            else [v for v in values if v != "gpu"] or ["auto"],
+        )
+
+    if auto_layouts:
+        # GROMACS only supports a single PME rank with PME on the GPU
+        sweep.constrain(
+            lambda row: not (
+                row["mdrun_pme"] == "gpu" and row["nodes"] * row["layout"].pme_ranks > 1
+            )
+        )
+
+    if sweep_spec is not None:
+        sweep.apply(sweep_spec)
+
+    # Here we detect the MD engine (supported: GROMACS and NAMD) and set up
+    # the path to the new directory as `datreant.Tree`.
+    sweep.derive("engine", lambda row: mdengines.detect_md_engine(row["module"]))
+    sweep.derive(
+        "base_directory",
+        lambda row: dtr.Tree(
+            construct_directory_name(template.name, row["module"], row["use_gpu"])
+        ),
+    )
 
-            # Generate directory name and string representation for the user.
-            # Also set the `gpu` variable for later use.
-            gpu = True if key == "gpu" else False
-            directory = construct_directory_name(template.name, module, gpu)
-
-            # Set up the path to the new directory as `datreant.Tree`
-            base_directory = dtr.Tree(directory)
-
-            # Do the main iteration over nodes, ranks and number of simulations
-            _node_range = range(min_nodes, max_nodes + 1) if nodes == False else np.array([int(x) for x in nodes.split(",")])
-            for nodes in _node_range:
-                for _ranks in number_of_ranks:
-                    ranks, threads = processor.get_ranks_and_threads(
-                        _ranks, with_hyperthreading=enable_hyperthreading
-                    )
-                    for nsim in multidir:
-
-                        # Append the data to our list
-                        data.append(
-                            [
-                                name,
-                                job_name,
-                                base_directory,
-                                host,
-                                engine,
-                                module,
-                                nodes,
-                                time,
-                                gpu,
-                                template,
-                                ranks,
-                                threads,
-                                enable_hyperthreading,
-                                nsim,
-                                temprange,
-                            ]
-                        )
-
-    return data
+    return sweep
 
 
 def generate_output_name(extension):
@@ -176,31 +375,100 @@ def generate_output_name(extension):
     return out
 
 
-def parse_bundle(bundle, columns, sort_values_by, discard_performance=False):
-    """Generates a DataFrame from a datreant.Bundle."""
+def parse_bundle(
+    bundle,
+    columns,
+    sort_values_by,
+    discard_performance=False,
+    with_hostnames=False,
+    with_details=False,
+    with_replicas=False,
+    with_telemetry=False,
+):
+    """Generates a DataFrame from a datreant.Bundle.
+
+    If `with_hostnames` is set, an additional `hostnames` column lists the
+    nodes each benchmark was run on. If `with_details` is set, all details
+    parsed from the log files by the MD engine are added as columns. If
+    `with_replicas` is set, the `replicas` column lists the replica directory
+    and performance of each replica. The performance of benchmarks with
+    replicas that did not finish only sums the finished replicas, a warning
+    reports how many benchmarks are affected. If `with_telemetry` is set, the summary of
+    the sampled telemetry is added as columns. Parameters of a generic sweep are always
+    added as columns, see `swept_parameters`.
+    """
     data = []
+    swept = []
+    hostnames = []
+    details = []
+    replicas = []
+    telemetry = []
+    incomplete = 0
 
     with click.progressbar(
-        bundle, length=len(bundle), label="Analyzing benchmarks", show_pos=True
+        bundle,
+        length=len(bundle),
+        label="Analyzing benchmarks",
+        show_pos=True,
+        file=console.MESSAGE_FILE,
     ) as bar:
         for treant in bar:
             module = treant.categories["module"]
             engine = detect_md_engine(module)
-            row = utils.analyze_benchmark(engine=engine, benchmark=treant)
+            benchmark_replicas = utils.analyze_replicas(engine, treant)
+            row = utils.analyze_benchmark(
+                engine=engine, benchmark=treant, replicas=benchmark_replicas
+            )
+            failed = sum(1 for r in benchmark_replicas if not np.isfinite(r[1]))
+            if 0 < failed < len(benchmark_replicas):
+                incomplete += 1
 
             version = 2
             if "version" in treant.categories:
                 version = 3
             if version == 2:
-                row.pop()  # multidir is not a category for version 2 data
+                # Version 2 data only has the first ten columns
+                row = row[:10]
             row += [version]
 
             if discard_performance:
                 row = row[:2] + row[3:]
 
             data.append(row)
+            swept.append(
+                {key: treant.categories[key] for key in swept_parameters([treant])}
+            )
+            if with_hostnames:
+                hostnames.append(utils.collect_hostnames(engine, treant))
+            if with_details:
+                details.append(utils.collect_details(engine, treant))
+            if with_replicas:
+                replicas.append([r[:2] for r in benchmark_replicas])
+            if with_telemetry:
+                telemetry.append(utils.collect_telemetry(treant))
+
+    if incomplete:
+        console.warn(
+            "{} benchmarks have replicas that did not finish. Their performance "
+            "only includes the finished replicas, use {} to list them.",
+            incomplete,
+            "mdbenchmark analyze --replicas",
+        )
 
     df = pd.DataFrame(data, columns=columns)
+    if any(swept):
+        df = pd.concat([df, pd.DataFrame(swept, index=df.index)], axis=1)
+    if with_hostnames:
+        df["hostnames"] = hostnames
+    if with_details:
+        df = pd.concat([df, pd.DataFrame(details, index=df.index)], axis=1)
+    if with_replicas:
+        df["replicas"] = replicas
+    if with_telemetry:
+        df = pd.concat(
+            [df, pd.DataFrame(telemetry, index=df.index, columns=TELEMETRY_COLUMNS)],
+            axis=1,
+        )
 
     # Exit if no data is available
     if df.empty:
@@ -212,59 +480,276 @@ def parse_bundle(bundle, columns, sort_values_by, discard_performance=False):
     return df
 
 
+def swept_parameters(treants):
+    """Return the names of all generically swept parameters of `treants`.
+
+    `write_benchmark` lists them in the `sweep` category of each benchmark.
+    """
+    names = []
+    for treant in treants:
+        if "sweep" not in treant.categories:
+            continue
+        for name in treant.categories["sweep"].split(","):
+            if name not in names:
+                names.append(name)
+    return names
+
+
 def map_columns(map_dict, columns):
-    return [map_dict[key] for key in columns]
+    """Return the human readable names of `columns`.
+
+    Columns without an entry in `map_dict`, e.g., swept parameters, keep their
+    name.
+    """
+    return [map_dict.get(key, key) for key in columns]
 
 
 def consolidate_dataframe(df, columns):
-    """Return a shortened version of a DataFrame, grouping the nodes."""
+    """Return a shortened version of a DataFrame, grouping the nodes.
+
+    The nodes of each group are compressed into ranges, see
+    `format_interval_groups`.
+    """
     new_columns = df.columns
     agg = {column: "first" for column in new_columns if column not in columns}
-    agg["nodes"] = format_interval_groups
-    new_df = df.groupby(columns, as_index=False).agg(agg)
+    agg["nodes"] = "first"
+    grouped = df.groupby(columns, as_index=False)
+    new_df = grouped.agg(agg)
+
+    # `ngroup` numbers the groups in the same order as `agg` returns them
+    # and marks rows that were dropped from the groups with -1.
+    keys = grouped.ngroup().to_numpy()
+    valid = keys >= 0
+    new_df["nodes"] = interval_strings(keys[valid], df["nodes"].to_numpy()[valid])
     return new_df[new_columns]
 
 
-def print_dataframe(df, columns):
-    """Print a nicely formatted shortened DataFrame."""
+class ConsolidatedRows:
+    """Consolidate rows one at a time, like `consolidate_dataframe`.
+
+    Each group only keeps its first row and the nodes of all its rows, so rows
+    can be streamed without holding all of them in a DataFrame.
+    """
+
+    def __init__(self, columns, group_columns):
+        self.columns = list(columns)
+        self.group_columns = list(group_columns)
+        self.count = 0
+        self._groups = {}
+
+    def add(self, row):
+        """Add a row, given as a dictionary."""
+        self.count += 1
+        key = tuple(row.get(c) for c in self.group_columns)
+        if key not in self._groups:
+            self._groups[key] = ({c: row.get(c) for c in self.columns}, [])
+        self._groups[key][1].append(row["nodes"])
+
+    def to_dataframe(self):
+        """Return the consolidated rows, sorted by the group columns."""
+        records = [first for first, _ in self._groups.values()]
+        df = pd.DataFrame.from_records(records, columns=self.columns).infer_objects()
+
+        nodes = [n for _, n in self._groups.values()]
+        groups = np.repeat(np.arange(len(nodes)), [len(n) for n in nodes])
+        df["nodes"] = interval_strings(groups, [v for n in nodes for v in n])
+        return df.sort_values(self.group_columns, kind="stable").reset_index(drop=True)
+
+
+def hide_default_columns(df, columns):
+    """Return `columns` without optional columns holding only default values."""
+    return [
+        column
+        for column in columns
+        if column not in DEFAULT_VALUES
+        or column not in df.columns
+        or (df[column] != DEFAULT_VALUES[column]).any()
+    ]
+
+
+def print_dataframe(df, columns, output_format="table"):
+    """Print a nicely formatted shortened DataFrame.
+
+    `columns` are the names shown in the header of the table. The formats
+    "csv" and "json" skip all formatting and keep the original column names,
+    so that the output can be piped into other programs. They are always
+    written to stdout, see `console.redirect_messages`.
+    """
+    if output_format == "csv":
+        click.echo(df.to_csv(index=False), nl=False)
+        return
+    if output_format == "json":
+        click.echo(df.to_json(orient="records"))
+        return
+
     table = df.copy()
     table.columns = columns
     table = tabulate(table, headers="keys", tablefmt="psql", showindex=False)
     console.info(table, newlines=True)
 
 
+def select_rows(df, columns=None, sort=(), descending=False, limit=None):
+    """Return the selected columns of the first `limit` rows of a DataFrame.
+
+    Rows are sorted by the columns in `sort` before the limit is applied.
+
+    Raises
+    ------
+    ValueError
+        If any of the requested columns does not exist.
+    """
+    unknown = [c for c in list(columns or []) + list(sort) if c not in df.columns]
+    if unknown:
+        raise ValueError(
+            "Unknown columns: {}. Available columns are: {}.".format(
+                ", ".join(unknown), ", ".join(df.columns)
+            )
+        )
+
+    if sort:
+        df = df.sort_values(list(sort), ascending=not descending, kind="mergesort")
+    if limit is not None:
+        df = df.head(limit)
+    if columns:
+        df = df[list(columns)]
+
+    return df
+
+
 def group_consecutives(values, step=1):
     """Return list of consecutive lists of numbers from vals (number list).
     This list hast to be at least ordered such that N+1 > N.
-    Adapted from code found on stack overflow.
-    Question Thread:
-    https://stackoverflow.com/questions/7352684/
-    Solved by:
-    https://stackoverflow.com/users/308066/dkamins
-    """
 
-    run = []
-    result = [run]
-    expected = None
-    for value in values:
-        if (value == expected) or (expected is None):
-            run.append(value)
-        else:
-            run = [value]
-            result.append(run)
-        expected = value + step
+    A new list is started wherever the difference between two neighbouring
+    values is not `step`.
+    """
+    values = np.asarray(values)
+    splits = np.flatnonzero(np.diff(values) != step) + 1
+    return [run.tolist() for run in np.split(values, splits)]
+
+
+def interval_strings(groups, values):
+    """Return the compressed ranges of `values` for each of the `groups`.
+
+    Values are sorted and deduplicated within each group. Each group is then
+    split into runs wherever the difference between consecutive values
+    changes, and every run keeps its own step. Consecutive values are kept
+    together first, so ``1, 3, 4, 5`` becomes ``1, 3-5``. Runs with a step of
+    one are written as ``1-4``, other runs of more than two values as
+    ``2-8:2``. If splitting by ratios gives fewer parts, e.g., for powers of
+    two, a group is written as geometric runs like ``1-16:x2``. Returns a list
+    with one string per group, ordered by group.
+    """
+    groups = np.asarray(groups)
+    values = np.asarray(values)
+    if values.size == 0:
+        return []
+
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    unique = np.ones(values.size, dtype=bool)
+    unique[1:] = (groups[1:] != groups[:-1]) | (values[1:] != values[:-1])
+    groups, values = groups[unique], values[unique]
+
+    same_group = groups[1:] == groups[:-1]
+    starts = np.flatnonzero(np.r_[True, ~same_group])
+    lengths = np.diff(np.r_[starts, values.size])
+
+    differences = np.diff(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = values[1:] / values[:-1]
+    # Runs of consecutive values are split off before the other values are
+    # split into runs, so that a value never leaves its unit-step run.
+    unit = same_group & (differences == 1)
+    in_unit = np.r_[False, unit] | np.r_[unit, False]
+    same_segment = same_group & np.where(
+        in_unit[:-1] & in_unit[1:], unit, ~in_unit[:-1] & ~in_unit[1:]
+    )
+    arithmetic = _run_starts(differences, same_segment)
+    geometric = _run_starts(ratios, same_group)
+
+    # Use the geometric runs for groups of positive values, which they write
+    # with fewer parts.
+    group_index = np.repeat(np.arange(starts.size), lengths)
+    parts = _count_parts(arithmetic, differences == 1, group_index, starts.size)
+    fewer_parts = (
+        _count_parts(geometric, np.zeros_like(geometric), group_index, starts.size)
+        < parts
+    )
+    positive = np.minimum.reduceat(values, starts) > 0
+    use_ratios = np.repeat(fewer_parts & positive, lengths)
+    run_starts = np.flatnonzero(np.where(use_ratios, geometric, arithmetic))
+    run_ends = np.r_[run_starts[1:], values.size] - 1
+
+    # The step of a run is the difference or ratio of its first two values.
+    # Runs of a single value are padded with a step of one.
+    run_geometric = use_ratios[run_starts]
+    run_steps = [
+        ratio if geometric else difference
+        for ratio, difference, geometric in zip(
+            np.r_[ratios, 1.0][run_starts].tolist(),
+            np.r_[differences, 1][run_starts].tolist(),
+            run_geometric.tolist(),
+        )
+    ]
+
+    # Only the formatting of the strings is done per run.
+    text = [
+        _format_run(*run)
+        for run in zip(
+            values[run_starts].tolist(),
+            values[run_ends].tolist(),
+            (run_ends - run_starts + 1).tolist(),
+            run_steps,
+            run_geometric.tolist(),
+        )
+    ]
+    bounds = np.r_[np.searchsorted(run_starts, starts), len(text)]
+    return [", ".join(text[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _run_starts(steps, same_group):
+    """Return a mask of the values that start a run with a constant step.
+
+    `steps` holds the differences or ratios between consecutive values. The
+    first two values of a run always belong together and define its step.
+    Where the step changes after several values in a row, every other value
+    starts a new run.
+    """
+    changes = np.zeros(steps.size, dtype=bool)
+    changes[1:] = (steps[1:] != steps[:-1]) & same_group[1:] & same_group[:-1]
+    first = np.where(changes & ~np.r_[False, changes[:-1]], np.arange(steps.size), 0)
+    first = np.maximum.accumulate(first)
+    parity = (np.arange(steps.size) - first) % 2 == 0
+    return np.r_[True, ~same_group | (changes & parity)]
 
-    return result
 
+def _count_parts(run_starts, unit_steps, group_index, number_of_groups):
+    """Return the number of comma-separated parts each group is written as.
 
-def format_interval_groups(nodes):
-    output = []
-    groups = group_consecutives(nodes)
+    Runs of two values are written as two parts, unless their step is one.
+    """
+    index = np.flatnonzero(run_starts)
+    lengths = np.diff(np.r_[index, run_starts.size])
+    unit = np.r_[unit_steps, False][index]
+    weights = np.where((lengths == 2) & ~unit, 2, 1)
+    return np.bincount(group_index[index], weights=weights, minlength=number_of_groups)
+
+
+def _format_run(first, last, length, step, geometric=False):
+    """Return a single run of values as a string."""
+    if length == 1:
+        return str(first)
+    if not geometric and step == 1:
+        return "{}-{}".format(first, last)
+    if length == 2:
+        return "{}, {}".format(first, last)
+    if geometric:
+        return "{}-{}:x{:g}".format(first, last, step)
+    return "{}-{}:{}".format(first, last, step)
 
-    for group in groups:
-        if len(group) == 1:
-            output.append(group[0])
-        else:
-            output.append(str(group[0]) + "-" + str(group[-1]))
 
-    return ", ".join(str(node) for node in output)
+def format_interval_groups(nodes):
+    """Return the nodes compressed into ranges, e.g., ``1-4, 8-16:4, 32``."""
+    strings = interval_strings(np.zeros(len(nodes), dtype=int), nodes)
+    return strings[0] if strings else ""
@@ -118,6 +118,13 @@ class Version3Categories(VersionCategories):
         "number_of_ranks",
         "hyperthreading",
         "multidir",
+        "pme_ranks",
+        "gpus_per_rank",
+        "mdrun_nb",
+        "mdrun_pme",
+        "mdrun_bonded",
+        "mdrun_update",
+        "mdrun_dlb",
     ]
     generate_categories = [
         "name",
@@ -135,6 +142,14 @@ class Version3Categories(VersionCategories):
         "hyperthreading",
         "multidir",
         "temprange",
+        "repeat",
+        "pme_ranks",
+        "gpus_per_rank",
+        "mdrun_nb",
+        "mdrun_pme",
+        "mdrun_bonded",
+        "mdrun_update",
+        "mdrun_dlb",
     ]
     generate_mapping = {
         "engine": "engine",
@@ -151,6 +166,14 @@ class Version3Categories(VersionCategories):
         "hyperthreading": "hyperthreading",
         "multidir": "multidir",
         "temprange": "temprange",
+        "repeat": "repeat",
+        "pme_ranks": "number_of_pme_ranks",
+        "gpus_per_rank": "gpus_per_rank",
+        "mdrun_nb": "mdrun_nb",
+        "mdrun_pme": "mdrun_pme",
+        "mdrun_bonded": "mdrun_bonded",
+        "mdrun_update": "mdrun_update",
+        "mdrun_dlb": "mdrun_dlb",
     }
     generate_printing = [
         "name",
@@ -163,6 +186,13 @@ class Version3Categories(VersionCategories):
         "number_of_threads",
         "hyperthreading",
         "multidir",
+        "pme_ranks",
+        "gpus_per_rank",
+        "mdrun_nb",
+        "mdrun_pme",
+        "mdrun_bonded",
+        "mdrun_update",
+        "mdrun_dlb",
     ]
     analyze_categories = [
         "module",
@@ -177,6 +207,14 @@ class Version3Categories(VersionCategories):
         "hyperthreading",
         "multidir",
         "temprange",
+        "repeat",
+        "pme_ranks",
+        "gpus_per_rank",
+        "mdrun_nb",
+        "mdrun_pme",
+        "mdrun_bonded",
+        "mdrun_update",
+        "mdrun_dlb",
         "version",
     ]
     analyze_printing = [
@@ -191,8 +229,24 @@ class Version3Categories(VersionCategories):
         "number_of_threads",
         "hyperthreading",
         "multidir",
+        "repeat",
+        "pme_ranks",
+        "gpus_per_rank",
+        "mdrun_nb",
+        "mdrun_pme",
+        "mdrun_bonded",
+        "mdrun_update",
+        "mdrun_dlb",
+    ]
+    analyze_sort = [
+        "module",
+        "number_of_ranks",
+        "hyperthreading",
+        "use_gpu",
+        "pme_ranks",
+        "nodes",
+        "repeat",
     ]
-    analyze_sort = ["module", "number_of_ranks", "hyperthreading", "use_gpu", "nodes"]
     submit_categories = [
         "module",
         "nodes",
@@ -205,6 +259,14 @@ class Version3Categories(VersionCategories):
         "hyperthreading",
         "multidir",
         "temprange",
+        "repeat",
+        "pme_ranks",
+        "gpus_per_rank",
+        "mdrun_nb",
+        "mdrun_pme",
+        "mdrun_bonded",
+        "mdrun_update",
+        "mdrun_dlb",
         "version",
     ]
     category_mapping = {
@@ -223,9 +285,77 @@ class Version3Categories(VersionCategories):
         "job_name": "Job name",
         "submitted": "Submitted?",
         "multidir": "# Simulations",
+        "repeat": "Repeat",
+        "pme_ranks": "# PME ranks",
+        "gpus_per_rank": "GPUs per rank",
+        "mdrun_nb": "-nb",
+        "mdrun_pme": "-pme",
+        "mdrun_bonded": "-bonded",
+        "mdrun_update": "-update",
+        "mdrun_dlb": "-dlb",
+        "performance_std": "Std (ns/day)",
+        "performance_min": "Min (ns/day)",
+        "performance_max": "Max (ns/day)",
+        "performance_ci_low": "CI low (ns/day)",
+        "performance_ci_high": "CI high (ns/day)",
+        "performance_repeats": "# repeats",
     }
 
 
+# Values of optional categories that leave the choice to the MD engine.
+# Columns holding only these values are not printed.
+DEFAULT_VALUES = {
+    "repeat": 0,
+    "pme_ranks": -1,
+    "gpus_per_rank": -1,
+    "mdrun_nb": "auto",
+    "mdrun_pme": "auto",
+    "mdrun_bonded": "auto",
+    "mdrun_update": "auto",
+    "mdrun_dlb": "auto",
+}
+
+
+# Human readable names of the optional columns added by `mdbenchmark analyze`
+DETAILS_MAPPING = {
+    "domain_decomposition": "Domain decomp. (%)",
+    "neighbor_search": "Neighbor search (%)",
+    "force": "Force (%)",
+    "pme_mesh": "PME mesh (%)",
+    "comm_wait": "Wait + comm. (%)",
+    "load_imbalance": "Load imbalance (%)",
+    "imbalance_wait": "Imbalance wait (%)",
+    "pme_pp_load": "PME/PP load",
+    "nstlist": "nstlist",
+    "gpus": "# GPUs",
+    "nb": "-nb",
+    "pme": "-pme",
+    "bonded": "-bonded",
+    "update": "-update",
+    "npme": "-npme",
+    "benchmark_samples": "# benchmark samples",
+    "timing_samples": "# timing samples",
+    "timing_performance": "Steady state (ns/day)",
+    "peak_memory": "Peak memory (MB)",
+    "replicas": "# replicas",
+    "replicas_failed": "# failed replicas",
+    "replica_min": "Slowest replica (ns/day)",
+    "replica_max": "Fastest replica (ns/day)",
+    "replica_imbalance": "Replica imbalance",
+    "replica": "Replica",
+    "replica_performance": "Replica (ns/day)",
+    "wall_clock_hours": "Wall clock (h)",
+    "node_hours": "Node hours",
+    "core_hours": "Core hours",
+    "energy_kwh": "Energy (kWh)",
+    "warmup": "Warm-up (s)",
+    "sampled_performance": "Sampled (ns/day)",
+    "performance_variation": "Variation (%)",
+    "cpu_usage": "CPU (%)",
+    "memory_usage": "Memory (%)",
+    "gpu_usage": "GPU (%)",
+}
+
 VERSIONS = [Version2Categories(), Version3Categories()]
 
 